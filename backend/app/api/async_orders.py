@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.api.fast_json import fast_json
+from backend.app.models.base import get_async_db
+from backend.app.models.product import Option, Order, Product
+from backend.app.repositories.async_pricing_repository import (
+    AsyncPricingOrderRepository,
+)
+from backend.app.schemas.order import (
+    CreateOrderPayload,
+    OrderResponse,
+    UpdateOrderPayload,
+)
+from backend.app.services.order_service import AsyncCartOrderService
+from backend.app.services.price_service import PriceService
+from backend.app.services.selection_backends import (
+    SOLVER_EXECUTION,
+    create_selection_service,
+)
+from backend.app.services.solver_pool import SolverPoolBusy, SolverTimeout
+
+router = APIRouter()
+
+
+@router.post("/orders", response_model=OrderResponse)
+async def create_product(
+    payload: CreateOrderPayload,
+    db: AsyncSession = Depends(get_async_db),
+):
+    repository = AsyncPricingOrderRepository(db)
+    part_service = create_selection_service(execution=SOLVER_EXECUTION)
+    price_service = PriceService()
+    order_service = AsyncCartOrderService(repository, part_service, price_service)
+
+    try:
+        product: Product = await repository.get_product(payload.product_id)
+        return fast_json(await order_service.create_order(product))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (SolverTimeout, SolverPoolBusy) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.put("/orders/{order_id}", response_model=OrderResponse)
+async def update_order(
+    payload: UpdateOrderPayload,
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    repository = AsyncPricingOrderRepository(db)
+    part_service = create_selection_service(execution=SOLVER_EXECUTION)
+    price_service = PriceService()
+    order_service = AsyncCartOrderService(repository, part_service, price_service)
+
+    try:
+        order: Order = await repository.get_order(order_id)
+        option: Option = await repository.get_option(payload.option_id)
+        return fast_json(await order_service.update_order(order, option))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (SolverTimeout, SolverPoolBusy) as e:
+        raise HTTPException(status_code=503, detail=str(e))
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.api.parts import PartList, encode_parts, encoded_response
+from backend.app.models.base import get_async_db
+from backend.app.services.model_cache import part_responses
+from backend.app.services.part_service import AsyncPartService
+
+router = APIRouter()
+
+
+@router.get("/parts", response_model=PartList)
+async def get_parts(
+    request: Request,
+    product_id: int = Query(..., description="ID of the product"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    key = (product_id, "parts")
+    encoded = part_responses.get(key)
+
+    if encoded is None:
+        version = part_responses.version.of(product_id)
+        part_service = AsyncPartService(db)
+        encoded = encode_parts(await part_service.get_parts(product_id))
+        part_responses.set(key, encoded, version)
+
+    return encoded_response(request, encoded)
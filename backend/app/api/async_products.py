@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.api.fast_json import FAST_JSON, FastJSONResponse
+from backend.app.api.products import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    product_listing_rows,
+    product_listings,
+)
+from backend.app.models.base import get_async_db
+from backend.app.models.product import Product
+from backend.app.schemas.product import (
+    ProductCreate,
+    ProductListing,
+    Product as ProductSchema,
+)
+from backend.app.services.product_service import AsyncProductService
+
+router = APIRouter()
+
+
+@router.post("/products/", response_model=ProductSchema)
+async def create_product(
+    product: ProductCreate, db: AsyncSession = Depends(get_async_db)
+):
+    product_service = AsyncProductService(db)
+    return await product_service.create_product(product)
+
+
+@router.get("/products/{product_id}", response_model=ProductSchema)
+async def read_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    product_service = AsyncProductService(db)
+    product: Product | None = await product_service.get_product(product_id)
+    if product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
+
+
+@router.get("/products/", response_model=list[ProductListing])
+async def read_products(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    category_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    product_service = AsyncProductService(db)
+
+    try:
+        products, next_cursor = await product_service.get_product_page(
+            limit=limit, cursor=cursor, category_id=category_id, skip=skip
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else {}
+
+    if FAST_JSON:
+        return FastJSONResponse(product_listing_rows(products), headers=headers)
+
+    response.headers.update(headers)
+    return product_listings(products)
@@ -0,0 +1,46 @@
+"""
+Optional orjson response path, enabled with FAST_JSON=true.
+
+Routes return trusted content, already shaped by the services, without the
+response_model validation and jsonable_encoder pass. The bytes match the
+standard path: int keys become strings and Decimals are rendered as strings
+like Pydantic does.
+"""
+
+import os
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() in ("1", "true", "yes", "on")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+
+    # Models built with model_construct hold exactly their fields
+    if isinstance(value, BaseModel):
+        return value.__dict__
+
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def fast_json(content: Any, headers: dict[str, str] | None = None) -> Any:
+    """A FastJSONResponse when enabled, else the content for the response_model."""
+    if FAST_JSON:
+        return FastJSONResponse(content, headers=headers)
+
+    return content
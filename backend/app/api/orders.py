@@ -1,19 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from backend.app.models.base import get_db
+from backend.app.api.fast_json import fast_json
+from backend.app.models.base import SessionLocal, get_db
 from backend.app.models.product import Option, Order, Product
+from backend.app.repositories.order_export_repository import OrderExportRepository
 from backend.app.repositories.pricing_repository import PricingOrderRepository
 from backend.app.schemas.order import (
     CreateOrderPayload,
     OrderResponse,
     UpdateOrderPayload,
 )
+from backend.app.services.order_export_service import OrderExportService
 from backend.app.services.order_service import CartOrderService
 from backend.app.services.price_service import PriceService
-from backend.app.services.selection_service import PartSelectionService
+from backend.app.services.selection_backends import (
+    SOLVER_EXECUTION,
+    create_selection_service,
+)
+from backend.app.services.solver_pool import SolverPoolBusy, SolverTimeout
 
 router = APIRouter()
+# Streaming exports, served by the sync routes in both API modes
+export_router = APIRouter()
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
 
 @router.post("/orders", response_model=OrderResponse)
@@ -22,15 +37,17 @@ def create_product(
     db: Session = Depends(get_db),
 ):
     repository = PricingOrderRepository(db)
-    part_service = PartSelectionService()
+    part_service = create_selection_service(execution=SOLVER_EXECUTION)
     price_service = PriceService()
     order_service = CartOrderService(repository, part_service, price_service)
 
     try:
         product: Product = repository.get_product(payload.product_id)
-        return order_service.create_order(product)
+        return fast_json(order_service.create_order(product))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except (SolverTimeout, SolverPoolBusy) as e:
+        raise HTTPException(status_code=503, detail=str(e))
     # We would have other HTTP status codes here
 
 
@@ -39,14 +56,41 @@ def update_order(
     payload: UpdateOrderPayload, order_id: int, db: Session = Depends(get_db)
 ):
     repository = PricingOrderRepository(db)
-    part_service = PartSelectionService()
+    part_service = create_selection_service(execution=SOLVER_EXECUTION)
     price_service = PriceService()
     order_service = CartOrderService(repository, part_service, price_service)
 
     try:
         order: Order = repository.get_order(order_id)
         option: Option = repository.get_option(payload.option_id)
-        return order_service.update_order(order, option)
+        return fast_json(order_service.update_order(order, option))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except (SolverTimeout, SolverPoolBusy) as e:
+        raise HTTPException(status_code=503, detail=str(e))
     # We would have other HTTP status codes here
+
+
+@export_router.get("/orders/export")
+def export_orders(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    since: datetime | None = Query(None, description="Orders placed from then on"),
+):
+    def stream():
+        # The body is sent after the request dependencies are closed, so
+        # the stream owns its session
+        db = SessionLocal()
+
+        try:
+            export_service = OrderExportService(OrderExportRepository(db))
+            yield from getattr(export_service, export_format)(since)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="orders.{export_format}"'
+        },
+    )
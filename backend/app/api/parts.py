@@ -1,7 +1,9 @@
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, RootModel
+from backend.app.services.model_cache import part_responses
 from backend.app.services.part_service import PartService
-from fastapi import APIRouter, Depends, Query
+from backend.app.services.response_cache import EncodedResponse
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from backend.app.models.base import get_db
@@ -10,7 +12,7 @@ router = APIRouter()
 
 
 class OptionSchema(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, from_attributes=True)
 
     id: int
     name: str
@@ -18,7 +20,7 @@ class OptionSchema(BaseModel):
 
 
 class PartSchema(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, from_attributes=True)
 
     id: int
     name: str
@@ -27,15 +29,46 @@ class PartSchema(BaseModel):
     options: List[OptionSchema]
 
 
-class PartList(BaseModel):
-    __root__: List[PartSchema]
+class PartList(RootModel[List[PartSchema]]):
+    pass
+
+
+def encode_parts(parts) -> EncodedResponse:
+    body = PartList([PartSchema.model_validate(part) for part in parts])
+    return EncodedResponse.from_body(body.model_dump_json().encode())
+
+
+def encoded_response(request: Request, encoded: EncodedResponse) -> Response:
+    """200 with the body, gzipped if accepted, or 304 if the client has it."""
+    use_gzip = encoded.accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": encoded.gzip_etag if use_gzip else encoded.etag,
+        # Clients may keep the body but must revalidate, it changes with the catalog
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if encoded.not_modified(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            encoded.gzip_body, media_type="application/json", headers=headers
+        )
+
+    return Response(encoded.body, media_type="application/json", headers=headers)
 
 
 @router.get("/parts", response_model=PartList)
 def get_parts(
+    request: Request,
     product_id: int = Query(..., description="ID of the product"),
     db: Session = Depends(get_db),
 ):
-    part_service = PartService(db)
-    parts = part_service.get_parts(product_id)
-    return PartList(__root__=[PartSchema.from_orm(part) for part in parts])
+    # The session only connects on a cache miss
+    encoded = part_responses.get_or_build(
+        (product_id, "parts"),
+        lambda: encode_parts(PartService(db).get_parts(product_id)),
+    )
+    return encoded_response(request, encoded)
@@ -1,23 +1,40 @@
 from typing import List
+from backend.app.api.fast_json import FAST_JSON, FastJSONResponse
 from backend.app.models.product import Product
-from backend.app.schemas.product import ProductCreate
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.schemas.product import (
+    AvailabilityRequest,
+    AvailabilityResponse,
+    BatchPriceRequest,
+    BatchPriceResponse,
+    ConfigurationPrice,
+    ProductCreate,
+    ProductListing,
+    Product as ProductSchema,
+)
+from backend.app.services.availability_service import AvailabilityService
+from backend.app.services.batch_price_service import BatchPriceService
+from backend.app.services.price_summary_service import price_summaries
 from backend.app.services.product_service import ProductService
-from fastapi import APIRouter, Depends, HTTPException
+from backend.app.services.solver_pool import SolverPoolBusy, SolverTimeout
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from backend.app.models.base import get_db
 
 
 router = APIRouter()
+# Solver and pricing batches, served by the sync routes in both API modes
+batch_router = APIRouter()
 
 
-@router.post("/products/", response_model=Product)
+@router.post("/products/", response_model=ProductSchema)
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     product_service = ProductService(db)
     return product_service.create_product(product)
 
 
-@router.get("/products/{product_id}", response_model=Product)
+@router.get("/products/{product_id}", response_model=ProductSchema)
 def read_product(product_id: int, db: Session = Depends(get_db)):
     product_service = ProductService(db)
     product: Product | None = product_service.get_product(product_id)
@@ -26,8 +43,113 @@ def read_product(product_id: int, db: Session = Depends(get_db)):
     return product
 
 
-@router.get("/products/", response_model=list[Product])
-def read_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+# Cursor of the next page, absent on the last one
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+@router.get("/products/", response_model=list[ProductListing])
+def read_products(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    category_id: int | None = None,
+    db: Session = Depends(get_db),
+):
     product_service = ProductService(db)
-    products: List[Product] = product_service.get_products(skip=skip, limit=limit)
-    return products
+
+    try:
+        products, next_cursor = product_service.get_product_page(
+            limit=limit, cursor=cursor, category_id=category_id, skip=skip
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else {}
+
+    if FAST_JSON:
+        return FastJSONResponse(product_listing_rows(products), headers=headers)
+
+    response.headers.update(headers)
+    return product_listings(products)
+
+
+def product_listings(products: List[Product]) -> list[ProductListing]:
+    listings = []
+
+    for product in products:
+        listing = ProductListing.model_validate(product)
+        summary = price_summaries.get(product.id)
+
+        if summary is not None:
+            listing.from_price = summary.min_price
+            listing.max_price = summary.max_price
+
+        listings.append(listing)
+
+    return listings
+
+
+def product_listing_rows(products: List[Product]) -> list[dict]:
+    """Same content as product_listings, as plain dicts for FastJSONResponse."""
+    rows = []
+
+    for product in products:
+        summary = price_summaries.get(product.id)
+        rows.append(
+            {
+                "name": product.name,
+                "description": product.description,
+                "id": product.id,
+                "from_price": summary.min_price if summary is not None else None,
+                "max_price": summary.max_price if summary is not None else None,
+            }
+        )
+
+    return rows
+
+
+@batch_router.post(
+    "/products/{product_id}/availability", response_model=AvailabilityResponse
+)
+def read_availability(
+    product_id: int, payload: AvailabilityRequest, db: Session = Depends(get_db)
+):
+    repository = PricingOrderRepository(db)
+    availability_service = AvailabilityService(repository)
+
+    try:
+        repository.get_product(product_id)
+        results = availability_service.evaluate(
+            product_id, payload.selections, payload.parallel
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (SolverTimeout, SolverPoolBusy) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return AvailabilityResponse(results=results)
+
+
+@batch_router.post("/products/{product_id}/prices", response_model=BatchPriceResponse)
+def read_prices(
+    product_id: int, payload: BatchPriceRequest, db: Session = Depends(get_db)
+):
+    repository = PricingOrderRepository(db)
+    batch_price_service = BatchPriceService(repository)
+
+    try:
+        repository.get_product(product_id)
+        totals = batch_price_service.calculate_prices(
+            product_id, payload.configurations
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return BatchPriceResponse(
+        results=[
+            ConfigurationPrice(option_ids=option_ids, total_price=total_price)
+            for option_ids, total_price in zip(payload.configurations, totals)
+        ]
+    )
@@ -1,26 +1,139 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.app.api import orders, parts, products
+from backend.app.api import (
+    async_orders,
+    async_parts,
+    async_products,
+    orders,
+    parts,
+    products,
+)
+from backend.app.middleware import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    QueryStatsMiddleware,
+)
 from backend.app.models import Base, engine
+from backend.app.models.base import SessionLocal, async_pool_metrics, pool_metrics
+from backend.app.models.catalog_version import CatalogVersionPoller, catalog_version
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.catalog_store import product_catalogs
+from backend.app.services.metrics import (
+    render_counters,
+    render_gauges,
+    stage_metrics,
+)
+from backend.app.services.pooled_selection_service import warm_solver_pool
+from backend.app.services.price_summary_service import (
+    PriceSummaryRefresher,
+    price_summaries,
+)
+from backend.app.services.selection_backends import (
+    SELECTION_BACKEND,
+    SOLVER_EXECUTION,
+)
+from backend.app.services.solver_pool import solver_pool
+
+# "sync" serves requests from the threadpool, "async" on the event loop
+# with an AsyncSession
+API_MODE = os.getenv("API_MODE", "sync")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    poller = CatalogVersionPoller(catalog_version, engine)
+    poller.start()
+
+    if SOLVER_EXECUTION == "process":
+        db = SessionLocal()
+
+        try:
+            repository = PricingOrderRepository(db)
+            warm_solver_pool(
+                repository, repository.get_product_ids(), SELECTION_BACKEND
+            )
+        finally:
+            db.close()
 
-app = FastAPI()
+    refresher = PriceSummaryRefresher(price_summaries, SessionLocal)
+    refresher.start()
 
+    yield
+
+    refresher.stop()
+    poller.stop()
+    solver_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  # Add your frontend URL
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        products.NEXT_CURSOR_HEADER,
+        QUERY_COUNT_HEADER,
+        QUERY_TIME_HEADER,
+    ],
 )
 
 Base.metadata.create_all(bind=engine)
 
-app.include_router(products.router)
-app.include_router(orders.router)
-app.include_router(parts.router)
+if API_MODE == "async":
+    app.include_router(async_products.router)
+    app.include_router(async_orders.router)
+    app.include_router(async_parts.router)
+else:
+    app.include_router(products.router)
+    app.include_router(orders.router)
+    app.include_router(parts.router)
+
+app.include_router(products.batch_router)
+app.include_router(orders.export_router)
 
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Marcus's Bicycle Shop API"}
+
+
+@app.get("/metrics/database")
+async def database_metrics():
+    return {
+        **pool_metrics.snapshot(),
+        "pool": engine.pool.status(),
+        "async": async_pool_metrics.snapshot(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text format, catalog sizes are measured when published."""
+    catalogs = {
+        "products": len(product_catalogs),
+        "memory_bytes": product_catalogs.memory_bytes,
+    }
+    lines = [
+        *stage_metrics.render(),
+        *render_gauges("solver_pool", solver_pool.gauges(), "Solver pool activity."),
+        *render_counters(
+            "solver_pool", solver_pool.counters(), "Solver pool activity."
+        ),
+        *render_gauges(
+            "database_pool", pool_metrics.snapshot(), "Connection pool activity."
+        ),
+        *render_gauges("catalog", catalogs, "Product catalogs held in memory."),
+    ]
+
+    return PlainTextResponse(
+        "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,50 @@
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.models.base import QueryTracker, query_tracker
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+QUERY_TIME_HEADER = "X-Query-Time-Ms"
+
+
+class QueryStatsMiddleware:
+    """
+    Reports the SQL statements of each request in response headers and logs.
+    Queries run while a streaming body is sent come after the headers, they
+    are only in the log line.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: QueryTracker = query_tracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.tracker.track() as stats:
+
+            async def send_with_stats(message: Message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-query-count", str(stats.count).encode()),
+                        (b"x-query-time-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                    ]
+
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                logger.info(
+                    "%s %s: %d queries in %.2f ms",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.seconds * 1000,
+                )
@@ -9,5 +9,6 @@ from .product import (
     PriceRuleCondition,
     Order,
 )
+from .catalog_version import CatalogVersion, catalog_version
 
 Base.metadata.create_all(bind=engine)
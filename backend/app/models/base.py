@@ -1,19 +1,283 @@
+import json
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import cache
+from typing import AsyncIterator, Iterator, Mapping
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./bicycle_shop.db")
-# We would change it for Postgresql
-# SQLALCHEMY_DATABASE_OPTIONS = json.dumps(
-#     os.getenv("DATABASE_OPTIONS", "{ 'check_same_thread': false }")
-# )
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLALCHEMY_DATABASE_OPTIONS
-)
+
+
+def _env_bool(env: Mapping[str, str], name: str, default: bool) -> bool:
+    return env.get(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+def _is_sqlite_memory(url) -> bool:
+    database = url.database or ""
+    return database in ("", ":memory:") or "mode=memory" in str(url)
+
+
+def engine_options(url: str, env: Mapping[str, str] = os.environ) -> dict:
+    """
+    Keyword arguments for create_engine, read from the environment:
+
+    DATABASE_POOL_SIZE, DATABASE_MAX_OVERFLOW, DATABASE_POOL_TIMEOUT (s),
+    DATABASE_POOL_RECYCLE (s), DATABASE_POOL_PRE_PING, DATABASE_STATEMENT_TIMEOUT
+    (ms, PostgreSQL and MySQL) and DATABASE_OPTIONS, a JSON object merged
+    into the driver connect args.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    statement_timeout = int(env.get("DATABASE_STATEMENT_TIMEOUT", "0"))
+    connect_args: dict = {}
+
+    if backend == "sqlite":
+        # Requests may use a connection from another thread than its creator
+        connect_args["check_same_thread"] = False
+    elif backend == "postgresql" and statement_timeout:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout}"
+    elif backend in ("mysql", "mariadb") and statement_timeout:
+        connect_args["init_command"] = (
+            f"SET SESSION max_execution_time={statement_timeout}"
+        )
+
+    connect_args.update(json.loads(env.get("DATABASE_OPTIONS", "{}")))
+    options: dict = {
+        "connect_args": connect_args,
+        "pool_pre_ping": _env_bool(env, "DATABASE_POOL_PRE_PING", True),
+    }
+
+    # In-memory SQLite uses a single connection pool without sizing options
+    if not (backend == "sqlite" and _is_sqlite_memory(url)):
+        options.update(
+            pool_size=int(env.get("DATABASE_POOL_SIZE", "5")),
+            max_overflow=int(env.get("DATABASE_MAX_OVERFLOW", "10")),
+            pool_timeout=float(env.get("DATABASE_POOL_TIMEOUT", "30")),
+            pool_recycle=int(env.get("DATABASE_POOL_RECYCLE", "1800")),
+        )
+
+    return options
+
+
+def sqlite_pragmas(url: str, env: Mapping[str, str] = os.environ) -> dict[str, str]:
+    """
+    SQLITE_JOURNAL_MODE (WAL), SQLITE_SYNCHRONOUS (NORMAL) and
+    SQLITE_BUSY_TIMEOUT (ms), applied to every new connection.
+    """
+    pragmas = {
+        "synchronous": env.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": env.get("SQLITE_BUSY_TIMEOUT", "5000"),
+    }
+
+    # WAL needs a file, in-memory databases keep their own journal mode
+    if not _is_sqlite_memory(make_url(url)):
+        pragmas = {"journal_mode": env.get("SQLITE_JOURNAL_MODE", "WAL"), **pragmas}
+
+    return pragmas
+
+
+class PoolMetrics:
+    """Connection pool activity of an engine, updated from pool events."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine):
+        event.listen(engine, "connect", self._connect)
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "checkin", self._checkin)
+        event.listen(engine, "invalidate", self._invalidate)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+            }
+
+    def _connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def _checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out -= 1
+
+    def _invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+
+@dataclass
+class QueryStats:
+    """Statements run while a QueryTracker scope was open."""
+
+    count: int = 0
+    seconds: float = 0.0
+    statements: list[str] = field(default_factory=list)
+    parameters: list = field(default_factory=list)
+
+
+class QueryTracker:
+    """
+    Counts the statements of the current request or test from engine events.
+    Scopes live in a ContextVar, so they follow requests into the threadpool
+    and concurrent requests don't see each other's queries.
+    """
+
+    def __init__(self):
+        self._scopes: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+            "query_scopes", default=()
+        )
+
+    def attach(self, engine: Engine):
+        if not event.contains(engine, "before_cursor_execute", self._before):
+            event.listen(engine, "before_cursor_execute", self._before)
+            event.listen(engine, "after_cursor_execute", self._after)
+
+    @contextmanager
+    def track(self) -> Iterator[QueryStats]:
+        stats = QueryStats()
+        token = self._scopes.set((*self._scopes.get(), stats))
+
+        try:
+            yield stats
+        finally:
+            self._scopes.reset(token)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if self._scopes.get():
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        scopes = self._scopes.get()
+
+        if not scopes or not conn.info.get("query_start"):
+            return
+
+        seconds = time.perf_counter() - conn.info["query_start"].pop()
+
+        for stats in scopes:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.statements.append(statement)
+            stats.parameters.append(parameters)
+
+
+# Async drivers used when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    url = make_url(url)
+    backend = url.get_backend_name()
+
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def create_database_engine(
+    url: str, env: Mapping[str, str] = os.environ, metrics: PoolMetrics | None = None
+) -> Engine:
+    engine = create_engine(url, **engine_options(url, env))
+    _configure_engine(engine, url, env, metrics)
+
+    return engine
+
+
+def create_async_database_engine(
+    url: str, env: Mapping[str, str] = os.environ, metrics: PoolMetrics | None = None
+) -> AsyncEngine:
+    options = engine_options(url, env)
+
+    # aiosqlite defaults to NullPool, which opens a connection per session
+    if make_url(url).get_backend_name() == "sqlite" and "pool_size" in options:
+        options["poolclass"] = AsyncAdaptedQueuePool
+
+    engine = create_async_engine(url, **options)
+    _configure_engine(engine.sync_engine, url, env, metrics)
+
+    return engine
+
+
+def _configure_engine(
+    engine: Engine, url: str, env: Mapping[str, str], metrics: PoolMetrics | None
+):
+    query_tracker.attach(engine)
+
+    if engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas(url, env)
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+
+            cursor.close()
+
+    if metrics is not None:
+        metrics.attach(engine)
+
+
+query_tracker = QueryTracker()
+pool_metrics = PoolMetrics()
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL, metrics=pool_metrics)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_pool_metrics = PoolMetrics()
+
+
+@cache
+def async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Created on first use, so the sync mode doesn't need an async driver."""
+    async_engine = create_async_database_engine(
+        os.getenv("ASYNC_DATABASE_URL") or async_database_url(SQLALCHEMY_DATABASE_URL),
+        metrics=async_pool_metrics,
+    )
+
+    # Attributes stay loaded after commit, lazy loads are not possible in async
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 Base = declarative_base()
 
 
@@ -24,3 +288,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with async_session_factory()() as db:
+        yield db
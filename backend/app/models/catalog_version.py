@@ -0,0 +1,376 @@
+import logging
+import os
+import threading
+from itertools import chain
+from typing import Iterable, Mapping
+
+from sqlalchemy import Column, Integer, event, insert, inspect, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from backend.app.models.base import Base
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows that change what can be configured or how it is priced
+CATALOG_MODELS = (Part, Option, OptionCompatibility, PriceRule, PriceRuleCondition)
+
+# Seconds between two checks for catalog changes committed by other processes
+CATALOG_VERSION_POLL_INTERVAL = float(os.getenv("CATALOG_VERSION_POLL_INTERVAL", "1"))
+
+# The row counting every change, the others count the changes of one product
+GLOBAL_VERSION_KEY = 0
+
+# Keeps IN lists and multi-row upserts under the driver's parameter limits
+_CHUNK_SIZE = 500
+
+_PENDING_KEY = "catalog_changed"
+
+
+class CatalogVersionRecord(Base):
+    __tablename__ = "catalog_versions"
+
+    product_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False)
+
+
+class CatalogVersion:
+    """
+    The catalog version as seen by this process. Versions are persisted in
+    catalog_versions and bumped in the transaction that changes the catalog:
+    commits of this process are published at once, those of other processes
+    when sync() next runs, every CATALOG_VERSION_POLL_INTERVAL seconds.
+
+    value moves whenever the catalog changes, caches store the value they
+    were built with and rebuild when it moves. of(product_id) is the value
+    at which that product last changed.
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._changed_at: dict[int, int] = {}
+        # Changes that couldn't be tied to products apply to all of them
+        self._all_changed_at = 0
+        self._persisted: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def of(self, product_id: int) -> int:
+        return max(self._changed_at.get(product_id, 0), self._all_changed_at)
+
+    def bump(
+        self,
+        product_ids: Iterable[int] = (),
+        versions: Mapping[int, int] | None = None,
+    ) -> int:
+        """
+        Record a change of the given products, of every product when none
+        are given. versions are the persisted versions the change produced.
+        """
+        with self._lock:
+            self._merge(versions or {})
+            return self._publish(set(product_ids))
+
+    def advance(self, versions: Mapping[int, int]) -> int:
+        """Record the persisted versions read back, moving if any went up."""
+        with self._lock:
+            moved = self._merge(versions)
+
+            if not moved:
+                return self._value
+
+            return self._publish(moved - {GLOBAL_VERSION_KEY})
+
+    def sync(self, connection: Connection) -> int:
+        """Pick up changes committed elsewhere, one row read when none were."""
+        table = CatalogVersionRecord.__table__
+        current = connection.scalar(
+            select(table.c.version).where(table.c.product_id == GLOBAL_VERSION_KEY)
+        )
+
+        if current is None or current <= self._persisted.get(GLOBAL_VERSION_KEY, 0):
+            return self._value
+
+        return self.advance(
+            dict(connection.execute(select(table.c.product_id, table.c.version)).all())
+        )
+
+    def _merge(self, versions: Mapping[int, int]) -> set[int]:
+        # Versions only go up, a poll that read before a local commit is
+        # older than what that commit recorded and is ignored
+        moved = set()
+
+        for key, version in versions.items():
+            if version > self._persisted.get(key, 0):
+                self._persisted[key] = version
+                moved.add(key)
+
+        return moved
+
+    def _publish(self, product_ids: set[int]) -> int:
+        self._value += 1
+
+        if product_ids:
+            for product_id in product_ids:
+                self._changed_at[product_id] = self._value
+        else:
+            self._all_changed_at = self._value
+
+        return self._value
+
+
+catalog_version = CatalogVersion()
+
+
+def _chunks(values: list) -> Iterable[list]:
+    for start in range(0, len(values), _CHUNK_SIZE):
+        yield values[start : start + _CHUNK_SIZE]
+
+
+def _column_values(instance, *names: str) -> set[int] | None:
+    """
+    Current and pre-flush values of the given columns, None when one isn't
+    loaded. Read from the instance state so deleted rows don't lazy load.
+    """
+    state = inspect(instance)
+    values = set()
+
+    for name in names:
+        if name not in state.dict:
+            return None
+
+        values.add(state.dict[name])
+        values.add(state.committed_state.get(name))
+
+    return {value for value in values if isinstance(value, int)}
+
+
+def _lookup(connection: Connection, column, key_column, keys: set[int]) -> set[int]:
+    found = set()
+
+    for chunk in _chunks(sorted(keys)):
+        found.update(connection.scalars(select(column).where(key_column.in_(chunk))))
+
+    return found
+
+
+def resolve_product_ids(
+    connection: Connection,
+    product_ids: Iterable[int] = (),
+    part_ids: Iterable[int] = (),
+    option_ids: Iterable[int] = (),
+    rule_ids: Iterable[int] = (),
+) -> set[int]:
+    """Products the given parts, options and price rules belong to."""
+    product_ids, part_ids, option_ids = (
+        set(product_ids),
+        set(part_ids),
+        set(option_ids),
+    )
+    rule_ids = set(rule_ids)
+
+    if rule_ids:
+        option_ids |= _lookup(connection, PriceRule.option_id, PriceRule.id, rule_ids)
+
+    if option_ids:
+        part_ids |= _lookup(connection, Option.part_id, Option.id, option_ids)
+
+    if part_ids:
+        product_ids |= _lookup(connection, Part.product_id, Part.id, part_ids)
+
+    return product_ids
+
+
+def catalog_product_ids(connection: Connection, instances: Iterable) -> set[int] | None:
+    """
+    Products whose catalog the given rows belong to, None when that can't
+    be told from what is loaded. Rows deleted in this flush are resolved
+    from their own attributes, the others through the database.
+    """
+    product_ids, part_ids, option_ids, rule_ids = set(), set(), set(), set()
+    references = (
+        (Part, ("product_id",), product_ids),
+        (Option, ("part_id",), part_ids),
+        (OptionCompatibility, ("option1_id", "option2_id"), option_ids),
+        (PriceRule, ("option_id",), option_ids),
+        (PriceRuleCondition, ("price_rule_id",), rule_ids),
+    )
+
+    for instance in instances:
+        for model, columns, ids in references:
+            if isinstance(instance, model):
+                values = _column_values(instance, *columns)
+
+                if values is None:
+                    return None
+
+                ids.update(values)
+
+    return resolve_product_ids(connection, product_ids, part_ids, option_ids, rule_ids)
+
+
+def _upsert_statement(connection: Connection, table):
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+
+    statement = dialect_insert(table)
+
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.product_id], set_={"version": table.c.version + 1}
+    )
+
+
+def bump_catalog_versions(
+    connection: Connection, product_ids: Iterable[int] = ()
+) -> dict[int, int]:
+    """
+    Increment the persisted version of the catalog and of the given products
+    in the caller's transaction, returns the new versions. The global row is
+    locked until commit, so concurrent catalog writes are serialized.
+    """
+    table = CatalogVersionRecord.__table__
+    # A fixed order keeps concurrent writers from deadlocking on the rows
+    keys = sorted({GLOBAL_VERSION_KEY, *product_ids})
+    upsert = _upsert_statement(connection, table)
+    versions = {}
+
+    for chunk in _chunks(keys):
+        if upsert is not None:
+            connection.execute(
+                upsert.values([{"product_id": key, "version": 1} for key in chunk])
+            )
+        else:
+            connection.execute(
+                update(table)
+                .where(table.c.product_id.in_(chunk))
+                .values(version=table.c.version + 1)
+            )
+            existing = set(
+                connection.scalars(
+                    select(table.c.product_id).where(table.c.product_id.in_(chunk))
+                )
+            )
+            missing = [key for key in chunk if key not in existing]
+
+            if missing:
+                connection.execute(
+                    insert(table),
+                    [{"product_id": key, "version": 1} for key in missing],
+                )
+
+        versions.update(
+            connection.execute(
+                select(table.c.product_id, table.c.version).where(
+                    table.c.product_id.in_(chunk)
+                )
+            ).all()
+        )
+
+    return versions
+
+
+class CatalogVersionPoller:
+    """Background thread picking up catalog changes of other processes."""
+
+    def __init__(
+        self,
+        version: CatalogVersion,
+        engine: Engine,
+        interval: float = CATALOG_VERSION_POLL_INTERVAL,
+    ):
+        self.version = version
+        self.engine = engine
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="catalog-version-poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> int:
+        with self.engine.connect() as connection:
+            return self.version.sync(connection)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Could not read the catalog version")
+
+            self._stop.wait(self.interval)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_changes(session: Session, flush_context):
+    # Appending an option to an order only touches collections, we ignore it
+    changed = [
+        instance
+        for instance in chain(
+            session.new,
+            session.deleted,
+            (
+                instance
+                for instance in session.dirty
+                if session.is_modified(instance, include_collections=False)
+            ),
+        )
+        if isinstance(instance, CATALOG_MODELS)
+    ]
+
+    if not changed:
+        return
+
+    connection = session.connection()
+    product_ids = catalog_product_ids(connection, changed)
+    versions = bump_catalog_versions(connection, product_ids or ())
+    pending_versions, pending_products = session.info.get(_PENDING_KEY, ({}, set()))
+
+    # None, once any flush couldn't tell its products, bumps them all
+    if product_ids is None or pending_products is None:
+        pending_products = None
+    else:
+        pending_products = pending_products | product_ids
+
+    session.info[_PENDING_KEY] = ({**pending_versions, **versions}, pending_products)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_catalog_changes(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+
+    if pending is not None:
+        versions, product_ids = pending
+        catalog_version.bump(product_ids or (), versions)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -3,6 +3,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -19,14 +20,16 @@ product_categories = Table(
     Base.metadata,
     Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
     Column("category_id", Integer, ForeignKey("categories.id"), primary_key=True),
+    # The primary key leads with product_id, category pages need the reverse
+    Index("ix_product_categories_category_id_product_id", "category_id", "product_id"),
 )
 
 
 order_options = Table(
     "order_options",
     Base.metadata,
-    Column("order_id", Integer, ForeignKey("orders.id")),
-    Column("option_id", Integer, ForeignKey("options.id")),
+    Column("order_id", Integer, ForeignKey("orders.id"), index=True),
+    Column("option_id", Integer, ForeignKey("options.id"), index=True),
 )
 
 # Product, Parts, Rules and Options would be in different files,
@@ -64,7 +67,7 @@ class Part(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     description = Column(Text)
-    product_id = Column(Integer, ForeignKey("products.id"))
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
 
     product = relationship("Product", back_populates="parts")
     options = relationship("Option", back_populates="part")
@@ -72,10 +75,19 @@ class Part(Base):
 
 class OptionCompatibility(Base):
     __tablename__ = "option_compatibilities"
+    # Rows are imported without ids, re-imports upsert on the option pair
+    __table_args__ = (
+        Index(
+            "uq_option_compatibilities_option1_id_option2_id",
+            "option1_id",
+            "option2_id",
+            unique=True,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    option1_id = Column(Integer, ForeignKey("options.id"))
-    option2_id = Column(Integer, ForeignKey("options.id"))
+    option1_id = Column(Integer, ForeignKey("options.id"), index=True)
+    option2_id = Column(Integer, ForeignKey("options.id"), index=True)
     compatible = Column(Boolean)
 
     option1 = relationship("Option", foreign_keys=[option1_id])
@@ -88,7 +100,7 @@ class Option(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     price = Column(Numeric(10, 2), nullable=False)
-    part_id = Column(Integer, ForeignKey("parts.id"))
+    part_id = Column(Integer, ForeignKey("parts.id"), index=True)
 
     in_stock = Column(Boolean, default=True)
 
@@ -111,7 +123,7 @@ class PriceRule(Base):
     __tablename__ = "price_rules"
 
     id = Column(Integer, primary_key=True)
-    option_id = Column(Integer, ForeignKey("products.id"))
+    option_id = Column(Integer, ForeignKey("products.id"), index=True)
     price = Column(Numeric(10, 2), nullable=False)
 
     conditions = relationship("PriceRuleCondition", back_populates="price_rule")
@@ -119,9 +131,17 @@ class PriceRule(Base):
 
 class PriceRuleCondition(Base):
     __tablename__ = "price_rule_conditions"
+    __table_args__ = (
+        Index(
+            "uq_price_rule_conditions_price_rule_id_option_id",
+            "price_rule_id",
+            "option_id",
+            unique=True,
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
-    price_rule_id = Column(Integer, ForeignKey("price_rules.id"))
+    price_rule_id = Column(Integer, ForeignKey("price_rules.id"), index=True)
     option_id = Column(Integer, ForeignKey("options.id"))
 
     price_rule = relationship("PriceRule", back_populates="conditions")
@@ -133,7 +153,7 @@ class Order(Base):
 
     id = Column(Integer, primary_key=True)
     customer_id = Column(Integer)  # Assuming a customers table exists
-    order_date = Column(DateTime, default=func.now())
+    order_date = Column(DateTime, default=func.now(), index=True)
     total_price = Column(Numeric(10, 2), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"))
 
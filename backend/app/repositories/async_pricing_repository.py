@@ -0,0 +1,139 @@
+from collections import defaultdict
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Order,
+    Part,
+    PriceRule,
+    Product,
+)
+from backend.app.repositories.pricing_repository import (
+    CatalogSnapshot,
+    group_compatibilities,
+)
+
+
+class AsyncPricingOrderRepository:
+    """
+    Async counterpart of PricingOrderRepository. Relationships used later
+    are loaded eagerly since an AsyncSession can't lazy load them.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_order(self, order_id: int) -> Order:
+        order: Order | None = await self.db.scalar(
+            select(Order)
+            .filter(Order.id == order_id)
+            .options(selectinload(Order.options))
+        )
+
+        if not order:
+            raise ValueError(f"Order not found: {order_id}")
+
+        return order
+
+    async def get_product(self, product_id: int) -> Product:
+        product: Product | None = await self.db.get(Product, product_id)
+
+        if not product:
+            raise ValueError(f"Product not found: {product_id}")
+
+        return product
+
+    async def get_product_ids(self) -> List[int]:
+        return list(await self.db.scalars(select(Product.id)))
+
+    async def load_catalog(self, product_id: int) -> CatalogSnapshot:
+        parts = list(
+            await self.db.scalars(
+                select(Part)
+                .filter(Part.product_id == product_id)
+                .options(selectinload(Part.options))
+                .order_by(Part.id)
+            )
+        )
+        all_options = sorted(
+            (option for part in parts for option in part.options),
+            key=lambda option: option.id,
+        )
+
+        return CatalogSnapshot(
+            product_id=product_id,
+            parts=parts,
+            options=[option for option in all_options if option.in_stock],
+            grouped_compatibilities=await self.get_compatibilities(product_id),
+            price_rules=await self.get_price_rules(product_id),
+            all_options=all_options,
+        )
+
+    async def get_price_rules(self, product_id: int) -> List[PriceRule]:
+        return list(
+            await self.db.scalars(
+                select(PriceRule)
+                .join(Option, Option.id == PriceRule.option_id)
+                .join(Part, Part.id == Option.part_id)
+                .filter(Part.product_id == product_id)
+                .options(selectinload(PriceRule.conditions))
+            )
+        )
+
+    async def get_option(self, option_id: int) -> Option:
+        option: Option | None = await self.db.get(Option, option_id)
+
+        if not option:
+            raise ValueError(f"Option not found: {option_id}")
+
+        return option
+
+    async def get_options(self, product_id: int) -> List[Option]:
+        return list(
+            await self.db.scalars(
+                select(Option)
+                .join(Part, Part.id == Option.part_id)
+                .filter(Option.in_stock, Part.product_id == product_id)
+            )
+        )
+
+    async def get_parts(self, product_id: int) -> List[Part]:
+        return list(
+            await self.db.scalars(select(Part).filter(Part.product_id == product_id))
+        )
+
+    async def get_compatibilities(
+        self, product_id: int
+    ) -> defaultdict[int, dict[str, list[int]]]:
+        rows = await self.db.execute(
+            select(
+                OptionCompatibility.option1_id,
+                OptionCompatibility.option2_id,
+                OptionCompatibility.compatible,
+            )
+            .join(Option, Option.id == OptionCompatibility.option1_id)
+            .join(Part, Part.id == Option.part_id)
+            .filter(Option.in_stock, Part.product_id == product_id)
+            .order_by(OptionCompatibility.option1_id, OptionCompatibility.id)
+        )
+
+        return group_compatibilities(rows.tuples())
+
+    async def create_order(self, order: Order) -> Order:
+        # Flush to get the id, the caller commits once the order is complete
+        self.db.add(order)
+        await self.db.flush()
+        return order
+
+    async def update_order(self, order: Order) -> Order:
+        self.db.add(order)
+        await self.db.commit()
+        return order
+
+    async def commit(self):
+        await self.db.commit()
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from backend.app.models.product import Order, order_options
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class OrderExportRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def iter_order_rows(
+        self, since: datetime | None = None, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Row]:
+        """
+        (id, customer_id, order_date, total_price, product_id, option_id) rows,
+        one per order option, with the rows of an order next to each other.
+        Fetched batch_size at a time through a server-side cursor when the
+        driver has one.
+        """
+        statement = (
+            select(
+                Order.id,
+                Order.customer_id,
+                Order.order_date,
+                Order.total_price,
+                Order.product_id,
+                order_options.c.option_id,
+            )
+            .outerjoin(order_options, order_options.c.order_id == Order.id)
+            .order_by(Order.order_date, Order.id, order_options.c.option_id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        if since is not None:
+            statement = statement.where(Order.order_date >= since)
+
+        yield from self.db.execute(statement)
@@ -1,7 +1,7 @@
 from collections import defaultdict
-from typing import List
-from sqlalchemy import Column
-from sqlalchemy.orm import Session, joinedload
+from dataclasses import dataclass, field
+from typing import Iterable, List
+from sqlalchemy.orm import Session, selectinload
 
 from backend.app.models.product import (
     Option,
@@ -13,6 +13,34 @@ from backend.app.models.product import (
 )
 
 
+@dataclass
+class CatalogSnapshot:
+    """Everything needed to configure and price one product."""
+
+    product_id: int
+    parts: list[Part]
+    # In stock options, the selectable ones
+    options: list[Option]
+    grouped_compatibilities: dict[int, dict[str, list[int]]]
+    price_rules: list[PriceRule]
+    all_options: list[Option] = field(default_factory=list)
+
+
+def group_compatibilities(
+    rows: Iterable[tuple[int, int, bool]],
+) -> defaultdict[int, dict[str, list[int]]]:
+    """Group (option1_id, option2_id, compatible) rows by option1_id."""
+    grouped_compatibilities = defaultdict(
+        lambda: {"compatible": [], "incompatible": []}
+    )
+
+    for option1_id, option2_id, compatible in rows:
+        kind = "compatible" if compatible is True else "incompatible"
+        grouped_compatibilities[option1_id][kind].append(option2_id)
+
+    return grouped_compatibilities
+
+
 class PricingOrderRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -35,8 +63,44 @@ class PricingOrderRepository:
 
         return product
 
-    def get_price_rules(self, product_id: int):
-        return self.db.query(PriceRule).filter(PriceRule.product_id == product_id).all()
+    def get_product_ids(self) -> List[int]:
+        return [product_id for (product_id,) in self.db.query(Product.id).all()]
+
+    def load_catalog(self, product_id: int) -> CatalogSnapshot:
+        """
+        Load a product's catalog in a fixed number of queries: parts with
+        their options, compatibilities, and price rules with their conditions.
+        """
+        parts = (
+            self.db.query(Part)
+            .filter(Part.product_id == product_id)
+            .options(selectinload(Part.options))
+            .order_by(Part.id)
+            .all()
+        )
+        all_options = sorted(
+            (option for part in parts for option in part.options),
+            key=lambda option: option.id,
+        )
+
+        return CatalogSnapshot(
+            product_id=product_id,
+            parts=parts,
+            options=[option for option in all_options if option.in_stock],
+            grouped_compatibilities=self.get_compatibilities(product_id),
+            price_rules=self.get_price_rules(product_id),
+            all_options=all_options,
+        )
+
+    def get_price_rules(self, product_id: int) -> List[PriceRule]:
+        return (
+            self.db.query(PriceRule)
+            .join(Option, Option.id == PriceRule.option_id)
+            .join(Part, Part.id == Option.part_id)
+            .filter(Part.product_id == product_id)
+            .options(selectinload(PriceRule.conditions))
+            .all()
+        )
 
     def get_option(self, option_id: int):
         option: Option | None = (
@@ -48,11 +112,6 @@ class PricingOrderRepository:
 
         return option
 
-    def get_price_rules_by_option_ids(self, option_ids: list[int]) -> List[PriceRule]:
-        return (
-            self.db.query(PriceRule).filter(PriceRule.option_id.in_(option_ids)).all()
-        )
-
     def get_options(self, product_id: int) -> List[Option]:
         return (
             self.db.query(Option)
@@ -64,41 +123,36 @@ class PricingOrderRepository:
     def update_order(self, order: Order):
         self.db.add(order)
         self.db.commit()
-        self.db.refresh(order)
         return order
 
     def create_order(self, order: Order):
+        # Flush to get the id, the caller commits once the order is complete
         self.db.add(order)
-        self.db.commit()
-        self.db.refresh(order)
+        self.db.flush()
         return order
 
+    def commit(self):
+        self.db.commit()
+
     def get_parts(self, product_id: int) -> List[Part]:
         return self.db.query(Part).filter(Part.product_id == product_id).all()
 
     def get_compatibilities(
         self, product_id: int
     ) -> defaultdict[int, dict[str, list[int]]]:
+        # Only the option owning the rule is scoped, rules pointing to out of
+        # stock options still matter to the selection model
         compatibilities = (
-            self.db.query(OptionCompatibility)
+            self.db.query(
+                OptionCompatibility.option1_id,
+                OptionCompatibility.option2_id,
+                OptionCompatibility.compatible,
+            )
+            .join(Option, Option.id == OptionCompatibility.option1_id)
             .join(Part, Part.id == Option.part_id)
             .filter(Option.in_stock, Part.product_id == product_id)
-            .order_by(OptionCompatibility.option1_id)
+            .order_by(OptionCompatibility.option1_id, OptionCompatibility.id)
             .all()
         )
 
-        grouped_compatibilities = defaultdict(
-            lambda: {"compatible": [], "incompatible": []}
-        )
-
-        for compatibility in compatibilities:
-            if compatibility.compatible is True:
-                grouped_compatibilities[compatibility.option1_id]["compatible"].append(
-                    compatibility.option2_id
-                )
-            else:
-                grouped_compatibilities[compatibility.option1_id][
-                    "incompatible"
-                ].append(compatibility.option2_id)
-
-        return grouped_compatibilities
+        return group_compatibilities(compatibilities)
@@ -0,0 +1,87 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.product import OptionCompatibility
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.benchmarks.catalog_generator import (
+    CatalogSpec,
+    generate_catalog,
+    insert_catalog,
+)
+
+SPEC = CatalogSpec(parts=4, options_per_part=10, compatibility_density=0.5)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    # Three products with the same shape, ids don't overlap
+    for product_id in (1, 2, 3):
+        insert_catalog(session, generate_catalog(replace(SPEC, product_id=product_id)))
+
+    yield session
+
+    session.close()
+
+
+def test_compatibilities_are_scoped_to_the_product(db_session, query_budget):
+    repository = PricingOrderRepository(db_session)
+    expected = generate_catalog(replace(SPEC, product_id=2))
+
+    with query_budget(1, db_session.get_bind()):
+        grouped = repository.get_compatibilities(2)
+
+    assert grouped == expected.grouped_compatibilities
+    assert sum(
+        len(group["compatible"]) + len(group["incompatible"])
+        for group in grouped.values()
+    ) == len(expected.compatibilities)
+    assert db_session.query(OptionCompatibility).count() == 3 * len(
+        expected.compatibilities
+    )
+
+
+def test_compatibility_query_uses_indexes(db_session, query_budget):
+    with query_budget(1, db_session.get_bind()) as stats:
+        PricingOrderRepository(db_session).get_compatibilities(1)
+
+    statement, parameters = stats.statements[0], stats.parameters[0]
+    plan = " ".join(
+        row[-1]
+        for row in db_session.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+    )
+
+    assert "ix_parts_product_id" in plan
+    assert "ix_options_part_id" in plan
+    # Either index leading with option1_id serves the lookup
+    assert "option_compatibilities USING INDEX" in plan
+    assert "SCAN option_compatibilities" not in plan
+
+
+def test_load_catalog_in_a_fixed_number_of_queries(db_session, query_budget):
+    repository = PricingOrderRepository(db_session)
+    db_session.expire_all()
+
+    with query_budget(5, db_session.get_bind()) as stats:
+        catalog = repository.load_catalog(3)
+        # Relationships used by the services are already loaded
+        option_count = sum(len(part.options) for part in catalog.parts)
+        condition_count = sum(len(rule.conditions) for rule in catalog.price_rules)
+
+    expected = generate_catalog(replace(SPEC, product_id=3))
+
+    assert stats.count == 5
+    assert option_count == len(catalog.options) == len(expected.options)
+    assert condition_count == len(expected.conditions)
+    assert catalog.grouped_compatibilities == expected.grouped_compatibilities
+    assert {part.product_id for part in catalog.parts} == {3}
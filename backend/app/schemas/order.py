@@ -8,6 +8,15 @@ class OrderResponse(BaseModel):
     total_price: float
     available_options: dict[int, list[int]]
 
+    @classmethod
+    def trusted(
+        cls, id: int, total_price, available_options: dict[int, list[int]]
+    ) -> "OrderResponse":
+        """Built from values computed by the services, without validation."""
+        return cls.model_construct(
+            id=id, total_price=float(total_price), available_options=available_options
+        )
+
 
 class CreateOrderPayload(BaseModel):
     product_id: int
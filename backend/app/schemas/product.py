@@ -1,9 +1,11 @@
-from pydantic import BaseModel, ConfigDict
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ProductBase(BaseModel):
     name: str
-    description: str
+    description: str | None = None
 
 
 class ProductCreate(ProductBase):
@@ -11,6 +13,44 @@ class ProductCreate(ProductBase):
 
 
 class Product(ProductBase):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, from_attributes=True)
 
     id: int
+
+
+class ProductListing(Product):
+    # Cheapest and most expensive valid configuration, None until computed
+    from_price: Decimal | None = None
+    max_price: Decimal | None = None
+
+
+# Selections checked by one availability request
+MAX_AVAILABILITY_SELECTIONS = 1000
+
+
+class AvailabilityRequest(BaseModel):
+    selections: list[list[int]] = Field(max_length=MAX_AVAILABILITY_SELECTIONS)
+    parallel: bool = False
+
+
+class SelectionAvailability(BaseModel):
+    option_ids: list[int]
+    valid: bool
+    available_options: dict[int, list[int]]
+
+
+class AvailabilityResponse(BaseModel):
+    results: list[SelectionAvailability]
+
+
+class BatchPriceRequest(BaseModel):
+    configurations: list[list[int]]
+
+
+class ConfigurationPrice(BaseModel):
+    option_ids: list[int]
+    total_price: Decimal
+
+
+class BatchPriceResponse(BaseModel):
+    results: list[ConfigurationPrice]
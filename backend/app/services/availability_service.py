@@ -0,0 +1,81 @@
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.schemas.product import SelectionAvailability
+from backend.app.services.catalog_store import CatalogStore, product_catalogs
+from backend.app.services.model_cache import VersionedLRUCache, product_models
+from backend.app.services.selection_backends import (
+    SELECTION_BACKEND,
+    create_selection_service,
+    load_product_model,
+)
+from backend.app.services.solver_pool import (
+    CatalogPayload,
+    SolverPool,
+    evaluate_selections,
+    solver_pool,
+)
+
+
+class AvailabilityService:
+    """
+    Read-only availability and validity checks for many partial selections
+    of one product, sharing a single compiled model for the whole batch.
+    """
+
+    def __init__(
+        self,
+        repository: PricingOrderRepository,
+        backend: str = SELECTION_BACKEND,
+        model_cache: VersionedLRUCache = product_models,
+        pool: SolverPool = solver_pool,
+        catalogs: CatalogStore = product_catalogs,
+    ):
+        self.repository = repository
+        self.backend = backend
+        self.model_cache = model_cache
+        self.pool = pool
+        self.catalogs = catalogs
+
+    def evaluate(
+        self, product_id: int, selections: list[list[int]], parallel: bool = False
+    ) -> list[SelectionAvailability]:
+        if parallel:
+            results = self.pool.evaluate_selections(
+                self.backend, self._payload(product_id), selections
+            )
+        else:
+            selector = create_selection_service(self.backend)
+            load_product_model(
+                selector, self.repository, product_id, self.model_cache, self.catalogs
+            )
+            options = {
+                option.id: option
+                for option in self.catalogs.get(self.repository, product_id).options
+            }
+            # Same deadline as the pool, checked between selections
+            results = evaluate_selections(
+                selector, options, selections, self.pool.timeout
+            )
+
+        return [
+            SelectionAvailability(
+                option_ids=option_ids,
+                valid=valid,
+                available_options=available_options,
+            )
+            for option_ids, (available_options, valid) in zip(selections, results)
+        ]
+
+    def _payload(self, product_id: int) -> CatalogPayload:
+        version = self.model_cache.version.of(product_id)
+
+        def build() -> CatalogPayload:
+            catalog = self.catalogs.get(self.repository, product_id)
+
+            return CatalogPayload.build(
+                (product_id, version),
+                catalog.parts,
+                catalog.options,
+                catalog.grouped_compatibilities,
+            )
+
+        return self.model_cache.get_or_build((product_id, "payload"), build)
@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 from backend.app.models.product import Option, Order, Part, PriceRule, Product
 from backend.app.schemas.order import OrderResponse
 
+if TYPE_CHECKING:
+    from backend.app.services.price_service import PriceIndex
+
 
 class BaseOrderService(ABC):
     @abstractmethod
@@ -19,19 +23,43 @@ class BasePriceService(ABC):
     def calculate_price(self, order: Order, rules: list[PriceRule]) -> float:
         pass
 
+    @abstractmethod
+    def calculate_indexed_price(
+        self, options: list[Option], index: "PriceIndex"
+    ) -> float:
+        pass
+
 
 class BaseSelectionService(ABC):
-    @abstractmethod
     def load_compatibilities(
         self,
         parts: list[Part],
         options: list[Option],
         grouped_compatibilities: dict[int, dict[str, list[int]]],
     ):
+        self.load_model(self.compile_model(parts, options, grouped_compatibilities))
+
+    @abstractmethod
+    def compile_model(
+        self,
+        parts: list[Part],
+        options: list[Option],
+        grouped_compatibilities: dict[int, dict[str, list[int]]],
+    ):
+        """
+        Build the reusable representation of a product configuration.
+        It must not depend on the current selection so it can be cached.
+        """
         pass
 
     @abstractmethod
-    def get_available_options(self, parts: list[Part]) -> dict[int, list[int]]:
+    def load_model(self, model):
+        pass
+
+    @abstractmethod
+    def get_available_options(
+        self, parts: list[Part] | None = None
+    ) -> dict[int, list[int]]:
         pass
 
     @abstractmethod
@@ -41,3 +69,12 @@ class BaseSelectionService(ABC):
     @abstractmethod
     def select_part_options(self, options: list[Option]):
         pass
+
+    @abstractmethod
+    def push(self):
+        """Save the current selection so pop() can roll back to it."""
+        pass
+
+    @abstractmethod
+    def pop(self):
+        pass
@@ -0,0 +1,118 @@
+from decimal import Decimal
+from typing import Iterable
+
+import numpy as np
+
+from backend.app.models.product import Option
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.catalog_store import CatalogStore, product_catalogs
+from backend.app.services.model_cache import VersionedLRUCache, product_models
+from backend.app.services.price_service import PriceIndex
+
+
+def to_cents(price) -> int:
+    return int(Decimal(price).scaleb(2).to_integral_value())
+
+
+class PriceMatrix:
+    """
+    A product's prices laid out for NumPy: one column per option, base
+    prices in integer cents and a boolean condition row per price rule.
+    Rules of each option are kept in the priority order of PriceIndex so
+    batch totals match the scalar path exactly.
+    """
+
+    def __init__(self, options: Iterable[Option], index: PriceIndex):
+        options = list(options)
+        self.columns: dict[int, int] = {
+            option.id: column for column, option in enumerate(options)
+        }
+        self.base_prices = np.array(
+            [to_cents(option.price) for option in options], dtype=np.int64
+        )
+
+        rules = [
+            (self.columns[option_id], rule)
+            for option_id, option_rules in index.rules_by_option.items()
+            if option_id in self.columns
+            for rule in option_rules
+        ]
+        self.conditions = np.zeros((len(rules), len(options)), dtype=np.int64)
+        self.condition_counts = np.zeros(len(rules), dtype=np.int64)
+        self.rule_prices = np.zeros(len(rules), dtype=np.int64)
+        # column -> rule rows, most specific first
+        self.rules_by_column: dict[int, list[int]] = {}
+
+        for row, (column, rule) in enumerate(rules):
+            self.rule_prices[row] = to_cents(rule.price)
+            self.condition_counts[row] = len(rule.conditions)
+            self.rules_by_column.setdefault(column, []).append(row)
+
+            for option_id in rule.conditions:
+                if option_id in self.columns:
+                    self.conditions[row, self.columns[option_id]] = 1
+                else:
+                    # Conditions on options of other products never match
+                    self.condition_counts[row] = -1
+
+    def encode(self, configurations: list[list[int]]) -> np.ndarray:
+        selected = np.zeros((len(configurations), len(self.columns)), dtype=np.int64)
+
+        for row, option_ids in enumerate(configurations):
+            for option_id in option_ids:
+                if option_id not in self.columns:
+                    raise ValueError(f"Option not found: {option_id}")
+
+                selected[row, self.columns[option_id]] = 1
+
+        return selected
+
+    def totals(self, configurations: list[list[int]]) -> list[Decimal]:
+        selected = self.encode(configurations)
+        totals = selected @ self.base_prices
+        matched = (selected @ self.conditions.T) == self.condition_counts
+
+        for column, rows in self.rules_by_column.items():
+            base_price = self.base_prices[column]
+            prices = np.full(len(configurations), base_price, dtype=np.int64)
+
+            # Apply the least specific rule first so the best match is left
+            for row in reversed(rows):
+                prices = np.where(matched[:, row], self.rule_prices[row], prices)
+
+            totals += selected[:, column] * (prices - base_price)
+
+        return [Decimal(int(total)).scaleb(-2) for total in totals]
+
+
+class BatchPriceService:
+    """
+    Prices many configurations of one product in a single pass, for
+    repricing stored configurations after a catalog change.
+    """
+
+    def __init__(
+        self,
+        repository: PricingOrderRepository,
+        model_cache: VersionedLRUCache = product_models,
+        catalogs: CatalogStore = product_catalogs,
+    ):
+        self.repository = repository
+        self.model_cache = model_cache
+        self.catalogs = catalogs
+
+    def calculate_prices(
+        self, product_id: int, configurations: list[list[int]]
+    ) -> list[Decimal]:
+        return self._price_matrix(product_id).totals(configurations)
+
+    def _price_matrix(self, product_id: int) -> PriceMatrix:
+        return self.model_cache.get_or_build(
+            (product_id, "price_matrix"),
+            lambda: self._build_price_matrix(product_id),
+        )
+
+    def _build_price_matrix(self, product_id: int) -> PriceMatrix:
+        catalog = self.catalogs.get(self.repository, product_id)
+
+        return PriceMatrix(catalog.all_options, PriceIndex(catalog.price_rules))
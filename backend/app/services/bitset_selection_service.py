@@ -0,0 +1,280 @@
+from dataclasses import dataclass
+
+from backend.app.models.product import Option, Part
+from backend.app.services.base import BaseSelectionService
+
+# A clause is satisfied when at least one part takes a value inside its mask:
+# ((part position, allowed options mask), ...)
+Clause = tuple[tuple[int, int], ...]
+
+
+@dataclass(frozen=True)
+class BitsetModel:
+    part_ids: tuple[int, ...]
+    part_options: dict[int, list[int]]
+    # option id -> (part position, option bit)
+    option_bits: dict[int, tuple[int, int]]
+    full_domains: tuple[int, ...]
+    clauses: tuple[Clause, ...]
+    # part position -> indexes of the clauses that mention it
+    watches: tuple[tuple[int, ...], ...]
+
+
+def compile_bitset_model(
+    parts: list[Part],
+    options: list[Option],
+    grouped_compatibilities: dict[int, dict[str, list[int]]],
+) -> BitsetModel:
+    """
+    Every part is a domain bitmask over its in stock options and every
+    compatibility row becomes a clause over those masks, with the same
+    meaning as the z3 constraint: selecting option1 implies selecting one of
+    the compatible options or not selecting one of the incompatible ones.
+    """
+    part_options: dict[int, list[int]] = {part.id: [] for part in parts}
+
+    for option in options:
+        part_options.setdefault(option.part_id, []).append(option.id)
+
+    part_ids = tuple(part_options)
+    option_bits = {
+        option_id: (position, 1 << index)
+        for position, part_id in enumerate(part_ids)
+        for index, option_id in enumerate(part_options[part_id])
+    }
+    full_domains = tuple((1 << len(part_options[part_id])) - 1 for part_id in part_ids)
+
+    clauses = []
+
+    for option1_id, rules in grouped_compatibilities.items():
+        # Same treatment of out of stock options as the z3 backend
+        if (
+            not rules
+            or option1_id not in option_bits
+            or any(opt_id not in option_bits for opt_id in rules["incompatible"])
+        ):
+            continue
+
+        allowed: dict[int, int] = {}
+
+        def add_literal(position: int, mask: int):
+            allowed[position] = allowed.get(position, 0) | mask
+
+        position, bit = option_bits[option1_id]
+        add_literal(position, full_domains[position] & ~bit)
+
+        for opt_id in rules["compatible"]:
+            if opt_id in option_bits:
+                add_literal(*option_bits[opt_id])
+
+        for opt_id in rules["incompatible"]:
+            position, bit = option_bits[opt_id]
+            add_literal(position, full_domains[position] & ~bit)
+
+        # A literal covering the whole domain always holds
+        if any(mask == full_domains[position] for position, mask in allowed.items()):
+            continue
+
+        clauses.append(tuple(allowed.items()))
+
+    watches: list[list[int]] = [[] for _ in part_ids]
+
+    for index, clause in enumerate(clauses):
+        for position, _ in clause:
+            watches[position].append(index)
+
+    return BitsetModel(
+        part_ids=part_ids,
+        part_options=part_options,
+        option_bits=option_bits,
+        full_domains=full_domains,
+        clauses=tuple(clauses),
+        watches=tuple(tuple(indexes) for indexes in watches),
+    )
+
+
+class BitsetSelectionService(BaseSelectionService):
+    """
+    Pure Python alternative to PartSelectionService. Domains are integers
+    where bit i means "the i-th option of the part is still possible",
+    clauses are propagated with bit operations and a small backtracking
+    search completes the answer, so no solver is involved.
+    """
+
+    def __init__(self):
+        self.model: BitsetModel | None = None
+        self.domains: list[int] = []
+        self._saved_domains: list[list[int]] = []
+
+    def compile_model(
+        self,
+        parts: list[Part],
+        options: list[Option],
+        grouped_compatibilities: dict[int, dict[str, list[int]]],
+    ) -> BitsetModel:
+        return compile_bitset_model(parts, options, grouped_compatibilities)
+
+    def load_model(self, model: BitsetModel):
+        self.model = model
+        self.domains = list(model.full_domains)
+        self._saved_domains = []
+
+    @property
+    def part_options(self) -> dict[int, list[int]]:
+        return self.model.part_options
+
+    def get_available_options(
+        self, parts: list[Part] | None = None
+    ) -> dict[int, list[int]]:
+        model = self.model
+        part_ids = model.part_ids if parts is None else [part.id for part in parts]
+        positions = {
+            part_id: position for position, part_id in enumerate(model.part_ids)
+        }
+
+        domains = list(self.domains)
+        pending = list(domains) if self._propagate(domains) else [0] * len(domains)
+        available = [0] * len(domains)
+
+        # Same harvesting as the z3 backend: every solution proves one option
+        # per part, an empty search rules out the rest of a part at once
+        for part_id in part_ids:
+            position = positions.get(part_id)
+
+            while position is not None and pending[position]:
+                candidate = list(domains)
+                candidate[position] &= pending[position]
+                solution = self._solve(candidate, position, pending)
+
+                if solution is None:
+                    break
+
+                for index, bit in enumerate(solution):
+                    pending[index] &= ~bit
+                    available[index] |= bit
+
+        return {
+            part_id: (
+                self._option_ids(part_id, available[positions[part_id]])
+                if part_id in positions
+                else []
+            )
+            for part_id in part_ids
+        }
+
+    def is_selection_valid(self) -> bool:
+        return self._solve(list(self.domains)) is not None
+
+    def select_part_options(self, options: list[Option]):
+        for option in options:
+            position, bit = self.model.option_bits[option.id]
+            self.domains[position] &= bit
+
+    def push(self):
+        self._saved_domains.append(list(self.domains))
+
+    def pop(self):
+        self.domains = self._saved_domains.pop()
+
+    def _option_ids(self, part_id: int, mask: int) -> list[int]:
+        return [
+            option_id
+            for index, option_id in enumerate(self.model.part_options[part_id])
+            if mask >> index & 1
+        ]
+
+    def _propagate(self, domains: list[int], changed: int | None = None) -> bool:
+        """
+        Unit propagation: a clause whose literals are all false but one
+        narrows that part to the allowed mask. Works in place on domains,
+        when only the part at position `changed` moved since the last
+        fixpoint only the clauses watching it are revisited.
+        """
+        if not all(domains):
+            return False
+
+        clauses = self.model.clauses
+        watches = self.model.watches
+        queue = list(range(len(clauses)) if changed is None else watches[changed])
+        queued = set(queue)
+
+        while queue:
+            index = queue.pop()
+            queued.discard(index)
+
+            unit = None
+            open_literals = 0
+
+            for position, allowed in clauses[index]:
+                domain = domains[position]
+
+                if not domain & allowed:
+                    continue
+
+                if not domain & ~allowed:
+                    # Every remaining value satisfies the clause
+                    open_literals = -1
+                    break
+
+                open_literals += 1
+                unit = (position, allowed)
+
+            if open_literals == 0:
+                return False
+
+            if open_literals != 1:
+                continue
+
+            position, allowed = unit
+            domains[position] &= allowed
+
+            for watched in watches[position]:
+                if watched not in queued:
+                    queue.append(watched)
+                    queued.add(watched)
+
+        return True
+
+    def _solve(
+        self,
+        domains: list[int],
+        changed: int | None = None,
+        preferred: list[int] | None = None,
+    ) -> list[int] | None:
+        """
+        Depth first search returning one option bit per part, or None.
+        Values in `preferred` are tried first so a single solution proves as
+        many pending options as possible.
+        """
+        if not self._propagate(domains, changed):
+            return None
+
+        position = None
+        smallest = None
+
+        for index, domain in enumerate(domains):
+            if domain & (domain - 1):
+                size = domain.bit_count()
+
+                if smallest is None or size < smallest:
+                    position, smallest = index, size
+
+        if position is None:
+            return domains
+
+        domain = domains[position]
+        first = domain & preferred[position] if preferred else 0
+
+        for values in (first, domain & ~first):
+            while values:
+                bit = values & -values
+                values &= ~bit
+
+                candidate = list(domains)
+                candidate[position] = bit
+                solution = self._solve(candidate, position, preferred)
+
+                if solution is not None:
+                    return solution
+
+        return None
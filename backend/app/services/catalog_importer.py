@@ -0,0 +1,399 @@
+"""
+Import catalog feeds into the database.
+
+    PYTHONPATH=. python -m backend.app.services.catalog_importer \
+        --products products.csv --parts parts.csv --options options.jsonl \
+        --compatibilities compatibilities.csv --price-rules price_rules.csv \
+        --price-rule-conditions price_rule_conditions.csv
+
+Files are CSV with a header row or JSON Lines, one object per line. They
+are streamed in batches, every reference is checked against the database
+and the rows imported before it, and everything is committed at once.
+"""
+
+import argparse
+import csv
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.orm import Session
+
+from backend.app.models.catalog_version import (
+    CatalogVersion,
+    bump_catalog_versions,
+    catalog_version,
+    resolve_product_ids,
+)
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+
+IMPORT_BATCH_SIZE = 1000
+
+
+class CatalogImportError(ValueError):
+    def __init__(self, path: str, line: int, message: str):
+        super().__init__(f"{path}:{line}: {message}")
+        self.path = path
+        self.line = line
+
+
+def _integer(value: Any) -> int:
+    return int(value)
+
+
+def _optional_integer(value: Any) -> int | None:
+    return None if value in (None, "") else int(value)
+
+
+def _price(value: Any) -> Decimal:
+    try:
+        price = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"invalid price {value!r}")
+
+    if price < 0:
+        raise ValueError(f"negative price {value!r}")
+
+    return price
+
+
+def _boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    if str(value).strip().lower() in ("1", "true", "yes", "y"):
+        return True
+
+    if str(value).strip().lower() in ("0", "false", "no", "n"):
+        return False
+
+    raise ValueError(f"invalid boolean {value!r}")
+
+
+def _text(value: Any) -> str:
+    if value in (None, ""):
+        raise ValueError("empty value")
+
+    return str(value)
+
+
+def _optional_text(value: Any) -> str | None:
+    return None if value in (None, "") else str(value)
+
+
+@dataclass(frozen=True)
+class Feed:
+    """How the rows of one file map to a table."""
+
+    name: str
+    table: Table
+    # column -> converter, a converter raising ValueError rejects the row
+    columns: dict[str, Callable[[Any], Any]]
+    # column -> feed whose ids it must reference
+    references: dict[str, str] = field(default_factory=dict)
+    defaults: dict[str, Any] = field(default_factory=dict)
+    # Rows without an id are upserted on these unique columns instead
+    natural_key: tuple[str, ...] = ()
+
+
+FEEDS = [
+    Feed(
+        "products",
+        Product.__table__,
+        {"id": _integer, "name": _text, "description": _optional_text},
+    ),
+    Feed(
+        "parts",
+        Part.__table__,
+        {
+            "id": _integer,
+            "name": _text,
+            "description": _optional_text,
+            "product_id": _integer,
+        },
+        references={"product_id": "products"},
+    ),
+    Feed(
+        "options",
+        Option.__table__,
+        {
+            "id": _integer,
+            "name": _text,
+            "price": _price,
+            "part_id": _integer,
+            "in_stock": _boolean,
+        },
+        references={"part_id": "parts"},
+        defaults={"in_stock": True},
+    ),
+    Feed(
+        "compatibilities",
+        OptionCompatibility.__table__,
+        {
+            "id": _optional_integer,
+            "option1_id": _integer,
+            "option2_id": _integer,
+            "compatible": _boolean,
+        },
+        references={"option1_id": "options", "option2_id": "options"},
+        natural_key=("option1_id", "option2_id"),
+    ),
+    Feed(
+        "price_rules",
+        PriceRule.__table__,
+        {"id": _integer, "option_id": _integer, "price": _price},
+        references={"option_id": "options"},
+    ),
+    Feed(
+        "price_rule_conditions",
+        PriceRuleCondition.__table__,
+        {
+            "id": _optional_integer,
+            "price_rule_id": _integer,
+            "option_id": _integer,
+        },
+        references={"price_rule_id": "price_rules", "option_id": "options"},
+        natural_key=("price_rule_id", "option_id"),
+    ),
+]
+
+# Feeds other feeds point to, their ids are tracked while importing
+REFERENCED_FEEDS = {"products", "parts", "options", "price_rules"}
+
+# resolve_product_ids argument taking the ids of each referenced feed
+_RESOLVED_IDS = {
+    "products": "product_ids",
+    "parts": "part_ids",
+    "options": "option_ids",
+    "price_rules": "rule_ids",
+}
+
+
+def read_rows(path: str) -> Iterator[tuple[int, dict]]:
+    """Yield (line number, row) from a CSV or JSON Lines file."""
+    with open(path, newline="") as f:
+        if Path(path).suffix.lower() in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+        else:
+            # The header is line 1
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                yield line_number, row
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+class CatalogImporter:
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        version: CatalogVersion = catalog_version,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.version = version
+        self.known_ids: dict[str, set[int]] = {}
+        # Ids written or referenced per feed, and products rows moved out of
+        self.changed_ids: dict[str, set[int]] = {name: set() for name in _RESOLVED_IDS}
+        self.changed_products: set[int] = set()
+
+    def run(self, paths: dict[str, str]) -> dict[str, int]:
+        """
+        Import the given feed files in dependency order and commit once,
+        together with the versions of the products they touch. Returns the
+        number of rows imported per feed, nothing is written if any row is
+        rejected.
+        """
+        counts = {}
+
+        try:
+            for feed in FEEDS:
+                if feed.name in paths:
+                    counts[feed.name] = self.import_feed(feed, paths[feed.name])
+
+            # Core inserts don't go through the ORM events, bump once for all
+            connection = self.db.connection()
+            product_ids = self.changed_products | resolve_product_ids(
+                connection,
+                **{_RESOLVED_IDS[name]: ids for name, ids in self.changed_ids.items()},
+            )
+            versions = bump_catalog_versions(connection, product_ids)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        self.version.bump(product_ids, versions)
+
+        return counts
+
+    def import_feed(self, feed: Feed, path: str) -> int:
+        rows = (
+            self._validate(feed, path, line_number, row)
+            for line_number, row in read_rows(path)
+        )
+        count = 0
+
+        for batch in _batches(rows, self.batch_size):
+            self._write(feed, batch)
+            count += len(batch)
+
+        return count
+
+    def _validate(self, feed: Feed, path: str, line_number: int, row: dict) -> dict:
+        values = {}
+
+        for column, convert in feed.columns.items():
+            value = row.get(column)
+
+            if value in (None, "") and column in feed.defaults:
+                values[column] = feed.defaults[column]
+                continue
+
+            try:
+                values[column] = convert(value)
+            except (TypeError, ValueError) as e:
+                raise CatalogImportError(path, line_number, f"{column}: {e}")
+
+        for column, referenced_feed in feed.references.items():
+            if values[column] not in self._ids(referenced_feed):
+                raise CatalogImportError(
+                    path,
+                    line_number,
+                    f"{column} {values[column]} not found in {referenced_feed}",
+                )
+
+        if feed.name in REFERENCED_FEEDS:
+            self._ids(feed.name).add(values["id"])
+
+        if feed.natural_key and values["id"] is None:
+            del values["id"]
+
+        return values
+
+    def _ids(self, feed_name: str) -> set[int]:
+        if feed_name not in self.known_ids:
+            table = next(feed.table for feed in FEEDS if feed.name == feed_name)
+            self.known_ids[feed_name] = set(self.db.scalars(select(table.c.id)))
+
+        return self.known_ids[feed_name]
+
+    def _track_changes(self, feed: Feed, batch: list[dict]):
+        for column, referenced_feed in feed.references.items():
+            self.changed_ids[referenced_feed].update(values[column] for values in batch)
+
+        if feed.name not in REFERENCED_FEEDS:
+            return
+
+        ids = {values["id"] for values in batch}
+        self.changed_ids[feed.name] |= ids
+
+        # An upsert can move a row to another product, the one it leaves
+        # changes too. Read before writing, afterwards only the new one is left.
+        if feed.name != "products":
+            self.changed_products |= resolve_product_ids(
+                self.db.connection(), **{_RESOLVED_IDS[feed.name]: ids}
+            )
+
+    def _write(self, feed: Feed, batch: list[dict]):
+        self._track_changes(feed, batch)
+        with_id = [values for values in batch if "id" in values]
+        without_id = [values for values in batch if "id" not in values]
+
+        if with_id:
+            self.db.execute(self._upsert(feed, with_id[0].keys(), ("id",)), with_id)
+
+        if without_id:
+            # The last row wins, one upsert can't change the same row twice
+            rows = list(
+                {
+                    tuple(values[column] for column in feed.natural_key): values
+                    for values in without_id
+                }.values()
+            )
+            self.db.execute(self._upsert(feed, rows[0].keys(), feed.natural_key), rows)
+
+    def _upsert(self, feed: Feed, columns: Iterable[str], key: tuple[str, ...]):
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            return insert(feed.table)
+
+        statement = dialect_insert(feed.table)
+        index_elements = [feed.table.c[column] for column in key]
+        set_ = {
+            column: statement.excluded[column]
+            for column in columns
+            if column != "id" and column not in key
+        }
+
+        # Conditions are nothing but their key, there is nothing to update
+        if not set_:
+            return statement.on_conflict_do_nothing(index_elements=index_elements)
+
+        return statement.on_conflict_do_update(index_elements=index_elements, set_=set_)
+
+
+def main():
+    from backend.app.models.base import get_db
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    for feed in FEEDS:
+        parser.add_argument(f"--{feed.name.replace('_', '-')}", dest=feed.name)
+
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    paths = {
+        feed.name: getattr(args, feed.name)
+        for feed in FEEDS
+        if getattr(args, feed.name)
+    }
+
+    if not paths:
+        parser.error("no feed files given")
+
+    db = next(get_db())
+    try:
+        counts = CatalogImporter(db, args.batch_size).run(paths)
+        for name, count in counts.items():
+            print(f"{name}: {count} rows")
+    except CatalogImportError as e:
+        parser.exit(1, f"Import failed, nothing was written: {e}\n")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
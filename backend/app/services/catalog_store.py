@@ -0,0 +1,209 @@
+import sys
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+
+from backend.app.models.catalog_version import CatalogVersion, catalog_version
+from backend.app.repositories.async_pricing_repository import (
+    AsyncPricingOrderRepository,
+)
+from backend.app.repositories.pricing_repository import (
+    CatalogSnapshot,
+    PricingOrderRepository,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PartRecord:
+    id: int
+    product_id: int
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class OptionRecord:
+    id: int
+    part_id: int
+    name: str
+    price: Decimal
+    in_stock: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ConditionRecord:
+    option_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class PriceRuleRecord:
+    id: int
+    option_id: int
+    price: Decimal
+    conditions: tuple[ConditionRecord, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ProductCatalog:
+    """
+    Read-only copy of a product's catalog, detached from any session so it
+    can be shared by every request of the worker. Same attributes as
+    CatalogSnapshot, so services accept either.
+    """
+
+    product_id: int
+    version: int
+    parts: tuple[PartRecord, ...]
+    options: tuple[OptionRecord, ...]
+    all_options: tuple[OptionRecord, ...]
+    grouped_compatibilities: dict[int, dict[str, tuple[int, ...]]]
+    price_rules: tuple[PriceRuleRecord, ...]
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CatalogSnapshot, version: int) -> "ProductCatalog":
+        all_options = tuple(
+            OptionRecord(
+                id=option.id,
+                part_id=option.part_id,
+                name=option.name,
+                price=option.price,
+                in_stock=bool(option.in_stock),
+            )
+            for option in snapshot.all_options
+        )
+
+        return cls(
+            product_id=snapshot.product_id,
+            version=version,
+            parts=tuple(
+                PartRecord(id=part.id, product_id=part.product_id, name=part.name)
+                for part in snapshot.parts
+            ),
+            options=tuple(option for option in all_options if option.in_stock),
+            all_options=all_options,
+            grouped_compatibilities={
+                option_id: {kind: tuple(ids) for kind, ids in rules.items()}
+                for option_id, rules in snapshot.grouped_compatibilities.items()
+            },
+            price_rules=tuple(
+                PriceRuleRecord(
+                    id=rule.id,
+                    option_id=rule.option_id,
+                    price=rule.price,
+                    conditions=tuple(
+                        ConditionRecord(condition.option_id)
+                        for condition in rule.conditions
+                    ),
+                )
+                for rule in snapshot.price_rules
+            ),
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        return _deep_sizeof(self, set())
+
+
+def _deep_sizeof(value, seen: set[int]) -> int:
+    # Interned small ints and shared strings are counted once per catalog
+    if id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(
+            _deep_sizeof(key, seen) + _deep_sizeof(item, seen)
+            for key, item in value.items()
+        )
+    elif isinstance(value, (tuple, list)):
+        size += sum(_deep_sizeof(item, seen) for item in value)
+    elif hasattr(type(value), "__slots__"):
+        size += sum(
+            _deep_sizeof(getattr(value, slot), seen) for slot in type(value).__slots__
+        )
+
+    return size
+
+
+class CatalogStore:
+    """
+    Latest ProductCatalog of every product. A catalog is replaced as a whole
+    when a newer version of its product is published, readers holding the
+    previous one keep a consistent view until they are done.
+    """
+
+    def __init__(self, version: CatalogVersion = catalog_version):
+        self.version = version
+        self._catalogs: dict[int, ProductCatalog] = {}
+        # Sizes are walked once per published catalog, not on every scrape
+        self._sizes: dict[int, int] = {}
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._catalogs)
+
+    def get(
+        self, repository: PricingOrderRepository, product_id: int
+    ) -> ProductCatalog:
+        catalog = self._catalogs.get(product_id)
+
+        if catalog is not None and catalog.version == self.version.of(product_id):
+            return catalog
+
+        # Read the version before loading, a change committed meanwhile makes
+        # the new catalog stale right away instead of hiding the change
+        version = self.version.of(product_id)
+        catalog = ProductCatalog.from_snapshot(
+            repository.load_catalog(product_id), version
+        )
+        self.publish(catalog)
+
+        return catalog
+
+    async def aget(
+        self, repository: AsyncPricingOrderRepository, product_id: int
+    ) -> ProductCatalog:
+        catalog = self._catalogs.get(product_id)
+
+        if catalog is not None and catalog.version == self.version.of(product_id):
+            return catalog
+
+        version = self.version.of(product_id)
+        snapshot = await repository.load_catalog(product_id)
+        catalog = ProductCatalog.from_snapshot(snapshot, version)
+        self.publish(catalog)
+
+        return catalog
+
+    def publish(self, catalog: ProductCatalog):
+        # Catalogs are immutable, walk it before taking the lock
+        size = catalog.memory_bytes
+
+        with self._lock:
+            current = self._catalogs.get(catalog.product_id)
+
+            if current is None or current.version <= catalog.version:
+                self._catalogs[catalog.product_id] = catalog
+                self._memory_bytes += size - self._sizes.get(catalog.product_id, 0)
+                self._sizes[catalog.product_id] = size
+
+    def discard(self, product_id: int | None = None):
+        with self._lock:
+            if product_id is None:
+                self._catalogs.clear()
+                self._sizes.clear()
+                self._memory_bytes = 0
+            else:
+                self._catalogs.pop(product_id, None)
+                self._memory_bytes -= self._sizes.pop(product_id, 0)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the held catalogs, as measured when they were published."""
+        return self._memory_bytes
+
+
+# Catalogs shared by every request of this process
+product_catalogs = CatalogStore()
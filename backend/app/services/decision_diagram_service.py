@@ -0,0 +1,294 @@
+import logging
+import os
+import sys
+from dataclasses import dataclass
+
+from backend.app.models.product import Option, Part
+from backend.app.services.base import BaseSelectionService
+from backend.app.services.bitset_selection_service import (
+    BitsetModel,
+    compile_bitset_model,
+)
+from backend.app.services.selection_service import PartSelectionService, SolverModel
+
+logger = logging.getLogger(__name__)
+
+DECISION_DIAGRAM_MAX_NODES = int(os.getenv("DECISION_DIAGRAM_MAX_NODES", "20000"))
+
+# layers[level][node] -> ((option bit, child node in the next level), ...)
+Layers = tuple[tuple[tuple[tuple[int, int], ...], ...], ...]
+
+
+class DiagramTooLarge(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class DecisionDiagram:
+    """
+    Reduced multi-valued decision diagram with one level per part. Every path
+    from the root to the terminal node is a valid configuration, and nodes
+    with the same outgoing edges are shared.
+    """
+
+    bitset_model: BitsetModel
+    layers: Layers
+
+    @property
+    def node_count(self) -> int:
+        # Plus the terminal node
+        return sum(len(layer) for layer in self.layers) + 1
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for layer in self.layers for edges in layer)
+
+    @property
+    def memory_bytes(self) -> int:
+        size = sys.getsizeof(self.layers)
+
+        for layer in self.layers:
+            size += sys.getsizeof(layer)
+
+            for edges in layer:
+                size += sys.getsizeof(edges) + sum(
+                    sys.getsizeof(edge) for edge in edges
+                )
+
+        return size
+
+
+def compile_decision_diagram(model: BitsetModel, max_nodes: int) -> DecisionDiagram:
+    """
+    Build the diagram top down, merging the partial configurations that leave
+    the same clauses unsatisfied since they share every possible completion,
+    then drop dead ends and merge equivalent nodes bottom up.
+    """
+    levels = len(model.part_ids)
+    literals = [dict(clause) for clause in model.clauses]
+    last_level = [max(positions) for positions in literals]
+    touching = [
+        [index for index, clause in enumerate(literals) if level in clause]
+        for level in range(levels)
+    ]
+    closing = [
+        {index for index in touching[level] if last_level[index] == level}
+        for level in range(levels)
+    ]
+
+    states: dict[frozenset[int], int] = {frozenset(range(len(literals))): 0}
+    raw_layers: list[list[list[tuple[int, int]]]] = []
+    node_count = 1
+
+    for level in range(levels):
+        next_states: dict[frozenset[int], int] = {}
+        layer = []
+
+        for state in states:
+            edges = []
+            domain = model.full_domains[level]
+
+            while domain:
+                bit = domain & -domain
+                domain &= ~bit
+
+                satisfied = {
+                    index
+                    for index in touching[level]
+                    if index in state and literals[index][level] & bit
+                }
+                remaining = state - satisfied
+
+                # A clause with no literals left can't be satisfied anymore
+                if not closing[level].isdisjoint(remaining):
+                    continue
+
+                child = next_states.setdefault(remaining, len(next_states))
+                edges.append((bit, child))
+
+                if node_count + len(next_states) > max_nodes:
+                    raise DiagramTooLarge(
+                        f"Decision diagram exceeds {max_nodes} nodes at level {level}"
+                    )
+
+            layer.append(edges)
+
+        node_count += len(next_states)
+        raw_layers.append(layer)
+        states = next_states
+
+    return DecisionDiagram(bitset_model=model, layers=_reduce(raw_layers))
+
+
+def _reduce(raw_layers: list[list[list[tuple[int, int]]]]) -> Layers:
+    # Only the terminal node survives at the bottom level
+    remap = {0: 0}
+    layers: list[tuple[tuple[tuple[int, int], ...], ...]] = []
+
+    for raw_layer in reversed(raw_layers):
+        signatures: dict[tuple[tuple[int, int], ...], int] = {}
+        next_remap = {}
+
+        for node, edges in enumerate(raw_layer):
+            signature = tuple(
+                (bit, remap[child]) for bit, child in edges if child in remap
+            )
+
+            if not signature:
+                continue
+
+            next_remap[node] = signatures.setdefault(signature, len(signatures))
+
+        layers.append(tuple(signatures))
+        remap = next_remap
+
+    layers.reverse()
+    return tuple(layers)
+
+
+class DecisionDiagramSelectionService(BaseSelectionService):
+    """
+    Answers availability and validity by walking a precompiled decision
+    diagram, so no solver runs per request. Products whose diagram would
+    exceed the node budget are handed to PartSelectionService instead.
+    """
+
+    def __init__(self, max_nodes: int = DECISION_DIAGRAM_MAX_NODES):
+        self.max_nodes = max_nodes
+        self.diagram: DecisionDiagram | None = None
+        self.fallback: PartSelectionService | None = None
+        self.domains: list[int] = []
+        self._saved_domains: list[list[int]] = []
+
+    def compile_model(
+        self,
+        parts: list[Part],
+        options: list[Option],
+        grouped_compatibilities: dict[int, dict[str, list[int]]],
+    ) -> DecisionDiagram | SolverModel:
+        bitset_model = compile_bitset_model(parts, options, grouped_compatibilities)
+
+        try:
+            diagram = compile_decision_diagram(bitset_model, self.max_nodes)
+        except DiagramTooLarge as e:
+            logger.warning("%s, falling back to the solver", e)
+            return PartSelectionService().compile_model(
+                parts, options, grouped_compatibilities
+            )
+
+        logger.info(
+            "Decision diagram compiled: %s nodes, %s edges, %s bytes",
+            diagram.node_count,
+            diagram.edge_count,
+            diagram.memory_bytes,
+        )
+        return diagram
+
+    def load_model(self, model: DecisionDiagram | SolverModel):
+        if isinstance(model, SolverModel):
+            self.diagram = None
+            self.fallback = PartSelectionService()
+            self.fallback.load_model(model)
+            return
+
+        self.diagram = model
+        self.fallback = None
+        self.domains = list(model.bitset_model.full_domains)
+        self._saved_domains = []
+
+    @property
+    def part_options(self) -> dict[int, list[int]]:
+        if self.fallback:
+            return self.fallback.part_options
+
+        return self.diagram.bitset_model.part_options
+
+    def get_available_options(
+        self, parts: list[Part] | None = None
+    ) -> dict[int, list[int]]:
+        if self.fallback:
+            return self.fallback.get_available_options(parts)
+
+        model = self.diagram.bitset_model
+        part_ids = model.part_ids if parts is None else [part.id for part in parts]
+        positions = {
+            part_id: position for position, part_id in enumerate(model.part_ids)
+        }
+        available = self._walk()
+
+        return {
+            part_id: (
+                [
+                    option_id
+                    for index, option_id in enumerate(model.part_options[part_id])
+                    if available[positions[part_id]] >> index & 1
+                ]
+                if part_id in positions
+                else []
+            )
+            for part_id in part_ids
+        }
+
+    def is_selection_valid(self) -> bool:
+        if self.fallback:
+            return self.fallback.is_selection_valid()
+
+        return 0 in self._co_reachable()[0]
+
+    def select_part_options(self, options: list[Option]):
+        if self.fallback:
+            return self.fallback.select_part_options(options)
+
+        for option in options:
+            position, bit = self.diagram.bitset_model.option_bits[option.id]
+            self.domains[position] &= bit
+
+    def push(self):
+        if self.fallback:
+            return self.fallback.push()
+
+        self._saved_domains.append(list(self.domains))
+
+    def pop(self):
+        if self.fallback:
+            return self.fallback.pop()
+
+        self.domains = self._saved_domains.pop()
+
+    def _co_reachable(self) -> list[set[int]]:
+        """Nodes of every level that still reach the terminal node."""
+        layers = self.diagram.layers
+        co_reachable: list[set[int]] = [set() for _ in layers] + [{0}]
+
+        for level in reversed(range(len(layers))):
+            domain = self.domains[level]
+            below = co_reachable[level + 1]
+            co_reachable[level] = {
+                node
+                for node, edges in enumerate(layers[level])
+                if any(bit & domain and child in below for bit, child in edges)
+            }
+
+        return co_reachable
+
+    def _walk(self) -> list[int]:
+        """Option bits of every level lying on a root to terminal path."""
+        layers = self.diagram.layers
+        co_reachable = self._co_reachable()
+        reached = {0} & co_reachable[0]
+        available = [0] * len(layers)
+
+        for level, layer in enumerate(layers):
+            domain = self.domains[level]
+            below = co_reachable[level + 1]
+            next_reached = set()
+
+            for node in reached:
+                for bit, child in layer[node]:
+                    if bit & domain and child in below:
+                        available[level] |= bit
+                        next_reached.add(child)
+
+            reached = next_reached
+
+        return available
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Mapping
+
+# Upper bounds in seconds, from a cached quote to a cold solver compile
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+STAGE_METRICS = os.getenv("STAGE_METRICS", "true").lower() in ("1", "true", "yes", "on")
+
+_DISABLED = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # The last slot counts observations above the largest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            result.append((str(bound), total))
+
+        return result
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "key", "start")
+
+    def __init__(self, metrics: "StageMetrics", key: tuple[str, int]):
+        self.metrics = metrics
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(*self.key, time.perf_counter() - self.start)
+
+
+class StageMetrics:
+    """
+    Latency histograms of the order stages, labelled by stage and product.
+    When disabled, timed() hands out a shared no-op context manager.
+    """
+
+    name = "order_stage_duration_seconds"
+
+    def __init__(
+        self, enabled: bool = True, buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._histograms: dict[tuple[str, int], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def timed(self, stage: str, product_id: int):
+        if not self.enabled:
+            return _DISABLED
+
+        return _StageTimer(self, (stage, product_id))
+
+    def observe(self, stage: str, product_id: int, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get((stage, product_id))
+
+            if histogram is None:
+                histogram = self._histograms[(stage, product_id)] = Histogram(
+                    self.buckets
+                )
+
+            histogram.observe(seconds)
+
+    def snapshot(self) -> dict[tuple[str, int], dict]:
+        with self._lock:
+            return {
+                key: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": histogram.cumulative(),
+                }
+                for key, histogram in self._histograms.items()
+            }
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} Time spent in each stage of an order request.",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        for (stage, product_id), values in sorted(self.snapshot().items()):
+            labels = f'stage="{stage}",product_id="{product_id}"'
+
+            for bound, count in values["buckets"]:
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+
+            lines.append(f"{self.name}_sum{{{labels}}} {values['sum']}")
+            lines.append(f"{self.name}_count{{{labels}}} {values['count']}")
+
+        return lines
+
+
+def _render(
+    prefix: str, values: Mapping[str, float], description: str, kind: str, suffix=""
+) -> list[str]:
+    lines = []
+
+    for key, value in values.items():
+        name = f"{prefix}_{key}{suffix}"
+        lines += [
+            f"# HELP {name} {description}",
+            f"# TYPE {name} {kind}",
+            f"{name} {value}",
+        ]
+
+    return lines
+
+
+def render_gauges(
+    prefix: str, values: Mapping[str, float], description: str
+) -> list[str]:
+    """One gauge per value, named {prefix}_{key}."""
+    return _render(prefix, values, description, "gauge")
+
+
+def render_counters(
+    prefix: str, values: Mapping[str, float], description: str
+) -> list[str]:
+    """One counter per value, named {prefix}_{key}_total."""
+    return _render(prefix, values, description, "counter", "_total")
+
+
+stage_metrics = StageMetrics(enabled=STAGE_METRICS)
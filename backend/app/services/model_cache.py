@@ -0,0 +1,92 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+from backend.app.models.catalog_version import CatalogVersion, catalog_version
+
+T = TypeVar("T")
+
+
+class VersionedLRUCache:
+    """
+    LRU cache whose entries are only valid for the catalog version of their
+    product they were built with, so a change to one product leaves the
+    entries of the others alone. Keys are tuples starting with the product
+    id, which also lets us drop everything belonging to a product at once.
+    """
+
+    def __init__(self, maxsize: int, version: CatalogVersion = catalog_version):
+        self.maxsize = maxsize
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        current_version = self.version.of(key[0])
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] != current_version:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: int | None = None):
+        if version is None:
+            version = self.version.of(key[0])
+
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], T]) -> T:
+        cached = self.get(key)
+
+        if cached is not None:
+            return cached
+
+        # Read the version before building, if the catalog changes meanwhile
+        # the entry is already stale and will be rebuilt on the next call
+        version = self.version.of(key[0])
+        value = builder()
+        self.set(key, value, version)
+
+        return value
+
+    def invalidate(self, product_id: int | None = None):
+        with self._lock:
+            if product_id is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key in self._entries if key[0] == product_id]:
+                del self._entries[key]
+
+
+# Compiled configuration models shared by every request of this process
+product_models = VersionedLRUCache(
+    maxsize=int(os.getenv("PRODUCT_MODEL_CACHE_SIZE", "128"))
+)
+
+# Order totals keyed by (product id, frozenset of selected option ids)
+price_quotes = VersionedLRUCache(
+    maxsize=int(os.getenv("PRICE_QUOTE_CACHE_SIZE", "4096"))
+)
+
+# Serialized GET /parts responses keyed by (product id, "parts")
+part_responses = VersionedLRUCache(
+    maxsize=int(os.getenv("PART_RESPONSE_CACHE_SIZE", "256"))
+)
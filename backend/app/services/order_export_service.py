@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import groupby
+from typing import Iterator
+
+from backend.app.repositories.order_export_repository import OrderExportRepository
+
+EXPORT_FIELDS = (
+    "id",
+    "customer_id",
+    "order_date",
+    "total_price",
+    "product_id",
+    "option_ids",
+)
+
+
+class OrderExportService:
+    """Streams orders with their options, one order in memory at a time."""
+
+    def __init__(self, repository: OrderExportRepository):
+        self.repository = repository
+
+    def iter_orders(self, since: datetime | None = None) -> Iterator[dict]:
+        rows = self.repository.iter_order_rows(since)
+
+        for order_id, order_rows in groupby(rows, key=lambda row: row.id):
+            order_rows = list(order_rows)
+            first = order_rows[0]
+
+            yield {
+                "id": order_id,
+                "customer_id": first.customer_id,
+                "order_date": (
+                    first.order_date.isoformat() if first.order_date else None
+                ),
+                "total_price": str(first.total_price),
+                "product_id": first.product_id,
+                "option_ids": [
+                    row.option_id for row in order_rows if row.option_id is not None
+                ],
+            }
+
+    def ndjson(self, since: datetime | None = None) -> Iterator[str]:
+        for order in self.iter_orders(since):
+            yield json.dumps(order) + "\n"
+
+    def csv(self, since: datetime | None = None) -> Iterator[str]:
+        """Option ids are joined with ";" so every order stays a single row."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def line(values) -> str:
+            writer.writerow(values)
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return value
+
+        yield line(EXPORT_FIELDS)
+
+        for order in self.iter_orders(since):
+            yield line(
+                [order[name] for name in EXPORT_FIELDS[:-1]]
+                + [";".join(str(option_id) for option_id in order["option_ids"])]
+            )
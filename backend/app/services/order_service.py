@@ -1,5 +1,9 @@
-from typing import List
+import asyncio
+
 from backend.app.models.product import Order, Product
+from backend.app.repositories.async_pricing_repository import (
+    AsyncPricingOrderRepository,
+)
 from backend.app.repositories.pricing_repository import PricingOrderRepository
 from backend.app.schemas.order import OrderResponse
 from backend.app.services.base import (
@@ -7,68 +11,304 @@ from backend.app.services.base import (
     BasePriceService,
     BaseSelectionService,
 )
-from ..models.product import Option, PriceRule
+from backend.app.services.catalog_store import (
+    CatalogStore,
+    ProductCatalog,
+    product_catalogs,
+)
+from backend.app.services.metrics import StageMetrics, stage_metrics
+from backend.app.services.model_cache import (
+    VersionedLRUCache,
+    price_quotes,
+    product_models,
+)
+from backend.app.services.order_sessions import (
+    OrderSession,
+    OrderSessionStore,
+    order_sessions,
+)
+from backend.app.services.price_service import PriceIndex
+from backend.app.services.selection_backends import load_catalog_model
+from ..models.product import Option
 
 
-class CartOrderService(BaseOrderService):
+class OrderConfigurator:
+    """
+    Selection and pricing steps of an order, shared by the sync and async
+    order services. They only read the catalog they are given and never
+    touch the database, so the async service can run them in a thread.
+    """
+
     def __init__(
         self,
-        repository: PricingOrderRepository,
         option_selector: BaseSelectionService,
         price_service: BasePriceService,
+        model_cache: VersionedLRUCache = product_models,
+        sessions: OrderSessionStore = order_sessions,
+        quote_cache: VersionedLRUCache = price_quotes,
+        catalogs: CatalogStore = product_catalogs,
+        metrics: StageMetrics = stage_metrics,
     ):
-        self.repository = repository
         self.option_selector = option_selector
         self.price_service = price_service
+        self.model_cache = model_cache
+        self.sessions = sessions
+        self.quote_cache = quote_cache
+        self.catalogs = catalogs
+        self.metrics = metrics
+
+    def start_selection(self, catalog: ProductCatalog) -> OrderSession:
+        version = self.sessions.version.of(catalog.product_id)
+
+        with self.metrics.timed("load_model", catalog.product_id):
+            load_catalog_model(self.option_selector, catalog, self.model_cache)
+
+        return OrderSession(self.option_selector, catalog.product_id, (), version)
+
+    def add_option(
+        self,
+        catalog: ProductCatalog,
+        order_id: int,
+        current_options: list[Option],
+        option: Option,
+    ) -> tuple[OrderSession, float, dict[int, list[int]]]:
+        """
+        Select one more option for the order, returning the session to check
+        in once the order is saved, the new total and the available options.
+        """
+        session = self._resume_session(catalog, order_id, current_options)
+
+        if option.id not in self.option_selector.part_options.get(option.part_id, []):
+            self.sessions.checkin(order_id, session)
+            raise ValueError("Option is not valid")
+
+        self.option_selector.push()
+
+        with self.metrics.timed("select_part_options", catalog.product_id):
+            self.option_selector.select_part_options([option])
+            valid = self.option_selector.is_selection_valid()
+
+        if not valid:
+            self.option_selector.pop()
+            self.sessions.checkin(order_id, session)
+            raise ValueError("Option is not valid")
 
-    def create_order(self, product: Product, option: Option) -> OrderResponse:
-        # We will cache this config in the future as it won't change a lot
-        self.option_selector.load_compatibilities(
-            self.repository.get_parts(product.id),
-            self.repository.get_options(product.id),
-            self.repository.get_compatibilities(product.id),
+        options = [*current_options, option]
+
+        with self.metrics.timed("calculate_price", catalog.product_id):
+            total_price: float = self._quote(catalog, options)
+
+        available_options = self.available_options(catalog)
+        session.option_ids = tuple(option.id for option in options)
+
+        return session, total_price, available_options
+
+    def _resume_session(
+        self, catalog: ProductCatalog, order_id: int, current_options: list[Option]
+    ) -> OrderSession:
+        """
+        Reuse the selection state kept for the order, or rebuild it from the
+        options stored in the database when there is no usable session.
+        """
+        option_ids = tuple(option.id for option in current_options)
+        session = self.sessions.checkout(order_id)
+
+        if (
+            session is not None
+            and session.product_id == catalog.product_id
+            and session.option_ids == option_ids
+            and type(session.selector) is type(self.option_selector)
+        ):
+            self.option_selector = session.selector
+            return session
+
+        session = self.start_selection(catalog)
+
+        # A catalog change may have taken a selected option out of stock,
+        # the rebuilt model doesn't know it anymore
+        part_options = self.option_selector.part_options
+
+        for current in current_options:
+            if current.id not in part_options.get(current.part_id, []):
+                raise ValueError(f"Option is no longer available: {current.id}")
+
+        with self.metrics.timed("select_part_options", catalog.product_id):
+            self.option_selector.select_part_options(current_options)
+
+        session.option_ids = option_ids
+
+        return session
+
+    def available_options(self, catalog: ProductCatalog) -> dict[int, list[int]]:
+        with self.metrics.timed("get_available_options", catalog.product_id):
+            return self.option_selector.get_available_options()
+
+    def _quote(self, catalog: ProductCatalog, options: list[Option]) -> float:
+        """
+        Total price of a selection. Quotes only depend on the selected set
+        and the catalog version, so they are shared between orders.
+        """
+        return self.quote_cache.get_or_build(
+            (catalog.product_id, frozenset(option.id for option in options)),
+            lambda: self.price_service.calculate_indexed_price(
+                options, self._price_index(catalog)
+            ),
         )
 
-        order: Order = self.repository.create_order(
-            Order(product=product, total_price=0, status="pending")
+    def _price_index(self, catalog: ProductCatalog) -> PriceIndex:
+        return self.model_cache.get_or_build(
+            (catalog.product_id, "price_index"),
+            lambda: PriceIndex(catalog.price_rules),
+        )
+
+
+class CartOrderService(BaseOrderService, OrderConfigurator):
+    def __init__(
+        self,
+        repository: PricingOrderRepository,
+        option_selector: BaseSelectionService,
+        price_service: BasePriceService,
+        model_cache: VersionedLRUCache = product_models,
+        sessions: OrderSessionStore = order_sessions,
+        quote_cache: VersionedLRUCache = price_quotes,
+        catalogs: CatalogStore = product_catalogs,
+        metrics: StageMetrics = stage_metrics,
+    ):
+        OrderConfigurator.__init__(
+            self,
+            option_selector,
+            price_service,
+            model_cache,
+            sessions,
+            quote_cache,
+            catalogs,
+            metrics,
         )
-        order.options.append(option)
-        self.repository.update_order(order)
+        self.repository = repository
+
+    def create_order(self, product: Product) -> OrderResponse:
+        with self.metrics.timed("load_catalog", product.id):
+            catalog = self.catalogs.get(self.repository, product.id)
+
+        session = self.start_selection(catalog)
 
         total_price = 0
-        available_options = self.option_selector.get_available_options(order.product_id)
+        available_options = self.available_options(catalog)
+
+        # Everything is computed before writing so the transaction stays short
+        with self.metrics.timed("repository", product.id):
+            order: Order = self.repository.create_order(
+                Order(product=product, total_price=total_price)
+            )
+            order_id = order.id
+            self.repository.commit()
 
-        return OrderResponse(
-            id=order.id,
+        self.sessions.checkin(order_id, session)
+
+        return OrderResponse.trusted(
+            id=order_id,
             total_price=total_price,
             available_options=available_options,
         )
 
     def update_order(self, order: Order, option: Option) -> OrderResponse:
-        # We will cache this config in the future as it won't change a lot
-        self.option_selector.load_compatibilities(
-            self.repository.get_parts(product.id),
-            self.repository.get_options(product.id),
-            self.repository.get_compatibilities(product.id),
+        order_id = order.id
+
+        with self.metrics.timed("load_catalog", order.product_id):
+            catalog = self.catalogs.get(self.repository, order.product_id)
+
+        session, total_price, available_options = self.add_option(
+            catalog, order_id, list(order.options), option
         )
 
-        options: List[Option] = self.repository.get_options(order.product_id)
+        # Pricing and availability are done, write the order in one commit
+        with self.metrics.timed("repository", order.product_id):
+            order.options.append(option)
+            order.total_price = total_price
+            self.repository.update_order(order)
 
-        if not self.option_selector.select_part_options([*order.options, option]):
-            raise ValueError("Option is not valid")
+        self.sessions.checkin(order_id, session)
 
-        order.options.append(option)
-        self.repository.update_order(order)
+        return OrderResponse.trusted(
+            id=order_id, total_price=total_price, available_options=available_options
+        )
 
-        current_option_ids = [option.id for option in order.options]
 
-        rules: list[PriceRule] = self.repository.get_price_rules_by_option_ids(
-            current_option_ids
+class AsyncCartOrderService(OrderConfigurator):
+    """
+    CartOrderService on an AsyncSession. Database calls are awaited on the
+    event loop while selection and pricing run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        repository: AsyncPricingOrderRepository,
+        option_selector: BaseSelectionService,
+        price_service: BasePriceService,
+        model_cache: VersionedLRUCache = product_models,
+        sessions: OrderSessionStore = order_sessions,
+        quote_cache: VersionedLRUCache = price_quotes,
+        catalogs: CatalogStore = product_catalogs,
+        metrics: StageMetrics = stage_metrics,
+    ):
+        super().__init__(
+            option_selector,
+            price_service,
+            model_cache,
+            sessions,
+            quote_cache,
+            catalogs,
+            metrics,
         )
+        self.repository = repository
+
+    async def create_order(self, product: Product) -> OrderResponse:
+        with self.metrics.timed("load_catalog", product.id):
+            catalog = await self.catalogs.aget(self.repository, product.id)
+
+        session, available_options = await asyncio.to_thread(self._start_order, catalog)
+
+        total_price = 0
+
+        with self.metrics.timed("repository", product.id):
+            order: Order = await self.repository.create_order(
+                Order(product=product, total_price=total_price)
+            )
+            order_id = order.id
+            await self.repository.commit()
+
+        self.sessions.checkin(order_id, session)
+
+        return OrderResponse.trusted(
+            id=order_id,
+            total_price=total_price,
+            available_options=available_options,
+        )
+
+    async def update_order(self, order: Order, option: Option) -> OrderResponse:
+        order_id = order.id
 
-        total_price: float = self.price_service.calculate_price(options, rules)
-        available_options = self.option_selector.get_available_options(order.product_id)
+        with self.metrics.timed("load_catalog", order.product_id):
+            catalog = await self.catalogs.aget(self.repository, order.product_id)
 
-        return OrderResponse(
-            id=order.id, total_price=total_price, available_options=available_options
+        session, total_price, available_options = await asyncio.to_thread(
+            self.add_option, catalog, order_id, list(order.options), option
         )
+
+        with self.metrics.timed("repository", order.product_id):
+            order.options.append(option)
+            order.total_price = total_price
+            await self.repository.update_order(order)
+
+        self.sessions.checkin(order_id, session)
+
+        return OrderResponse.trusted(
+            id=order_id, total_price=total_price, available_options=available_options
+        )
+
+    def _start_order(
+        self, catalog: ProductCatalog
+    ) -> tuple[OrderSession, dict[int, list[int]]]:
+        session = self.start_selection(catalog)
+
+        return session, self.available_options(catalog)
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from backend.app.models.catalog_version import CatalogVersion, catalog_version
+from backend.app.services.base import BaseSelectionService
+
+
+@dataclass
+class OrderSession:
+    """Selection state of an in-progress order, kept between requests."""
+
+    selector: BaseSelectionService
+    product_id: int
+    option_ids: tuple[int, ...]
+    catalog_version: int
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class OrderSessionStore:
+    """
+    Keeps the loaded selection service of each order alive so adding an
+    option is one incremental step instead of a rebuild.
+
+    Sessions are checked out while a request uses them, so two requests for
+    the same order never share a solver: the second one finds no session and
+    rebuilds. Expired, evicted or stale sessions are simply not returned and
+    callers rebuild them from the order.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_sessions: int,
+        version: CatalogVersion = catalog_version,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.version = version
+        self.clock = clock
+        self._sessions: OrderedDict[int, OrderSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def checkout(self, order_id: int) -> OrderSession | None:
+        with self._lock:
+            session = self._sessions.pop(order_id, None)
+
+        if session is None:
+            return None
+
+        if (
+            self.clock() - session.last_used > self.ttl
+            or session.catalog_version != self.version.of(session.product_id)
+        ):
+            return None
+
+        return session
+
+    def checkin(self, order_id: int, session: OrderSession):
+        now = self.clock()
+        session.last_used = now
+
+        with self._lock:
+            self._sessions[order_id] = session
+            self._sessions.move_to_end(order_id)
+
+            # Sessions are ordered by last use, so expired ones are at the front
+            while self._sessions:
+                oldest = next(iter(self._sessions.values()))
+
+                if (
+                    len(self._sessions) <= self.max_sessions
+                    and now - oldest.last_used <= self.ttl
+                ):
+                    break
+
+                self._sessions.popitem(last=False)
+
+    def discard(self, order_id: int):
+        with self._lock:
+            self._sessions.pop(order_id, None)
+
+
+# ORDER_SESSION_MAX is a number of sessions, not bytes: each one holds a
+# loaded selection service whose size grows with the product's catalog
+order_sessions = OrderSessionStore(
+    ttl=float(os.getenv("ORDER_SESSION_TTL", "900")),
+    max_sessions=int(os.getenv("ORDER_SESSION_MAX", "1000")),
+)
@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from backend.app.models.product import Part
 
@@ -14,3 +16,17 @@ class PartService:
             .options(joinedload(Part.options))
             .all()
         )
+
+
+class AsyncPartService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_parts(self, product_id: int):
+        return list(
+            await self.db.scalars(
+                select(Part)
+                .filter(Part.product_id == product_id)
+                .options(selectinload(Part.options))
+            )
+        )
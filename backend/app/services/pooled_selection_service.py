@@ -0,0 +1,110 @@
+import uuid
+
+from backend.app.models.product import Option, Part
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.base import BaseSelectionService
+from backend.app.services.model_cache import VersionedLRUCache, product_models
+from backend.app.services.solver_pool import (
+    CatalogPayload,
+    SelectionResult,
+    SolverPool,
+    evaluate_chunk,
+    solver_pool,
+)
+
+
+class PooledSelectionService(BaseSelectionService):
+    """
+    Selection service that keeps only the chosen option ids in the request
+    thread and runs every check in the solver pool with the `backend`
+    selection service, so solving never blocks the server threadpool.
+    """
+
+    def __init__(self, backend: str, pool: SolverPool = solver_pool):
+        self.backend = backend
+        self.pool = pool
+        self.payload: CatalogPayload | None = None
+        self.part_options: dict[int, list[int]] = {}
+        self.option_ids: list[int] = []
+        self._saved_lengths: list[int] = []
+        self._last_result: tuple[tuple[int, ...], SelectionResult] | None = None
+
+    def compile_model(
+        self,
+        parts: list[Part],
+        options: list[Option],
+        grouped_compatibilities: dict[int, dict[str, list[int]]],
+    ) -> CatalogPayload:
+        # Every compiled payload gets its own key, workers compile it once
+        return CatalogPayload.build(
+            (uuid.uuid4().hex,), parts, options, grouped_compatibilities
+        )
+
+    def load_model(self, model: CatalogPayload):
+        self.payload = model
+        self.part_options = {part_id: [] for part_id in model.part_ids}
+
+        for option_id, part_id in model.options:
+            self.part_options.setdefault(part_id, []).append(option_id)
+
+        self.option_ids = []
+        self._saved_lengths = []
+        self._last_result = None
+
+    def get_available_options(
+        self, parts: list[Part] | None = None
+    ) -> dict[int, list[int]]:
+        available_options, _ = self._evaluate()
+
+        if parts is None:
+            return available_options
+
+        return {part.id: available_options.get(part.id, []) for part in parts}
+
+    def is_selection_valid(self) -> bool:
+        _, valid = self._evaluate()
+        return valid
+
+    def select_part_options(self, options: list[Option]):
+        self.option_ids.extend(option.id for option in options)
+
+    def push(self):
+        self._saved_lengths.append(len(self.option_ids))
+
+    def pop(self):
+        del self.option_ids[self._saved_lengths.pop() :]
+
+    def _evaluate(self) -> SelectionResult:
+        # Validity and availability of the same selection come from one task
+        selection = tuple(self.option_ids)
+
+        if self._last_result is None or self._last_result[0] != selection:
+            future = self.pool.submit(
+                evaluate_chunk, self.backend, self.payload, [list(selection)]
+            )
+            self._last_result = (selection, self.pool.result(future)[0])
+
+        return self._last_result[1]
+
+
+def warm_solver_pool(
+    repository: PricingOrderRepository,
+    product_ids: list[int],
+    backend: str,
+    pool: SolverPool = solver_pool,
+    model_cache: VersionedLRUCache = product_models,
+):
+    """
+    Compile the payload of every product and start the pool with them, the
+    payloads stay in the model cache so requests reuse the warm worker models.
+    """
+    from backend.app.services.selection_backends import load_product_model
+
+    payloads = []
+
+    for product_id in product_ids:
+        selector = PooledSelectionService(backend, pool)
+        load_product_model(selector, repository, product_id, model_cache)
+        payloads.append(selector.payload)
+
+    pool.start(backend, payloads)
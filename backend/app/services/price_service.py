@@ -1,53 +1,68 @@
-from itertools import groupby
-from operator import attrgetter
-
-from sqlalchemy import Column
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Collection, Iterable
 
 from backend.app.models.product import Option, PriceRule
 from backend.app.services.base import BasePriceService
 
 
-class PriceService(BasePriceService):
-    def calculate_price(self, options: list[Option], rules: list[PriceRule]) -> float:
-        """
-        Calculate the price of an option based on the current order and the new option.
-        """
-        total_price = 0
-        current_option_ids: list[Column[int]] = [option.id for option in options]
+@dataclass(frozen=True)
+class CompiledPriceRule:
+    rule_id: int
+    price: Decimal
+    conditions: frozenset[int]
 
-        for option in options:
-            if not self._has_rules(option, rules):
-                total_price += option.price
-                continue
 
-            total_price += self._get_price_with_rules(option, rules, current_option_ids)
+class PriceIndex:
+    """
+    Price rules grouped by the option they price, with their conditions as
+    frozensets. When several rules of an option match, the one with the most
+    conditions wins and ties go to the lowest rule id, so the result never
+    depends on the order rules come from the database.
+    """
 
-        return total_price
+    def __init__(self, rules: Iterable[PriceRule]):
+        rules_by_option: defaultdict[int, list[CompiledPriceRule]] = defaultdict(list)
 
-    def _format_available_options(self, options: list[Option]) -> dict[int, list[int]]:
-        return {
-            part_id: list(map(attrgetter("id"), group))
-            for part_id, group in groupby(
-                sorted(options, key=attrgetter("part_id")), key=attrgetter("part_id")
+        for rule in rules:
+            rules_by_option[rule.option_id].append(
+                CompiledPriceRule(
+                    rule_id=rule.id,
+                    price=rule.price,
+                    conditions=frozenset(
+                        condition.option_id for condition in rule.conditions
+                    ),
+                )
             )
-        }
 
-    def _has_rules(self, option: Option, rules: list[PriceRule]):
-        return any(rule.option_id == option.id for rule in rules)
+        self.rules_by_option: dict[int, tuple[CompiledPriceRule, ...]] = {
+            option_id: tuple(
+                sorted(rules, key=lambda rule: (-len(rule.conditions), rule.rule_id))
+            )
+            for option_id, rules in rules_by_option.items()
+        }
 
-    def _get_price_with_rules(
-        self, option: Option, rules: list[PriceRule], current_option_ids: list[int]
-    ) -> float:
-        for rule in rules:
-            current_rule_condition_option_ids = [
-                condition.option_id for condition in rule.conditions
-            ]
-
-            # We get the first rule that matches
-            if all(
-                option_id in current_option_ids
-                for option_id in current_rule_condition_option_ids
-            ):
+    def get_price(self, option: Option, selected_option_ids: Collection[int]):
+        for rule in self.rules_by_option.get(option.id, ()):
+            if rule.conditions.issubset(selected_option_ids):
                 return rule.price
 
         return option.price
+
+
+class PriceService(BasePriceService):
+    def calculate_price(self, options: list[Option], rules: list[PriceRule]) -> float:
+        """
+        Calculate the price of an option based on the current order and the new option.
+        """
+        return self.calculate_indexed_price(options, PriceIndex(rules))
+
+    def calculate_indexed_price(
+        self, options: list[Option], index: PriceIndex
+    ) -> float:
+        current_option_ids = {option.id for option in options}
+
+        return sum(
+            (index.get_price(option, current_option_ids) for option in options), 0
+        )
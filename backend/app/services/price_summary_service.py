@@ -0,0 +1,206 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable
+
+from sqlalchemy.orm import Session
+from z3 import And, ArithRef, If, IntVal, Optimize, Sum, sat
+
+from backend.app.models.catalog_version import CatalogVersion, catalog_version
+from backend.app.models.product import Option
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.batch_price_service import to_cents
+from backend.app.services.price_service import PriceIndex
+from backend.app.services.selection_backends import compile_catalog
+from backend.app.services.selection_service import PartSelectionService, SolverModel
+
+logger = logging.getLogger(__name__)
+
+PRICE_SUMMARY_REFRESH_INTERVAL = float(os.getenv("PRICE_SUMMARY_REFRESH_INTERVAL", "5"))
+
+
+@dataclass(frozen=True)
+class PriceSummary:
+    min_price: Decimal
+    max_price: Decimal
+
+
+def _price_expression(
+    model: SolverModel, options: dict[int, Option], index: PriceIndex
+) -> ArithRef:
+    """
+    Total price of whatever configuration the solver picks, in cents. The
+    price of each option is a chain of Ifs over its rules, most specific
+    first, mirroring PriceIndex.get_price.
+    """
+    ctx = model.ctx
+    terms = []
+
+    for option_ids in model.part_options.values():
+        for option_id in option_ids:
+            option_var = model.option_vars[option_id]
+            price: ArithRef = IntVal(to_cents(options[option_id].price), ctx)
+
+            for rule in reversed(index.rules_by_option.get(option_id, ())):
+                # Rules on options that can't be selected never apply
+                if any(
+                    condition not in model.option_vars for condition in rule.conditions
+                ):
+                    continue
+
+                price = If(
+                    And(
+                        [
+                            model.option_vars[condition] == condition
+                            for condition in rule.conditions
+                        ],
+                        ctx,
+                    ),
+                    IntVal(to_cents(rule.price), ctx),
+                    price,
+                    ctx,
+                )
+
+            terms.append(If(option_var == option_id, price, 0, ctx))
+
+    return Sum(terms) if terms else IntVal(0, ctx)
+
+
+def compute_price_summary(
+    model: SolverModel, options: list[Option], index: PriceIndex
+) -> PriceSummary | None:
+    """
+    Cheapest and most expensive valid configuration, None when the product
+    can't be configured at all.
+    """
+    bounds = []
+
+    with model.lock:
+        total = _price_expression(
+            model, {option.id: option for option in options}, index
+        )
+
+        for direction in ("minimize", "maximize"):
+            optimize = Optimize(ctx=model.ctx)
+            optimize.add(model.constraints)
+            getattr(optimize, direction)(total)
+
+            if optimize.check() != sat:
+                return None
+
+            bounds.append(optimize.model().eval(total).as_long())
+
+    return PriceSummary(
+        min_price=Decimal(bounds[0]).scaleb(-2),
+        max_price=Decimal(bounds[1]).scaleb(-2),
+    )
+
+
+class PriceSummaryStore:
+    """
+    Materialized price summaries for the product listing. Each summary keeps
+    the version of its product it was computed at, so a refresh only loads
+    and solves again the products whose catalog changed since.
+    """
+
+    def __init__(self, version: CatalogVersion = catalog_version):
+        self.version = version
+        self.refreshed_version: int | None = None
+        self._summaries: dict[int, tuple[int, PriceSummary | None]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self.refreshed_version != self.version.value
+
+    def get(self, product_id: int) -> PriceSummary | None:
+        entry = self._summaries.get(product_id)
+        return None if entry is None else entry[1]
+
+    def refresh(self, repository: PricingOrderRepository) -> list[int]:
+        """Recompute changed summaries, returns the ids of the products solved."""
+        version = self.version.value
+        product_ids = repository.get_product_ids()
+        refreshed = []
+
+        for product_id in product_ids:
+            # Read before loading, a change committed meanwhile is picked up
+            # by the next refresh
+            product_version = self.version.of(product_id)
+            entry = self._summaries.get(product_id)
+
+            if entry is not None and entry[0] == product_version:
+                continue
+
+            catalog = repository.load_catalog(product_id)
+            # Compiled apart from the cached request models, in its own context
+            model = compile_catalog(PartSelectionService(), catalog)
+            summary = compute_price_summary(
+                model, catalog.options, PriceIndex(catalog.price_rules)
+            )
+
+            with self._lock:
+                self._summaries[product_id] = (product_version, summary)
+
+            refreshed.append(product_id)
+
+        with self._lock:
+            for product_id in set(self._summaries) - set(product_ids):
+                del self._summaries[product_id]
+
+        self.refreshed_version = version
+
+        return refreshed
+
+
+class PriceSummaryRefresher:
+    """Background thread refreshing the store whenever the catalog changes."""
+
+    def __init__(
+        self,
+        store: PriceSummaryStore,
+        session_factory: Callable[[], Session],
+        interval: float = PRICE_SUMMARY_REFRESH_INTERVAL,
+    ):
+        self.store = store
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="price-summary-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def refresh(self):
+        db = self.session_factory()
+
+        try:
+            self.store.refresh(PricingOrderRepository(db))
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.store.is_stale:
+                try:
+                    self.refresh()
+                except Exception:
+                    logger.exception("Could not refresh price summaries")
+
+            self._stop.wait(self.interval)
+
+
+price_summaries = PriceSummaryStore()
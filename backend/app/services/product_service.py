@@ -1,9 +1,62 @@
+import base64
+import binascii
+import json
 from typing import List
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.app.models.product import Product
+from backend.app.models.product import Product, product_categories
 from backend.app.schemas.product import ProductCreate
 
 
+def encode_cursor(product_id: int) -> str:
+    """Opaque cursor pointing after the given product."""
+    payload = json.dumps({"after": product_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after = json.loads(base64.urlsafe_b64decode(padded))["after"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(after, int):
+        raise ValueError("Invalid cursor")
+
+    return after
+
+
+def products_statement(
+    skip: int = 0,
+    limit: int = 100,
+    after: int | None = None,
+    category_id: int | None = None,
+) -> Select:
+    # Seeking past the last id reads only the page, an offset reads and
+    # discards every row before it
+    statement = select(Product).order_by(Product.id).limit(limit)
+
+    if category_id is not None:
+        statement = statement.join(
+            product_categories, product_categories.c.product_id == Product.id
+        ).where(product_categories.c.category_id == category_id)
+
+    if after is not None:
+        return statement.where(Product.id > after)
+
+    return statement.offset(skip)
+
+
+def _page(products: List[Product], limit: int) -> tuple[List[Product], str | None]:
+    # One extra row is fetched to know whether a next page exists
+    if len(products) > limit:
+        return products[:limit], encode_cursor(products[limit - 1].id)
+
+    return products, None
+
+
 class ProductService:
     def __init__(self, db: Session):
         self.db = db
@@ -18,5 +71,61 @@ class ProductService:
     def get_product(self, product_id: int) -> Product | None:
         return self.db.query(Product).filter(Product.id == product_id).first()
 
-    def get_products(self, skip: int = 0, limit: int = 100) -> List[Product]:
-        return self.db.query(Product).offset(skip).limit(limit).all()
+    def get_products(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: int | None = None,
+        category_id: int | None = None,
+    ) -> List[Product]:
+        return list(
+            self.db.scalars(products_statement(skip, limit, after, category_id))
+        )
+
+    def get_product_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        category_id: int | None = None,
+        skip: int = 0,
+    ) -> tuple[List[Product], str | None]:
+        """Products after the cursor and the cursor of the next page, if any."""
+        after = decode_cursor(cursor) if cursor else None
+        products = self.get_products(skip, limit + 1, after, category_id)
+        return _page(products, limit)
+
+
+class AsyncProductService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_product(self, product: ProductCreate):
+        db_product = Product(**product.model_dump())
+        self.db.add(db_product)
+        await self.db.commit()
+        return db_product
+
+    async def get_product(self, product_id: int) -> Product | None:
+        return await self.db.get(Product, product_id)
+
+    async def get_products(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: int | None = None,
+        category_id: int | None = None,
+    ) -> List[Product]:
+        return list(
+            await self.db.scalars(products_statement(skip, limit, after, category_id))
+        )
+
+    async def get_product_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        category_id: int | None = None,
+        skip: int = 0,
+    ) -> tuple[List[Product], str | None]:
+        after = decode_cursor(cursor) if cursor else None
+        products = await self.get_products(skip, limit + 1, after, category_id)
+        return _page(products, limit)
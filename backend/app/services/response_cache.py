@@ -0,0 +1,68 @@
+import gzip
+import hashlib
+from dataclasses import dataclass
+
+# Bodies smaller than this are not worth a gzip header
+GZIP_MIN_SIZE = 512
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+
+        if name == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+
+    return 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedResponse:
+    """A serialized response body, its gzip encoding and a strong ETag."""
+
+    body: bytes
+    gzip_body: bytes | None
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "EncodedResponse":
+        gzip_body = None
+
+        if len(body) >= GZIP_MIN_SIZE:
+            # mtime=0 keeps the encoding identical across processes
+            gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+
+        return cls(
+            body=body,
+            gzip_body=gzip_body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+
+    @property
+    def gzip_etag(self) -> str:
+        # Strong ETags are per representation, the gzip bytes get their own
+        return f'{self.etag[:-1]}-gzip"'
+
+    def accepts_gzip(self, accept_encoding: str | None) -> bool:
+        if self.gzip_body is None or not accept_encoding:
+            return False
+
+        for coding in accept_encoding.split(","):
+            name, _, params = coding.strip().partition(";")
+
+            if name.strip().lower() in ("gzip", "*"):
+                return _quality(params) > 0
+
+        return False
+
+    def not_modified(self, if_none_match: str | None) -> bool:
+        """If-None-Match uses weak comparison, any encoding of the body matches."""
+        if not if_none_match:
+            return False
+
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+        return "*" in tags or self.etag in tags or self.gzip_etag in tags
@@ -0,0 +1,99 @@
+import os
+
+from backend.app.repositories.pricing_repository import (
+    CatalogSnapshot,
+    PricingOrderRepository,
+)
+from backend.app.services.base import BaseSelectionService
+from backend.app.services.bitset_selection_service import BitsetSelectionService
+from backend.app.services.catalog_store import (
+    CatalogStore,
+    ProductCatalog,
+    product_catalogs,
+)
+from backend.app.services.decision_diagram_service import (
+    DecisionDiagramSelectionService,
+)
+from backend.app.services.model_cache import VersionedLRUCache, product_models
+from backend.app.services.pooled_selection_service import PooledSelectionService
+from backend.app.services.selection_service import PartSelectionService
+
+SELECTION_BACKENDS: dict[str, type[BaseSelectionService]] = {
+    "z3": PartSelectionService,
+    "bitset": BitsetSelectionService,
+    "mdd": DecisionDiagramSelectionService,
+}
+
+# z3 handles any rule we may add in the future, bitset answers the
+# compatible/incompatible rules we have today without a solver and mdd
+# precompiles every valid configuration, falling back to z3 when too large
+SELECTION_BACKEND = os.getenv("SELECTION_BACKEND", "z3")
+
+# "inline" solves in the request thread, "process" in the solver pool
+SOLVER_EXECUTION = os.getenv("SOLVER_EXECUTION", "inline")
+
+
+def validate_settings(backend: str, execution: str):
+    """
+    Raise at startup on a misconfigured backend, requests would otherwise
+    turn the ValueError of create_selection_service into 404s.
+    """
+    if backend not in SELECTION_BACKENDS:
+        raise RuntimeError(
+            f"Unknown SELECTION_BACKEND {backend!r}, "
+            f"expected one of {', '.join(SELECTION_BACKENDS)}"
+        )
+
+    if execution not in ("inline", "process"):
+        raise RuntimeError(
+            f"Unknown SOLVER_EXECUTION {execution!r}, expected inline or process"
+        )
+
+
+validate_settings(SELECTION_BACKEND, SOLVER_EXECUTION)
+
+
+def create_selection_service(
+    backend: str | None = None, execution: str = "inline"
+) -> BaseSelectionService:
+    backend = backend or SELECTION_BACKEND
+
+    if backend not in SELECTION_BACKENDS:
+        raise ValueError(f"Unknown selection backend: {backend}")
+
+    if execution == "process":
+        return PooledSelectionService(backend)
+
+    return SELECTION_BACKENDS[backend]()
+
+
+def load_product_model(
+    selector: BaseSelectionService,
+    repository: PricingOrderRepository,
+    product_id: int,
+    model_cache: VersionedLRUCache = product_models,
+    catalogs: CatalogStore = product_catalogs,
+):
+    load_catalog_model(selector, catalogs.get(repository, product_id), model_cache)
+
+
+def load_catalog_model(
+    selector: BaseSelectionService,
+    catalog: ProductCatalog,
+    model_cache: VersionedLRUCache = product_models,
+):
+    # The compiled model only changes with the catalog, so it is shared
+    # between requests and rebuilt when the catalog version moves
+    model = model_cache.get_or_build(
+        (catalog.product_id, type(selector).__name__),
+        lambda: compile_catalog(selector, catalog),
+    )
+    selector.load_model(model)
+
+
+def compile_catalog(
+    selector: BaseSelectionService, catalog: CatalogSnapshot | ProductCatalog
+):
+    return selector.compile_model(
+        catalog.parts, catalog.options, catalog.grouped_compatibilities
+    )
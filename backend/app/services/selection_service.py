@@ -1,4 +1,17 @@
-from z3 import Solver, sat, Int, Or, Implies, ArithRef
+import threading
+from dataclasses import dataclass, field
+from z3 import (
+    ArithRef,
+    BoolRef,
+    Context,
+    Implies,
+    Int,
+    ModelRef,
+    Or,
+    Solver,
+    Z3_enable_concurrent_dec_ref,
+    sat,
+)
 import logging
 
 from backend.app.models.product import Option, Part
@@ -7,69 +20,180 @@ from backend.app.services.base import BaseSelectionService
 logger = logging.getLogger(__name__)
 
 
+def new_context() -> Context:
+    """
+    A z3 context of its own for one compiled model. Objects the garbage
+    collector releases from another thread are queued instead of freed
+    while the owner of the context may be using it.
+    """
+    ctx = Context()
+    Z3_enable_concurrent_dec_ref(ctx.ref())
+    return ctx
+
+
+@dataclass(frozen=True)
+class SolverModel:
+    """
+    A compiled product in its own z3 context. z3 contexts aren't
+    thread-safe and cached models are shared by request threads and order
+    sessions, so every solver built on a model runs under its lock.
+    """
+
+    option_vars: dict[int, ArithRef]
+    part_options: dict[int, list[int]]
+    constraints: list[BoolRef]
+    ctx: Context
+    lock: threading.RLock = field(default_factory=threading.RLock, compare=False)
+
+
 class PartSelectionService(BaseSelectionService):
     def __init__(self):
-        self.solver = Solver()
+        self.model: SolverModel | None = None
+        self.solver: Solver | None = None
         self.option_vars: dict[int, ArithRef] = {}
+        self.part_options: dict[int, list[int]] = {}
 
-    def load_compatibilities(
+    def compile_model(
         self,
         parts: list[Part],
         options: list[Option],
         grouped_compatibilities: dict[int, dict[str, list[int]]],
-    ):
-        self.option_vars = {
-            option.id: Int(f"part{option.part_id}") for option in options
+    ) -> SolverModel:
+        ctx = new_context()
+        option_vars = {
+            option.id: Int(f"part{option.part_id}", ctx=ctx) for option in options
         }
+        part_options: dict[int, list[int]] = {part.id: [] for part in parts}
 
-        for part in parts:
-            part_options = [
-                self.option_vars[option.id] == option.id for option in part.options
-            ]
-            self.solver.add(Or(part_options))
+        for option in options:
+            part_options.setdefault(option.part_id, []).append(option.id)
 
-        for option1_id, rules in grouped_compatibilities.items():
-            option1_var: ArithRef = self.option_vars[option1_id]
+        constraints = []
 
-            if not rules:
+        for part_id, option_ids in part_options.items():
+            constraints.append(
+                Or(
+                    [option_vars[option_id] == option_id for option_id in option_ids],
+                    ctx,
+                )
+            )
+
+        for option1_id, rules in grouped_compatibilities.items():
+            # Out of stock options can't be selected, so a rule on one is void
+            # and "incompatible with an out of stock option" always holds
+            if (
+                not rules
+                or option1_id not in option_vars
+                or any(opt_id not in option_vars for opt_id in rules["incompatible"])
+            ):
                 continue
 
-            self.solver.add(
+            option1_var: ArithRef = option_vars[option1_id]
+
+            constraints.append(
                 Implies(
                     option1_var == option1_id,
                     Or(
                         [
-                            self.option_vars[opt_id] == opt_id
+                            option_vars[opt_id] == opt_id
                             for opt_id in rules["compatible"]
+                            if opt_id in option_vars
                         ]
                         + [
-                            self.option_vars[opt_id] != opt_id
+                            option_vars[opt_id] != opt_id
                             for opt_id in rules["incompatible"]
-                        ]
+                        ],
+                        ctx,
                     ),
+                    ctx=ctx,
                 )
             )
 
-    def get_available_options(self, parts: list[Part]) -> dict[int, list[int]]:
-        available_options = {}
-
-        for part in parts:
-            available_options[part.id] = []
-
-            for option in part.options:
-                self.solver.push()
-                self.solver.add(self.option_vars[option.id] == option.id)
+        return SolverModel(option_vars, part_options, constraints, ctx)
+
+    def load_model(self, model: SolverModel):
+        with model.lock:
+            solver = Solver(ctx=model.ctx)
+            solver.add(model.constraints)
+
+        self.model = model
+        self.solver = solver
+        self.option_vars = model.option_vars
+        self.part_options = model.part_options
+
+    def get_available_options(
+        self, parts: list[Part] | None = None
+    ) -> dict[int, list[int]]:
+        """
+        Every satisfying model proves one option per part to be selectable,
+        so instead of one check per option we ask for a model that uses any
+        option not proven yet and harvest all the parts from it. An unsat
+        answer rules out every remaining option of that part at once.
+        """
+        part_ids = (
+            list(self.part_options) if parts is None else [part.id for part in parts]
+        )
+        pending = {
+            part_id: set(self.part_options.get(part_id, [])) for part_id in part_ids
+        }
+        available: dict[int, set[int]] = {part_id: set() for part_id in part_ids}
+
+        with self.model.lock:
+            for part_id in part_ids:
+                while pending[part_id]:
+                    part_var = self.option_vars[next(iter(pending[part_id]))]
+
+                    self.solver.push()
+                    self.solver.add(
+                        Or([part_var == option_id for option_id in pending[part_id]])
+                    )
+                    model = self.solver.model() if self.solver.check() == sat else None
+                    self.solver.pop()
+
+                    if model is None:
+                        break
+
+                    self._collect_model(model, pending, available)
+
+        return {
+            part_id: [
+                option_id
+                for option_id in self.part_options.get(part_id, [])
+                if option_id in available[part_id]
+            ]
+            for part_id in part_ids
+        }
 
-                if self.solver.check() == sat:
-                    available_options[part.id].append(option.id)
+    def _collect_model(
+        self,
+        model: ModelRef,
+        pending: dict[int, set[int]],
+        available: dict[int, set[int]],
+    ):
+        for part_id, option_ids in pending.items():
+            if not option_ids:
+                continue
 
-                self.solver.pop()
+            part_var = self.option_vars[next(iter(option_ids))]
+            option_id = model.eval(part_var, model_completion=True).as_long()
 
-        return available_options
+            if option_id in option_ids:
+                option_ids.remove(option_id)
+                available[part_id].add(option_id)
 
     def is_selection_valid(self) -> bool:
-        return self.solver.check() == sat
+        with self.model.lock:
+            return self.solver.check() == sat
 
     def select_part_options(self, options: list[Option]):
-        for option in options:
-            self.solver.add(self.option_vars[option.id] == option.id)
+        with self.model.lock:
+            for option in options:
+                self.solver.add(self.option_vars[option.id] == option.id)
+
+    def push(self):
+        with self.model.lock:
+            self.solver.push()
+
+    def pop(self):
+        with self.model.lock:
+            self.solver.pop()
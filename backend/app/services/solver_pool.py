@@ -0,0 +1,382 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import FIRST_EXCEPTION, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from backend.app.models.product import Option, Part
+from backend.app.services.base import BaseSelectionService
+
+logger = logging.getLogger(__name__)
+
+SOLVER_POOL_SIZE = int(os.getenv("SOLVER_POOL_SIZE", str(os.cpu_count() or 1)))
+# Seconds to wait for one check, or all chunks of a batch, before giving up
+SOLVER_TIMEOUT = float(os.getenv("SOLVER_TIMEOUT", "10"))
+# Tasks waiting or running in the pool before new ones are rejected
+SOLVER_POOL_MAX_QUEUE = int(os.getenv("SOLVER_POOL_MAX_QUEUE", "256"))
+WORKER_MODEL_CACHE_SIZE = int(os.getenv("WORKER_MODEL_CACHE_SIZE", "32"))
+
+
+class SolverTimeout(Exception):
+    pass
+
+
+class SolverPoolBusy(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class PartRef:
+    id: int
+
+
+@dataclass(frozen=True)
+class OptionRef:
+    id: int
+    part_id: int
+
+
+@dataclass(frozen=True)
+class CatalogPayload:
+    """
+    Picklable copy of what compile_model needs, sent to worker processes
+    together with the key their compiled model is cached under.
+    """
+
+    key: tuple
+    part_ids: tuple[int, ...]
+    options: tuple[tuple[int, int], ...]
+    grouped_compatibilities: dict[int, dict[str, list[int]]]
+
+    @classmethod
+    def build(
+        cls,
+        key: tuple,
+        parts: list[Part],
+        options: list[Option],
+        grouped_compatibilities: dict[int, dict[str, list[int]]],
+    ) -> "CatalogPayload":
+        return cls(
+            key=key,
+            part_ids=tuple(part.id for part in parts),
+            options=tuple((option.id, option.part_id) for option in options),
+            grouped_compatibilities={
+                option_id: {kind: list(ids) for kind, ids in rules.items()}
+                for option_id, rules in grouped_compatibilities.items()
+            },
+        )
+
+
+# (available options, is valid) for one selection
+SelectionResult = tuple[dict[int, list[int]], bool]
+
+
+def evaluate_selections(
+    selector: BaseSelectionService,
+    options: dict[int, Any],
+    selections: list[list[int]],
+    timeout: float | None = None,
+) -> list[SelectionResult]:
+    """
+    Evaluate many partial selections against one loaded selector, rolling
+    back after each of them. Options outside the catalog make it invalid.
+    A batch still running after timeout seconds raises SolverTimeout.
+    """
+    results = []
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    for option_ids in selections:
+        if deadline is not None and time.monotonic() >= deadline:
+            raise SolverTimeout(f"Solver check took longer than {timeout}s")
+
+        if any(option_id not in options for option_id in option_ids):
+            results.append(({part_id: [] for part_id in selector.part_options}, False))
+            continue
+
+        selector.push()
+        selector.select_part_options([options[option_id] for option_id in option_ids])
+        results.append(
+            (selector.get_available_options(), selector.is_selection_valid())
+        )
+        selector.pop()
+
+    return results
+
+
+# Worker side: compiled models live as long as the worker process
+_worker_models: OrderedDict[tuple, Any] = OrderedDict()
+
+
+def _worker_selector(backend: str, payload: CatalogPayload) -> BaseSelectionService:
+    from backend.app.services.selection_backends import create_selection_service
+
+    selector = create_selection_service(backend)
+    model_key = (backend, payload.key)
+
+    if model_key not in _worker_models:
+        _worker_models[model_key] = selector.compile_model(
+            [PartRef(part_id) for part_id in payload.part_ids],
+            [OptionRef(option_id, part_id) for option_id, part_id in payload.options],
+            payload.grouped_compatibilities,
+        )
+
+        if len(_worker_models) > WORKER_MODEL_CACHE_SIZE:
+            _worker_models.popitem(last=False)
+
+    _worker_models.move_to_end(model_key)
+    selector.load_model(_worker_models[model_key])
+    return selector
+
+
+def _warm_worker(backend: str, payloads: tuple[CatalogPayload, ...]):
+    for payload in payloads:
+        _worker_selector(backend, payload)
+
+
+def evaluate_chunk(
+    backend: str, payload: CatalogPayload, selections: list[list[int]]
+) -> list[SelectionResult]:
+    selector = _worker_selector(backend, payload)
+    options = {
+        option_id: OptionRef(option_id, part_id)
+        for option_id, part_id in payload.options
+    }
+
+    return evaluate_selections(selector, options, selections)
+
+
+class SolverPool:
+    """
+    Bounded pool of worker processes for solver work. Workers are spawned
+    rather than forked so they never inherit the server threads or the z3
+    context, and are only started on first use unless warmed up with
+    start().
+
+    Work that times out is cancelled when it hasn't started. If a worker is
+    already running it, the whole pool is recycled: the workers are
+    terminated and new ones start on the next submit. Tasks of other
+    requests caught in the restart fail with SolverPoolBusy.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = SOLVER_POOL_SIZE,
+        timeout: float = SOLVER_TIMEOUT,
+        max_queue: int = SOLVER_POOL_MAX_QUEUE,
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.submitted = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.max_queue_depth = 0
+        self._executor: ProcessPoolExecutor | None = None
+        # Executor each pending future was submitted to, to recycle the right one
+        self._owners: weakref.WeakKeyDictionary[Future, ProcessPoolExecutor] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        return self.submitted - self.completed
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+
+            return self._executor
+
+    def _create_executor(self, initializer=None, initargs=()) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            initargs=initargs,
+        )
+
+    def start(self, backend: str, payloads: Iterable[CatalogPayload] = ()):
+        """Start the workers with the given product models already compiled."""
+        payloads = tuple(payloads)
+
+        with self._lock:
+            previous = self._executor
+            self._executor = self._create_executor(_warm_worker, (backend, payloads))
+
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+        logger.info(
+            "Solver pool started with %s workers and %s warm models",
+            self.max_workers,
+            len(payloads),
+        )
+
+    def submit(self, function: Callable, *args) -> Future:
+        with self._lock:
+            if self.queue_depth >= self.max_queue:
+                self.rejected += 1
+                raise SolverPoolBusy(f"Solver pool queue is full ({self.max_queue})")
+
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        executor = self.executor
+
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            # A worker died, start over with new ones
+            self._task_done(None)
+            self._recycle(executor)
+            raise SolverPoolBusy("Solver pool was restarted, retry the request")
+        except Exception:
+            self._task_done(None)
+            raise
+
+        with self._lock:
+            self._owners[future] = executor
+
+        future.add_done_callback(self._task_done)
+        return future
+
+    def _task_done(self, future: Future | None):
+        with self._lock:
+            self.completed += 1
+
+    def result(self, future: Future) -> Any:
+        return self.gather([future])[0]
+
+    def gather(self, futures: list[Future]) -> list[Any]:
+        """
+        Results of the futures, all within one timeout. On timeout or failure
+        the remaining futures are abandoned.
+        """
+        done, pending = wait(futures, timeout=self.timeout, return_when=FIRST_EXCEPTION)
+        failed = next(
+            (
+                future
+                for future in done
+                if future.cancelled() or future.exception() is not None
+            ),
+            None,
+        )
+
+        if failed is not None:
+            self._abandon(futures)
+
+            if failed.cancelled() or isinstance(failed.exception(), BrokenProcessPool):
+                raise SolverPoolBusy("Solver pool was restarted, retry the request")
+
+            raise failed.exception()
+
+        if pending:
+            self._abandon(futures)
+
+            with self._lock:
+                self.timeouts += 1
+
+            raise SolverTimeout(f"Solver check took longer than {self.timeout}s")
+
+        return [future.result() for future in futures]
+
+    def _abandon(self, futures: list[Future]):
+        # Cancelling runs the done callbacks, which take the lock
+        stuck = [
+            future for future in futures if not future.cancel() and not future.done()
+        ]
+        broken = [
+            future
+            for future in futures
+            if future.done()
+            and not future.cancelled()
+            and isinstance(future.exception(), BrokenProcessPool)
+        ]
+
+        with self._lock:
+            executors = {self._owners.get(future) for future in stuck + broken}
+
+        for executor in executors - {None}:
+            self._recycle(executor)
+
+    def _recycle(self, executor: ProcessPoolExecutor):
+        """Terminate the workers of an executor stuck on abandoned work."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.restarts += 1
+
+        # ProcessPoolExecutor can't kill a running task, its processes can
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Solver pool recycled after abandoned work")
+
+    def evaluate_selections(
+        self, backend: str, payload: CatalogPayload, selections: list[list[int]]
+    ) -> list[SelectionResult]:
+        if not selections:
+            return []
+
+        chunk_size = -(-len(selections) // (self.max_workers * 4))
+        futures = []
+
+        for start in range(0, len(selections), chunk_size):
+            try:
+                futures.append(
+                    self.submit(
+                        evaluate_chunk,
+                        backend,
+                        payload,
+                        selections[start : start + chunk_size],
+                    )
+                )
+            except Exception:
+                # The batch fails as a whole, free the workers of its chunks
+                self._abandon(futures)
+                raise
+
+        return [result for results in self.gather(futures) for result in results]
+
+    def metrics(self) -> dict[str, int]:
+        return {**self.gauges(), **self.counters()}
+
+    def gauges(self) -> dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    def counters(self) -> dict[str, int]:
+        """Values that only ever increase over the life of the process."""
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+        }
+
+    def shutdown(self):
+        # Done callbacks take the lock, so never wait for workers holding it
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
+
+
+solver_pool = SolverPool()
@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.base import create_async_database_engine
+from backend.app.models.catalog_version import CatalogVersion
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Order,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+from backend.app.repositories.async_pricing_repository import (
+    AsyncPricingOrderRepository,
+)
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.catalog_store import CatalogStore
+from backend.app.services.model_cache import VersionedLRUCache
+from backend.app.services.order_service import AsyncCartOrderService
+from backend.app.services.order_sessions import OrderSessionStore
+from backend.app.services.part_service import AsyncPartService
+from backend.app.services.price_service import PriceService
+from backend.app.services.product_service import AsyncProductService
+from backend.app.services.selection_service import PartSelectionService
+
+
+@pytest.fixture(scope="function")
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shop.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    # Create test data
+    product = Product(id=1, name="Test Bike")
+    session.add(product)
+
+    parts = [
+        Part(id=1, name="Frame", product_id=1),
+        Part(id=2, name="Wheels", product_id=1),
+        Part(id=3, name="Rim color", product_id=1),
+    ]
+    session.add_all(parts)
+
+    options = [
+        Option(id=1, part_id=1, name="Full-suspension", price=130),
+        Option(id=2, part_id=1, name="Diamond", price=100),
+        Option(id=3, part_id=2, name="Road wheels", price=80),
+        Option(id=4, part_id=2, name="Mountain wheels", price=100),
+        Option(id=6, part_id=3, name="Red", price=20),
+        Option(id=7, part_id=3, name="Black", price=20),
+    ]
+    session.add_all(options)
+
+    rule = PriceRule(id=1, option_id=7, price=30)
+    session.add(rule)
+    conditions = [
+        PriceRuleCondition(price_rule_id=1, option_id=1),
+        PriceRuleCondition(price_rule_id=1, option_id=4),
+    ]
+    session.add_all(conditions)
+
+    compatibilities = [
+        OptionCompatibility(option1_id=1, option2_id=4, compatible=True),
+    ]
+    session.add_all(compatibilities)
+
+    session.commit()
+    session.close()
+    engine.dispose()
+
+    return url
+
+
+def run_async(database_url, function):
+    async def main():
+        engine = create_async_database_engine(
+            database_url.replace("sqlite://", "sqlite+aiosqlite://"), {}
+        )
+
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await function(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def make_order_service(db) -> AsyncCartOrderService:
+    version = CatalogVersion()
+
+    return AsyncCartOrderService(
+        AsyncPricingOrderRepository(db),
+        PartSelectionService(),
+        PriceService(),
+        model_cache=VersionedLRUCache(maxsize=8, version=version),
+        sessions=OrderSessionStore(ttl=60, max_sessions=10, version=version),
+        quote_cache=VersionedLRUCache(maxsize=8, version=version),
+        catalogs=CatalogStore(version=version),
+    )
+
+
+def test_async_order_flow(database_url):
+    async def configure(db):
+        repository = AsyncPricingOrderRepository(db)
+        order_service = make_order_service(db)
+
+        created = await order_service.create_order(await repository.get_product(1))
+        order = await repository.get_order(created.id)
+        responses = [
+            await order_service.update_order(
+                order, await repository.get_option(option_id)
+            )
+            for option_id in (1, 4, 7)
+        ]
+
+        with pytest.raises(ValueError):
+            await order_service.update_order(order, await repository.get_option(3))
+
+        return created, responses
+
+    created, responses = run_async(database_url, configure)
+
+    assert created.available_options == {1: [1, 2], 2: [3, 4], 3: [6, 7]}
+    assert [response.total_price for response in responses] == [130, 230, 260]
+    assert responses[-1].available_options == {1: [1], 2: [4], 3: [7]}
+
+    engine = create_engine(database_url)
+    with sessionmaker(bind=engine)() as session:
+        order = session.get(Order, created.id)
+
+        assert order.total_price == 260
+        assert [option.id for option in order.options] == [1, 4, 7]
+
+    engine.dispose()
+
+
+def test_async_repository_matches_sync(database_url):
+    async def load(db):
+        repository = AsyncPricingOrderRepository(db)
+        catalog = await repository.load_catalog(1)
+        parts = await AsyncPartService(db).get_parts(1)
+        products = await AsyncProductService(db).get_products()
+
+        return (
+            [option.id for option in catalog.options],
+            dict(catalog.grouped_compatibilities),
+            [rule.id for rule in catalog.price_rules],
+            {part.id: [option.id for option in part.options] for part in parts},
+            [product.id for product in products],
+        )
+
+    options, compatibilities, rules, parts, products = run_async(database_url, load)
+
+    engine = create_engine(database_url)
+    with sessionmaker(bind=engine)() as session:
+        catalog = PricingOrderRepository(session).load_catalog(1)
+
+        assert options == [option.id for option in catalog.options]
+        assert compatibilities == dict(catalog.grouped_compatibilities)
+        assert rules == [rule.id for rule in catalog.price_rules]
+
+    engine.dispose()
+
+    assert parts == {1: [1, 2], 2: [3, 4], 3: [6, 7]}
+    assert products == [1]
@@ -0,0 +1,57 @@
+import pytest
+
+from backend.app.models.catalog_version import CatalogVersion
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.availability_service import AvailabilityService
+from backend.app.services.model_cache import VersionedLRUCache
+from backend.app.services.solver_pool import SolverPool, SolverTimeout
+
+SELECTIONS = [[], [1], [1, 5], [2, 3, 6, 8], [99]]
+
+
+@pytest.fixture
+def pool():
+    pool = SolverPool(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def make_service(db_session, backend: str, pool: SolverPool | None = None):
+    return AvailabilityService(
+        PricingOrderRepository(db_session),
+        backend=backend,
+        model_cache=VersionedLRUCache(maxsize=8, version=CatalogVersion()),
+        pool=pool or SolverPool(max_workers=1),
+    )
+
+
+@pytest.mark.parametrize("backend", ["z3", "bitset", "mdd"])
+def test_evaluate_selections(db_session, backend):
+    results = make_service(db_session, backend).evaluate(1, SELECTIONS)
+
+    assert [result.valid for result in results] == [True, True, False, True, False]
+    assert results[1].available_options == {1: [1], 2: [4], 3: [6, 7], 4: [8, 9]}
+    assert results[2].available_options == {1: [], 2: [], 3: [], 4: []}
+    assert results[3].available_options == {1: [2], 2: [3], 3: [6], 4: [8]}
+
+
+def test_evaluate_rolls_back_between_selections(db_session):
+    results = make_service(db_session, "z3").evaluate(1, [[1], [2]])
+
+    assert results[1].valid
+    assert results[1].available_options[2] == [3]
+
+
+def test_parallel_matches_sequential(db_session, pool):
+    service = make_service(db_session, "bitset", pool)
+
+    assert service.evaluate(1, SELECTIONS, parallel=True) == service.evaluate(
+        1, SELECTIONS
+    )
+
+
+def test_inline_evaluation_has_the_pool_deadline(db_session):
+    service = make_service(db_session, "bitset", SolverPool(max_workers=1, timeout=0))
+
+    with pytest.raises(SolverTimeout):
+        service.evaluate(1, SELECTIONS)
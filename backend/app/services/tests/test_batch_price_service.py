@@ -0,0 +1,142 @@
+import random
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.catalog_version import CatalogVersion
+from backend.app.models.product import (
+    Option,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.batch_price_service import BatchPriceService
+from backend.app.services.model_cache import VersionedLRUCache
+from backend.app.services.price_service import PriceIndex, PriceService
+from backend.benchmarks.catalog_generator import (
+    CatalogSpec,
+    generate_catalog,
+    insert_catalog,
+)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    # Create test data
+    product = Product(id=1, name="Test Bike")
+    session.add(product)
+
+    parts = [
+        Part(id=1, name="Frame", product_id=1),
+        Part(id=2, name="Wheels", product_id=1),
+        Part(id=3, name="Rim color", product_id=1),
+    ]
+    session.add_all(parts)
+
+    options = [
+        Option(id=1, part_id=1, name="Full-suspension", price=130),
+        Option(id=2, part_id=1, name="Diamond", price=100),
+        Option(id=3, part_id=2, name="Road wheels", price=80),
+        Option(id=4, part_id=2, name="Mountain wheels", price=100),
+        Option(id=6, part_id=3, name="Red", price=20),
+        Option(id=7, part_id=3, name="Black", price=20.5, in_stock=False),
+    ]
+    session.add_all(options)
+
+    rules = [
+        PriceRule(id=1, option_id=7, price=30),
+        PriceRule(id=2, option_id=7, price=25),
+        PriceRule(id=3, option_id=6, price=15),
+    ]
+    session.add_all(rules)
+    conditions = [
+        PriceRuleCondition(price_rule_id=1, option_id=1),
+        PriceRuleCondition(price_rule_id=1, option_id=4),
+        PriceRuleCondition(price_rule_id=2, option_id=1),
+        # Never matches, option 99 does not belong to the product
+        PriceRuleCondition(price_rule_id=3, option_id=99),
+    ]
+    session.add_all(conditions)
+
+    session.commit()
+
+    yield session
+
+    session.close()
+
+
+def make_service(db_session) -> BatchPriceService:
+    return BatchPriceService(
+        PricingOrderRepository(db_session),
+        model_cache=VersionedLRUCache(maxsize=8, version=CatalogVersion()),
+    )
+
+
+def scalar_price(db_session, product_id: int, option_ids: list[int]):
+    repository = PricingOrderRepository(db_session)
+    options = [db_session.get(Option, option_id) for option_id in option_ids]
+
+    return PriceService().calculate_indexed_price(
+        options, PriceIndex(repository.get_price_rules(product_id))
+    )
+
+
+def test_batch_prices(db_session):
+    totals = make_service(db_session).calculate_prices(
+        1, [[1, 4, 7], [1, 3, 7], [2, 4, 7], [2, 3, 6], [], [7]]
+    )
+
+    assert totals == [
+        Decimal("260.00"),
+        Decimal("235.00"),
+        Decimal("220.50"),
+        Decimal("200.00"),
+        Decimal("0.00"),
+        Decimal("20.50"),
+    ]
+
+
+def test_batch_prices_match_scalar_path(db_session):
+    configurations = [[1, 4, 7], [1, 3, 7], [2, 4, 7], [2, 3, 6], [1, 6], [7]]
+    totals = make_service(db_session).calculate_prices(1, configurations)
+
+    assert totals == [
+        scalar_price(db_session, 1, option_ids) for option_ids in configurations
+    ]
+
+
+def test_unknown_option_raises(db_session):
+    with pytest.raises(ValueError):
+        make_service(db_session).calculate_prices(1, [[1, 99]])
+
+
+def test_generated_catalog_matches_scalar_path():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    spec = CatalogSpec(parts=6, options_per_part=10, price_rules=80, seed=7)
+    catalog = generate_catalog(spec)
+    insert_catalog(session, catalog)
+
+    rng = random.Random(7)
+    configurations = [
+        [option.id for option in catalog.random_configuration(rng)] for _ in range(200)
+    ]
+    totals = make_service(session).calculate_prices(spec.product_id, configurations)
+
+    assert totals == [
+        scalar_price(session, spec.product_id, option_ids)
+        for option_ids in configurations
+    ]
+
+    session.close()
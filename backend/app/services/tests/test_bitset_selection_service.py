@@ -0,0 +1,132 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from backend.app.models.product import Option, Part
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.bitset_selection_service import BitsetSelectionService
+from backend.app.services.selection_backends import (
+    create_selection_service,
+    validate_settings,
+)
+from backend.app.services.selection_service import PartSelectionService
+
+
+@pytest.fixture
+def selection_service():
+    return BitsetSelectionService()
+
+
+@pytest.fixture
+def repository(db_session):
+    return PricingOrderRepository(db_session)
+
+
+@pytest.fixture
+def loaded_selection_service(selection_service, repository, db_session):
+    parts = db_session.query(Part).all()
+    options = db_session.query(Option).all()
+    grouped_compatibilities = repository.get_compatibilities(product_id=1)
+
+    selection_service.load_compatibilities(parts, options, grouped_compatibilities)
+
+    return selection_service
+
+
+def test_load_compatibilities(loaded_selection_service, db_session):
+    options = db_session.query(Option).all()
+
+    assert len(loaded_selection_service.model.option_bits) == len(options)
+
+
+def test_get_available_options(loaded_selection_service, db_session):
+    parts = db_session.query(Part).all()
+    available_options = loaded_selection_service.get_available_options(parts)
+
+    assert len(available_options) == len(parts)
+    for part_id, options in available_options.items():
+        assert len(options) > 0
+
+
+def test_is_selection_valid_returns_valid(loaded_selection_service):
+    assert loaded_selection_service.is_selection_valid()
+
+
+def test_is_selection_valid_returns_invalid(loaded_selection_service, db_session):
+    full_suspension = db_session.query(Option).filter_by(name="Full-suspension").first()
+    fat_wheels = db_session.query(Option).filter_by(id=5).first()
+
+    loaded_selection_service.select_part_options([full_suspension, fat_wheels])
+
+    assert not loaded_selection_service.is_selection_valid()
+    assert loaded_selection_service.get_available_options() == {
+        1: [],
+        2: [],
+        3: [],
+        4: [],
+    }
+
+
+def test_select_part_option(loaded_selection_service, db_session):
+    full_suspension = db_session.query(Option).filter_by(name="Full-suspension").first()
+    loaded_selection_service.select_part_options([full_suspension])
+
+    assert loaded_selection_service.is_selection_valid()
+    assert loaded_selection_service.get_available_options() == {
+        1: [1],
+        2: [4],
+        3: [6, 7],
+        4: [8, 9],
+    }
+
+
+def test_create_selection_service():
+    assert isinstance(create_selection_service("bitset"), BitsetSelectionService)
+    assert isinstance(create_selection_service("z3"), PartSelectionService)
+
+    with pytest.raises(ValueError):
+        create_selection_service("unknown")
+
+
+def test_misconfigured_backend_fails_at_startup():
+    validate_settings("mdd", "process")
+
+    with pytest.raises(RuntimeError, match="SELECTION_BACKEND"):
+        validate_settings("unknown", "inline")
+
+    with pytest.raises(RuntimeError, match="SOLVER_EXECUTION"):
+        validate_settings("z3", "threads")
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_solver_backend(seed):
+    rng = random.Random(seed)
+    parts = [Part(id=part_id) for part_id in range(1, rng.randint(3, 7))]
+    options = [
+        Option(id=part.id * 10 + index, part_id=part.id)
+        for part in parts
+        for index in range(rng.randint(1, 4))
+    ]
+    grouped_compatibilities = defaultdict(
+        lambda: {"compatible": [], "incompatible": []}
+    )
+
+    for _ in range(rng.randint(0, 10)):
+        option1, option2 = rng.sample(options, 2)
+        kind = rng.choice(["compatible", "incompatible"])
+        grouped_compatibilities[option1.id][kind].append(option2.id)
+
+    selection = rng.sample(options, rng.randint(0, 2))
+    services = [PartSelectionService(), BitsetSelectionService()]
+
+    for service in services:
+        service.load_compatibilities(parts, options, grouped_compatibilities)
+        service.select_part_options(selection)
+
+    solver_service, bitset_service = services
+
+    assert bitset_service.is_selection_valid() == solver_service.is_selection_valid()
+    assert bitset_service.get_available_options() == (
+        solver_service.get_available_options()
+    )
@@ -0,0 +1,186 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.catalog_version import (
+    GLOBAL_VERSION_KEY,
+    CatalogVersion,
+    CatalogVersionRecord,
+)
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+from backend.app.services.catalog_importer import CatalogImporter, CatalogImportError
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    session.add(Product(id=1, name="Existing Bike"))
+    session.commit()
+
+    yield session
+
+    session.close()
+
+
+@pytest.fixture
+def feeds(tmp_path):
+    def write(name: str, content: str) -> str:
+        path = tmp_path / name
+        path.write_text(content)
+        return str(path)
+
+    return {
+        "products": write("products.csv", "id,name,description\n2,Road Bike,\n"),
+        "parts": write(
+            "parts.csv",
+            "id,name,product_id\n1,Frame,1\n2,Wheels,2\n",
+        ),
+        "options": write(
+            "options.jsonl",
+            "\n".join(
+                json.dumps(row)
+                for row in [
+                    {"id": 1, "name": "Full", "price": "100.00", "part_id": 1},
+                    {"id": 2, "name": "Diamond", "price": 80, "part_id": 1},
+                    {
+                        "id": 3,
+                        "name": "Road",
+                        "price": "50.50",
+                        "part_id": 2,
+                        "in_stock": False,
+                    },
+                ]
+            ),
+        ),
+        "compatibilities": write(
+            "compatibilities.csv",
+            "option1_id,option2_id,compatible\n1,3,false\n",
+        ),
+        "price_rules": write("price_rules.csv", "id,option_id,price\n1,3,70\n"),
+        "price_rule_conditions": write(
+            "price_rule_conditions.csv", "price_rule_id,option_id\n1,2\n"
+        ),
+    }
+
+
+def count(db_session, model) -> int:
+    return db_session.scalar(select(func.count()).select_from(model))
+
+
+def persisted_versions(db_session) -> dict[int, int]:
+    return {
+        record.product_id: record.version
+        for record in db_session.query(CatalogVersionRecord)
+    }
+
+
+def test_import_writes_every_feed_and_bumps_version_once(db_session, feeds):
+    version = CatalogVersion()
+
+    counts = CatalogImporter(db_session, batch_size=2, version=version).run(feeds)
+
+    assert counts == {
+        "products": 1,
+        "parts": 2,
+        "options": 3,
+        "compatibilities": 1,
+        "price_rules": 1,
+        "price_rule_conditions": 1,
+    }
+    assert version.value == 1
+    assert persisted_versions(db_session) == {GLOBAL_VERSION_KEY: 1, 1: 1, 2: 1}
+    assert count(db_session, Product) == 2
+    assert count(db_session, OptionCompatibility) == 1
+    assert count(db_session, PriceRuleCondition) == 1
+
+    road = db_session.get(Option, 3)
+    assert str(road.price) == "50.50"
+    assert road.in_stock is False
+    assert db_session.get(Option, 1).in_stock is True
+    assert db_session.get(PriceRule, 1).conditions[0].option_id == 2
+
+
+def test_import_upserts_existing_rows(db_session, feeds, tmp_path):
+    CatalogImporter(db_session, version=CatalogVersion()).run(feeds)
+
+    updated = tmp_path / "options_update.csv"
+    updated.write_text("id,name,price,part_id,in_stock\n1,Full,120,1,no\n")
+    CatalogImporter(db_session, version=CatalogVersion()).run({"options": str(updated)})
+    db_session.expire_all()
+
+    assert count(db_session, Option) == 3
+    assert db_session.get(Option, 1).price == 120
+    assert db_session.get(Option, 1).in_stock is False
+
+
+def test_reimport_upserts_rows_without_id_on_their_natural_key(
+    db_session, feeds, tmp_path
+):
+    CatalogImporter(db_session, version=CatalogVersion()).run(feeds)
+
+    updated = tmp_path / "compatibilities_update.csv"
+    updated.write_text("option1_id,option2_id,compatible\n1,3,false\n1,3,true\n")
+    CatalogImporter(db_session, version=CatalogVersion()).run(
+        {**feeds, "compatibilities": str(updated)}
+    )
+    db_session.expire_all()
+
+    assert count(db_session, OptionCompatibility) == 1
+    assert count(db_session, PriceRuleCondition) == 1
+    assert db_session.scalar(select(OptionCompatibility.compatible)) is True
+
+
+def test_import_bumps_the_products_rows_move_between(db_session, feeds, tmp_path):
+    CatalogImporter(db_session, version=CatalogVersion()).run(feeds)
+    version = CatalogVersion()
+
+    moved = tmp_path / "parts_update.csv"
+    moved.write_text("id,name,product_id\n2,Wheels,1\n")
+    CatalogImporter(db_session, version=version).run({"parts": str(moved)})
+
+    assert persisted_versions(db_session) == {GLOBAL_VERSION_KEY: 2, 1: 2, 2: 2}
+    assert version.of(1) == version.of(2) == version.value == 1
+
+
+def test_import_rejects_unknown_reference_and_writes_nothing(
+    db_session, feeds, tmp_path
+):
+    version = CatalogVersion()
+    broken = tmp_path / "broken_parts.csv"
+    broken.write_text("id,name,product_id\n1,Frame,1\n2,Wheels,99\n")
+
+    with pytest.raises(CatalogImportError) as error:
+        CatalogImporter(db_session, version=version).run(
+            {**feeds, "parts": str(broken)}
+        )
+
+    assert error.value.line == 3
+    assert "product_id 99" in str(error.value)
+    assert version.value == 0
+    assert persisted_versions(db_session) == {}
+    assert count(db_session, Product) == 1
+    assert count(db_session, Part) == 0
+
+
+def test_import_rejects_invalid_values(db_session, tmp_path):
+    options = tmp_path / "options.csv"
+    options.write_text("id,name,price,part_id\n1,Full,-5,1\n")
+
+    with pytest.raises(CatalogImportError, match="price"):
+        CatalogImporter(db_session, version=CatalogVersion()).run(
+            {"options": str(options)}
+        )
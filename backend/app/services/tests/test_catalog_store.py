@@ -0,0 +1,164 @@
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.catalog_version import CatalogVersion
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.catalog_store import CatalogStore, ProductCatalog
+from backend.app.services.price_service import PriceIndex, PriceService
+from backend.app.services.selection_backends import compile_catalog
+from backend.app.services.selection_service import PartSelectionService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    # Create test data
+    product = Product(id=1, name="Test Bike")
+    session.add(product)
+
+    parts = [
+        Part(id=1, name="Frame", product_id=1),
+        Part(id=2, name="Wheels", product_id=1),
+        Part(id=3, name="Rim color", product_id=1),
+    ]
+    session.add_all(parts)
+
+    options = [
+        Option(id=1, part_id=1, name="Full-suspension", price=130),
+        Option(id=2, part_id=1, name="Diamond", price=100),
+        Option(id=3, part_id=2, name="Road wheels", price=80),
+        Option(id=4, part_id=2, name="Mountain wheels", price=100),
+        Option(id=5, part_id=2, name="Fat bike wheels", price=120, in_stock=False),
+        Option(id=6, part_id=3, name="Red", price=20),
+        Option(id=7, part_id=3, name="Black", price=20),
+    ]
+    session.add_all(options)
+
+    rule = PriceRule(id=1, option_id=7, price=30)
+    session.add(rule)
+    conditions = [
+        PriceRuleCondition(price_rule_id=1, option_id=1),
+        PriceRuleCondition(price_rule_id=1, option_id=4),
+    ]
+    session.add_all(conditions)
+
+    compatibilities = [
+        OptionCompatibility(option1_id=1, option2_id=4, compatible=True),
+        OptionCompatibility(option1_id=2, option2_id=3, compatible=True),
+    ]
+    session.add_all(compatibilities)
+
+    session.commit()
+
+    yield session
+
+    session.close()
+
+
+def test_catalog_is_shared_until_the_version_moves(db_session):
+    version = CatalogVersion()
+    store = CatalogStore(version=version)
+
+    catalog = store.get(PricingOrderRepository(db_session), 1)
+
+    assert store.get(PricingOrderRepository(db_session), 1) is catalog
+    assert [option.id for option in catalog.options] == [1, 2, 3, 4, 6, 7]
+    assert [option.id for option in catalog.all_options] == [1, 2, 3, 4, 5, 6, 7]
+    assert catalog.grouped_compatibilities == {
+        1: {"compatible": (4,), "incompatible": ()},
+        2: {"compatible": (3,), "incompatible": ()},
+    }
+
+    db_session.get(Option, 3).in_stock = False
+    db_session.commit()
+    version.bump()
+
+    updated = store.get(PricingOrderRepository(db_session), 1)
+
+    assert updated is not catalog
+    assert [option.id for option in updated.options] == [1, 2, 4, 6, 7]
+    # Readers of the old catalog still see it unchanged
+    assert [option.id for option in catalog.options] == [1, 2, 3, 4, 6, 7]
+
+
+def test_catalog_survives_changes_to_other_products(db_session):
+    version = CatalogVersion()
+    store = CatalogStore(version=version)
+    catalog = store.get(PricingOrderRepository(db_session), 1)
+
+    version.bump([2])
+
+    assert store.get(PricingOrderRepository(db_session), 1) is catalog
+
+
+def test_records_are_read_only(db_session):
+    catalog = CatalogStore(version=CatalogVersion()).get(
+        PricingOrderRepository(db_session), 1
+    )
+    option = catalog.options[0]
+
+    assert not hasattr(option, "__dict__")
+
+    with pytest.raises(FrozenInstanceError):
+        option.price = 0
+
+
+def test_older_catalogs_are_not_published(db_session):
+    version = CatalogVersion()
+    store = CatalogStore(version=version)
+    catalog = store.get(PricingOrderRepository(db_session), 1)
+
+    store.publish(replace(catalog, version=catalog.version - 1))
+
+    assert store.get(PricingOrderRepository(db_session), 1) is catalog
+
+
+def test_memory_footprint(db_session):
+    store = CatalogStore(version=CatalogVersion())
+    catalog = store.get(PricingOrderRepository(db_session), 1)
+
+    assert catalog.memory_bytes > 0
+    assert store.memory_bytes == catalog.memory_bytes
+
+    smaller = replace(catalog, version=catalog.version + 1, price_rules=())
+    store.publish(smaller)
+    assert store.memory_bytes == smaller.memory_bytes
+
+    store.discard(1)
+    assert store.memory_bytes == 0
+
+
+def test_services_accept_records(db_session):
+    catalog = ProductCatalog.from_snapshot(
+        PricingOrderRepository(db_session).load_catalog(1), 0
+    )
+    selector = PartSelectionService()
+    selector.load_model(compile_catalog(selector, catalog))
+    by_id = {option.id: option for option in catalog.options}
+    selection = [by_id[1], by_id[4], by_id[7]]
+
+    selector.select_part_options(selection)
+
+    assert selector.is_selection_valid()
+    assert (
+        PriceService().calculate_indexed_price(
+            selection, PriceIndex(catalog.price_rules)
+        )
+        == 260
+    )
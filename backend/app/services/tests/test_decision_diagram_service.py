@@ -0,0 +1,125 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from backend.app.models.product import Option, Part
+from backend.app.services.decision_diagram_service import (
+    DecisionDiagram,
+    DecisionDiagramSelectionService,
+)
+from backend.app.services.selection_service import PartSelectionService, SolverModel
+
+
+@pytest.fixture
+def catalog():
+    parts = [Part(id=part_id) for part_id in range(1, 5)]
+    options = [
+        Option(id=1, part_id=1, name="Full-suspension"),
+        Option(id=2, part_id=1, name="Diamond"),
+        Option(id=3, part_id=2, name="Road wheels"),
+        Option(id=4, part_id=2, name="Mountain wheels"),
+        Option(id=5, part_id=2, name="Fat bike wheels"),
+        Option(id=6, part_id=3, name="Red"),
+        Option(id=7, part_id=3, name="Black"),
+        Option(id=8, part_id=4, name="Single-speed chain"),
+        Option(id=9, part_id=4, name="8-speed chain"),
+    ]
+    grouped_compatibilities = {
+        1: {"compatible": [4], "incompatible": []},
+        2: {"compatible": [3], "incompatible": []},
+        5: {"compatible": [7], "incompatible": []},
+    }
+
+    return parts, options, grouped_compatibilities
+
+
+def test_compiles_reduced_diagram(catalog):
+    service = DecisionDiagramSelectionService()
+    model = service.compile_model(*catalog)
+
+    assert isinstance(model, DecisionDiagram)
+    # The chain is free, so every configuration shares the last level node
+    assert len(model.layers[-1]) == 1
+    assert model.node_count < 9
+    assert model.memory_bytes > 0
+
+
+def test_available_options_follow_selection(catalog):
+    parts, options, grouped_compatibilities = catalog
+    service = DecisionDiagramSelectionService()
+    service.load_compatibilities(parts, options, grouped_compatibilities)
+
+    # Both frames need road or mountain wheels, so fat bike wheels never fit
+    assert service.get_available_options() == {
+        1: [1, 2],
+        2: [3, 4],
+        3: [6, 7],
+        4: [8, 9],
+    }
+
+    service.select_part_options([options[0]])
+
+    assert service.is_selection_valid()
+    assert service.get_available_options(parts) == {
+        1: [1],
+        2: [4],
+        3: [6, 7],
+        4: [8, 9],
+    }
+
+
+def test_invalid_selection(catalog):
+    parts, options, grouped_compatibilities = catalog
+    service = DecisionDiagramSelectionService()
+    service.load_compatibilities(parts, options, grouped_compatibilities)
+
+    service.select_part_options([options[0], options[4]])
+
+    assert not service.is_selection_valid()
+    assert service.get_available_options() == {1: [], 2: [], 3: [], 4: []}
+
+
+def test_falls_back_to_solver_over_budget(catalog):
+    parts, options, grouped_compatibilities = catalog
+    service = DecisionDiagramSelectionService(max_nodes=2)
+
+    model = service.compile_model(parts, options, grouped_compatibilities)
+    service.load_model(model)
+    service.select_part_options([options[0]])
+
+    assert isinstance(model, SolverModel)
+    assert service.get_available_options()[2] == [4]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_solver_backend(seed):
+    rng = random.Random(seed)
+    parts = [Part(id=part_id) for part_id in range(1, rng.randint(3, 7))]
+    options = [
+        Option(id=part.id * 10 + index, part_id=part.id)
+        for part in parts
+        for index in range(rng.randint(1, 4))
+    ]
+    grouped_compatibilities = defaultdict(
+        lambda: {"compatible": [], "incompatible": []}
+    )
+
+    for _ in range(rng.randint(0, 10)):
+        option1, option2 = rng.sample(options, 2)
+        kind = rng.choice(["compatible", "incompatible"])
+        grouped_compatibilities[option1.id][kind].append(option2.id)
+
+    selection = rng.sample(options, rng.randint(0, 2))
+    services = [PartSelectionService(), DecisionDiagramSelectionService()]
+
+    for service in services:
+        service.load_compatibilities(parts, options, grouped_compatibilities)
+        service.select_part_options(selection)
+
+    solver_service, diagram_service = services
+
+    assert diagram_service.is_selection_valid() == solver_service.is_selection_valid()
+    assert diagram_service.get_available_options() == (
+        solver_service.get_available_options()
+    )
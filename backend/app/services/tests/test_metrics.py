@@ -0,0 +1,69 @@
+from backend.app.services.metrics import (
+    Histogram,
+    StageMetrics,
+    render_counters,
+    render_gauges,
+)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert histogram.sum == 2.65
+
+
+def test_stage_timings_are_labelled_by_stage_and_product():
+    metrics = StageMetrics(buckets=(1.0,))
+
+    with metrics.timed("calculate_price", 1):
+        pass
+
+    metrics.observe("calculate_price", 1, 2.0)
+    metrics.observe("load_catalog", 2, 0.5)
+
+    snapshot = metrics.snapshot()
+    assert snapshot[("calculate_price", 1)]["count"] == 2
+    assert snapshot[("calculate_price", 1)]["buckets"] == [("1.0", 1), ("+Inf", 2)]
+
+    lines = metrics.render()
+    assert "# TYPE order_stage_duration_seconds histogram" in lines
+    assert (
+        'order_stage_duration_seconds_bucket{stage="load_catalog",product_id="2",'
+        'le="1.0"} 1'
+    ) in lines
+    assert (
+        'order_stage_duration_seconds_count{stage="calculate_price",product_id="1"} 2'
+    ) in lines
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = StageMetrics(enabled=False)
+
+    with metrics.timed("calculate_price", 1):
+        pass
+
+    assert metrics.timed("load_catalog", 1) is metrics.timed("repository", 2)
+    assert metrics.snapshot() == {}
+
+
+def test_render_gauges():
+    assert render_gauges("solver_pool", {"workers": 4}, "Solver pool activity.") == [
+        "# HELP solver_pool_workers Solver pool activity.",
+        "# TYPE solver_pool_workers gauge",
+        "solver_pool_workers 4",
+    ]
+
+
+def test_render_counters():
+    assert render_counters(
+        "solver_pool", {"submitted": 3}, "Solver pool activity."
+    ) == [
+        "# HELP solver_pool_submitted_total Solver pool activity.",
+        "# TYPE solver_pool_submitted_total counter",
+        "solver_pool_submitted_total 3",
+    ]
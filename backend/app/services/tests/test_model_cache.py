@@ -0,0 +1,183 @@
+import pytest
+
+from backend.app.models.catalog_version import (
+    GLOBAL_VERSION_KEY,
+    CatalogVersion,
+    CatalogVersionRecord,
+    catalog_version,
+)
+from backend.app.models.product import Option, Order, Product
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.model_cache import VersionedLRUCache
+from backend.app.services.order_service import CartOrderService
+from backend.app.services.price_service import PriceService
+from backend.app.services.selection_service import PartSelectionService
+
+
+@pytest.fixture
+def db_session(frame_and_wheels_session):
+    return frame_and_wheels_session
+
+
+class CountingSelectionService(PartSelectionService):
+    compiled = 0
+
+    def compile_model(self, parts, options, grouped_compatibilities):
+        CountingSelectionService.compiled += 1
+        return super().compile_model(parts, options, grouped_compatibilities)
+
+
+@pytest.fixture
+def order_service_factory(db_session):
+    cache = VersionedLRUCache(maxsize=8)
+    CountingSelectionService.compiled = 0
+
+    def factory():
+        return CartOrderService(
+            PricingOrderRepository(db_session),
+            CountingSelectionService(),
+            PriceService(),
+            model_cache=cache,
+        )
+
+    return factory
+
+
+def test_cache_returns_entry_for_current_version():
+    version = CatalogVersion()
+    cache = VersionedLRUCache(maxsize=2, version=version)
+
+    first = cache.get_or_build((1, "model"), lambda: object())
+    second = cache.get_or_build((1, "model"), lambda: object())
+
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    version.bump()
+
+    assert cache.get_or_build((1, "model"), lambda: object()) is not first
+
+
+def test_cache_evicts_least_recently_used():
+    cache = VersionedLRUCache(maxsize=2, version=CatalogVersion())
+
+    cache.set((1, "model"), "one")
+    cache.set((2, "model"), "two")
+    cache.get((1, "model"))
+    cache.set((3, "model"), "three")
+
+    assert cache.get((2, "model")) is None
+    assert cache.get((1, "model")) == "one"
+    assert len(cache) == 2
+
+
+def test_cache_keeps_entries_of_unchanged_products():
+    version = CatalogVersion()
+    cache = VersionedLRUCache(maxsize=4, version=version)
+
+    cache.set((1, "model"), "one")
+    cache.set((2, "model"), "two")
+    version.bump([1])
+
+    assert cache.get((1, "model")) is None
+    assert cache.get((2, "model")) == "two"
+
+
+def test_cache_invalidates_product():
+    cache = VersionedLRUCache(maxsize=4, version=CatalogVersion())
+
+    cache.set((1, "model"), "one")
+    cache.set((2, "model"), "two")
+    cache.invalidate(1)
+
+    assert cache.get((1, "model")) is None
+    assert cache.get((2, "model")) == "two"
+
+
+def test_catalog_changes_bump_version(db_session):
+    version = catalog_version.value
+
+    option = db_session.get(Option, 3)
+    option.in_stock = False
+    db_session.commit()
+
+    assert catalog_version.value == version + 1
+
+
+def test_order_changes_do_not_bump_version(db_session):
+    version = catalog_version.value
+
+    order = Order(product_id=1, total_price=0)
+    order.options.append(db_session.get(Option, 1))
+    db_session.add(order)
+    db_session.commit()
+
+    assert catalog_version.value == version
+
+
+def persisted_versions(db_session) -> dict[int, int]:
+    return {
+        record.product_id: record.version
+        for record in db_session.query(CatalogVersionRecord)
+    }
+
+
+def test_catalog_changes_are_persisted_per_product(db_session):
+    before = persisted_versions(db_session)
+
+    db_session.delete(db_session.get(Option, 3))
+    db_session.commit()
+
+    after = persisted_versions(db_session)
+    assert after[GLOBAL_VERSION_KEY] == before[GLOBAL_VERSION_KEY] + 1
+    assert after[1] == before[1] + 1
+
+
+def test_rolled_back_changes_are_not_persisted(db_session):
+    before = persisted_versions(db_session)
+    version = catalog_version.value
+
+    db_session.get(Option, 3).in_stock = False
+    db_session.flush()
+    db_session.rollback()
+
+    assert persisted_versions(db_session) == before
+    assert catalog_version.value == version
+
+
+def test_sync_picks_up_changes_of_other_processes(db_session):
+    version = CatalogVersion()
+    version.sync(db_session.connection())
+    synced = version.value
+
+    assert version.sync(db_session.connection()) == synced
+
+    db_session.get(Option, 3).in_stock = False
+    db_session.commit()
+
+    assert version.sync(db_session.connection()) == synced + 1
+    assert version.of(1) == synced + 1
+    assert version.of(2) < synced + 1
+
+
+def test_orders_reuse_compiled_model(order_service_factory, db_session):
+    product = db_session.get(Product, 1)
+
+    order_service_factory().create_order(product)
+    response = order_service_factory().create_order(product)
+
+    assert CountingSelectionService.compiled == 1
+    assert response.available_options == {1: [1, 2], 2: [3, 4]}
+
+
+def test_orders_rebuild_model_after_catalog_change(order_service_factory, db_session):
+    product = db_session.get(Product, 1)
+    order_service_factory().create_order(product)
+
+    db_session.get(Option, 4).in_stock = False
+    db_session.commit()
+
+    response = order_service_factory().create_order(product)
+
+    assert CountingSelectionService.compiled == 2
+    assert response.available_options == {1: [2], 2: [3]}
@@ -0,0 +1,101 @@
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.product import Option, Order, Part, Product
+from backend.app.repositories.order_export_repository import OrderExportRepository
+from backend.app.services.order_export_service import OrderExportService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    session.add(Product(id=1, name="Test Bike"))
+    session.add(Part(id=1, name="Frame", product_id=1))
+    options = [
+        Option(id=option_id, name=f"Option {option_id}", price=10, part_id=1)
+        for option_id in (1, 2, 3)
+    ]
+    session.add_all(options)
+    session.add_all(
+        [
+            Order(
+                id=1,
+                product_id=1,
+                customer_id=7,
+                total_price=Decimal("20.00"),
+                order_date=datetime(2026, 1, 1),
+                options=[options[0], options[1]],
+            ),
+            Order(
+                id=2,
+                product_id=1,
+                total_price=Decimal("0.00"),
+                order_date=datetime(2026, 2, 1),
+            ),
+            Order(
+                id=3,
+                product_id=1,
+                total_price=Decimal("10.00"),
+                order_date=datetime(2026, 3, 1),
+                options=[options[2]],
+            ),
+        ]
+    )
+    session.commit()
+
+    yield session
+
+    session.close()
+
+
+def export_service(db_session) -> OrderExportService:
+    return OrderExportService(OrderExportRepository(db_session))
+
+
+def test_ndjson_has_one_line_per_order_with_its_options(db_session):
+    orders = [json.loads(line) for line in export_service(db_session).ndjson()]
+
+    assert orders[0] == {
+        "id": 1,
+        "customer_id": 7,
+        "order_date": "2026-01-01T00:00:00",
+        "total_price": "20.00",
+        "product_id": 1,
+        "option_ids": [1, 2],
+    }
+    assert [order["option_ids"] for order in orders] == [[1, 2], [], [3]]
+
+
+def test_since_filters_on_order_date(db_session):
+    orders = list(export_service(db_session).iter_orders(since=datetime(2026, 2, 1)))
+
+    assert [order["id"] for order in orders] == [2, 3]
+
+
+def test_csv_export(db_session):
+    rows = list(csv.DictReader("".join(export_service(db_session).csv()).splitlines()))
+
+    assert [row["option_ids"] for row in rows] == ["1;2", "", "3"]
+    assert rows[1]["customer_id"] == ""
+    assert rows[2]["total_price"] == "10.00"
+
+
+def test_export_is_streamed_from_a_single_query(db_session, query_budget):
+    with query_budget(1, db_session.get_bind()) as stats:
+        orders = export_service(db_session).iter_orders()
+        first = next(orders)
+
+        assert first["id"] == 1
+        assert stats.count == 1
+        assert len(list(orders)) == 2
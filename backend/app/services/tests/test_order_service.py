@@ -0,0 +1,253 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.catalog_version import CatalogVersion
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Order,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.catalog_store import CatalogStore
+from backend.app.services.metrics import StageMetrics
+from backend.app.services.model_cache import VersionedLRUCache
+from backend.app.services.order_service import CartOrderService, OrderConfigurator
+from backend.app.services.order_sessions import OrderSessionStore
+from backend.app.services.price_service import PriceService
+from backend.app.services.selection_service import PartSelectionService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    # Create test data
+    product = Product(id=1, name="Test Bike")
+    session.add(product)
+
+    parts = [
+        Part(id=1, name="Frame", product_id=1),
+        Part(id=2, name="Wheels", product_id=1),
+        Part(id=3, name="Rim color", product_id=1),
+    ]
+    session.add_all(parts)
+
+    options = [
+        Option(id=1, part_id=1, name="Full-suspension", price=130),
+        Option(id=2, part_id=1, name="Diamond", price=100),
+        Option(id=3, part_id=2, name="Road wheels", price=80),
+        Option(id=4, part_id=2, name="Mountain wheels", price=100),
+        Option(id=6, part_id=3, name="Red", price=20),
+        Option(id=7, part_id=3, name="Black", price=20),
+    ]
+    session.add_all(options)
+
+    rule = PriceRule(id=1, option_id=7, price=30)
+    session.add(rule)
+    conditions = [
+        PriceRuleCondition(price_rule_id=1, option_id=1),
+        PriceRuleCondition(price_rule_id=1, option_id=4),
+    ]
+    session.add_all(conditions)
+
+    compatibilities = [
+        OptionCompatibility(option1_id=1, option2_id=4, compatible=True),
+    ]
+    session.add_all(compatibilities)
+
+    session.commit()
+
+    yield session
+
+    session.close()
+
+
+class WriteRecorder:
+    """Commits and data-changing statements issued through a session."""
+
+    def __init__(self, session):
+        self.session = session
+        self.commits = 0
+        self.writes: list[str] = []
+
+    def __enter__(self):
+        event.listen(self.session, "after_commit", self._commit)
+        event.listen(self.session.get_bind(), "before_cursor_execute", self._execute)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(self.session, "after_commit", self._commit)
+        event.remove(self.session.get_bind(), "before_cursor_execute", self._execute)
+
+    def _commit(self, session):
+        self.commits += 1
+
+    def _execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.split(None, 1)[0].upper() in ("INSERT", "UPDATE", "DELETE"):
+            self.writes.append(statement)
+
+
+@pytest.fixture
+def order_service(db_session):
+    version = CatalogVersion()
+
+    return CartOrderService(
+        PricingOrderRepository(db_session),
+        PartSelectionService(),
+        PriceService(),
+        model_cache=VersionedLRUCache(maxsize=8, version=version),
+        sessions=OrderSessionStore(ttl=60, max_sessions=10, version=version),
+        quote_cache=VersionedLRUCache(maxsize=8, version=version),
+        catalogs=CatalogStore(version=version),
+        metrics=StageMetrics(),
+    )
+
+
+def test_create_order_commits_once(order_service, db_session):
+    with WriteRecorder(db_session) as recorder:
+        response = order_service.create_order(db_session.get(Product, 1))
+
+    assert recorder.commits == 1
+    assert len(recorder.writes) == 1
+    assert db_session.get(Order, response.id).total_price == 0
+
+
+def test_update_order_commits_once_with_total(order_service, db_session):
+    order_id = order_service.create_order(db_session.get(Product, 1)).id
+    order = db_session.get(Order, order_id)
+    order_service.update_order(order, db_session.get(Option, 1))
+    order_service.update_order(order, db_session.get(Option, 4))
+
+    with WriteRecorder(db_session) as recorder:
+        response = order_service.update_order(order, db_session.get(Option, 7))
+
+    assert recorder.commits == 1
+    assert response.total_price == 260
+    assert db_session.get(Order, order_id).total_price == 260
+    assert [option.id for option in order.options] == [1, 4, 7]
+
+
+def test_rejected_option_never_writes(order_service, db_session):
+    order_id = order_service.create_order(db_session.get(Product, 1)).id
+    order = db_session.get(Order, order_id)
+    order_service.update_order(order, db_session.get(Option, 1))
+
+    with WriteRecorder(db_session) as recorder:
+        with pytest.raises(ValueError):
+            order_service.update_order(order, db_session.get(Option, 3))
+
+    assert recorder.commits == 0
+    assert recorder.writes == []
+    assert [option.id for option in order.options] == [1]
+
+
+def test_update_order_times_every_stage(order_service, db_session):
+    order_id = order_service.create_order(db_session.get(Product, 1)).id
+    order_service.update_order(
+        db_session.get(Order, order_id), db_session.get(Option, 1)
+    )
+
+    counts = {
+        stage: values["count"]
+        for (stage, product_id), values in order_service.metrics.snapshot().items()
+        if product_id == 1
+    }
+
+    assert counts == {
+        "load_catalog": 2,
+        "load_model": 1,
+        "get_available_options": 2,
+        "select_part_options": 1,
+        "calculate_price": 1,
+        "repository": 2,
+    }
+
+
+def test_update_order_query_budget(order_service, db_session, query_budget):
+    order_id = order_service.create_order(db_session.get(Product, 1)).id
+    order = db_session.get(Order, order_id)
+    order_service.update_order(order, db_session.get(Option, 1))
+
+    option = db_session.get(Option, 4)
+
+    # The catalog and the selection session are reused: the expired order
+    # and its options are reloaded, then written, whatever the catalog size
+    with query_budget(4, db_session.get_bind()):
+        order_service.update_order(order, option)
+
+
+def test_selected_option_out_of_stock_is_rejected(order_service, db_session):
+    order_id = order_service.create_order(db_session.get(Product, 1)).id
+    order = db_session.get(Order, order_id)
+    order_service.update_order(order, db_session.get(Option, 1))
+
+    db_session.get(Option, 1).in_stock = False
+    db_session.commit()
+    order_service.catalogs.version.bump()
+
+    with pytest.raises(ValueError, match="no longer available: 1"):
+        order_service.update_order(order, db_session.get(Option, 3))
+
+    assert [option.id for option in order.options] == [1]
+
+
+def test_concurrent_orders_share_cached_models(db_session):
+    version = CatalogVersion()
+    model_cache = VersionedLRUCache(maxsize=8, version=version)
+    sessions = OrderSessionStore(ttl=60, max_sessions=1000, version=version)
+    quote_cache = VersionedLRUCache(maxsize=64, version=version)
+    catalog = CatalogStore(version=version).get(PricingOrderRepository(db_session), 1)
+    options = {option.id: option for option in catalog.options}
+    errors = []
+
+    def configurator() -> OrderConfigurator:
+        # One per request, like the routes do
+        return OrderConfigurator(
+            PartSelectionService(),
+            PriceService(),
+            model_cache,
+            sessions,
+            quote_cache,
+            metrics=StageMetrics(enabled=False),
+        )
+
+    def place_orders(first_order_id: int):
+        try:
+            for order_id in range(first_order_id, first_order_id + 20):
+                sessions.checkin(order_id, configurator().start_selection(catalog))
+                selected = []
+
+                for option_id in (1, 4, 7):
+                    session, total_price, _ = configurator().add_option(
+                        catalog, order_id, selected, options[option_id]
+                    )
+                    sessions.checkin(order_id, session)
+                    selected.append(options[option_id])
+
+                assert total_price == 260
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=place_orders, args=(index * 1000,))
+        for index in range(8)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
@@ -0,0 +1,156 @@
+import pytest
+
+from backend.app.models.catalog_version import CatalogVersion
+from backend.app.models.product import Option, Order, Product
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.model_cache import VersionedLRUCache
+from backend.app.services.order_service import CartOrderService
+from backend.app.services.order_sessions import OrderSession, OrderSessionStore
+from backend.app.services.price_service import PriceService
+from backend.app.services.selection_service import PartSelectionService
+
+
+@pytest.fixture
+def db_session(frame_and_wheels_session):
+    return frame_and_wheels_session
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingSelectionService(PartSelectionService):
+    loaded = 0
+
+    def load_model(self, model):
+        CountingSelectionService.loaded += 1
+        super().load_model(model)
+
+
+@pytest.fixture
+def sessions():
+    return OrderSessionStore(ttl=60, max_sessions=10)
+
+
+@pytest.fixture
+def order_service_factory(db_session, sessions):
+    cache = VersionedLRUCache(maxsize=8)
+    CountingSelectionService.loaded = 0
+
+    def factory():
+        return CartOrderService(
+            PricingOrderRepository(db_session),
+            CountingSelectionService(),
+            PriceService(),
+            model_cache=cache,
+            sessions=sessions,
+        )
+
+    return factory
+
+
+def make_session(version: CatalogVersion) -> OrderSession:
+    return OrderSession(PartSelectionService(), 1, (), version.of(1))
+
+
+def test_checkout_returns_session_once():
+    version = CatalogVersion()
+    store = OrderSessionStore(ttl=60, max_sessions=10, version=version)
+    session = make_session(version)
+
+    store.checkin(1, session)
+
+    assert store.checkout(1) is session
+    assert store.checkout(1) is None
+
+
+def test_expired_sessions_are_dropped():
+    version = CatalogVersion()
+    clock = Clock()
+    store = OrderSessionStore(ttl=60, max_sessions=10, version=version, clock=clock)
+
+    store.checkin(1, make_session(version))
+    clock.now = 61
+
+    assert store.checkout(1) is None
+
+
+def test_sessions_over_the_cap_are_evicted():
+    version = CatalogVersion()
+    store = OrderSessionStore(ttl=60, max_sessions=2, version=version)
+
+    for order_id in range(1, 4):
+        store.checkin(order_id, make_session(version))
+
+    assert len(store) == 2
+    assert store.checkout(1) is None
+    assert store.checkout(3) is not None
+
+
+def test_sessions_are_stale_after_catalog_change():
+    version = CatalogVersion()
+    store = OrderSessionStore(ttl=60, max_sessions=10, version=version)
+
+    store.checkin(1, make_session(version))
+    version.bump()
+
+    assert store.checkout(1) is None
+
+
+def test_sessions_survive_changes_to_other_products():
+    version = CatalogVersion()
+    store = OrderSessionStore(ttl=60, max_sessions=10, version=version)
+    session = make_session(version)
+
+    store.checkin(1, session)
+    version.bump([2])
+
+    assert store.checkout(1) is session
+
+
+def test_update_order_reuses_session(order_service_factory, db_session):
+    product = db_session.get(Product, 1)
+    order_id = order_service_factory().create_order(product).id
+
+    order = db_session.get(Order, order_id)
+    order_service_factory().update_order(order, db_session.get(Option, 1))
+    response = order_service_factory().update_order(order, db_session.get(Option, 4))
+
+    assert CountingSelectionService.loaded == 1
+    assert response.total_price == 230
+    assert response.available_options == {1: [1], 2: [4]}
+
+
+def test_update_order_rebuilds_missing_session(
+    order_service_factory, sessions, db_session
+):
+    product = db_session.get(Product, 1)
+    order_id = order_service_factory().create_order(product).id
+    order = db_session.get(Order, order_id)
+    order_service_factory().update_order(order, db_session.get(Option, 1))
+
+    sessions.discard(order_id)
+    response = order_service_factory().update_order(order, db_session.get(Option, 4))
+
+    assert CountingSelectionService.loaded == 2
+    assert response.available_options == {1: [1], 2: [4]}
+
+
+def test_invalid_option_keeps_session_usable(order_service_factory, db_session):
+    product = db_session.get(Product, 1)
+    order_id = order_service_factory().create_order(product).id
+    order = db_session.get(Order, order_id)
+    order_service_factory().update_order(order, db_session.get(Option, 1))
+
+    with pytest.raises(ValueError):
+        order_service_factory().update_order(order, db_session.get(Option, 3))
+
+    response = order_service_factory().update_order(order, db_session.get(Option, 4))
+
+    assert CountingSelectionService.loaded == 1
+    assert [option.id for option in order.options] == [1, 4]
+    assert response.available_options == {1: [1], 2: [4]}
@@ -0,0 +1,171 @@
+import time
+
+import pytest
+
+from backend.app.models.product import Option, Part
+from backend.app.services.pooled_selection_service import PooledSelectionService
+from backend.app.services.selection_backends import create_selection_service
+from backend.app.services.solver_pool import (
+    SolverPool,
+    SolverPoolBusy,
+    SolverTimeout,
+)
+
+
+@pytest.fixture
+def catalog():
+    parts = [Part(id=part_id) for part_id in range(1, 5)]
+    options = [
+        Option(id=1, part_id=1, name="Full-suspension"),
+        Option(id=2, part_id=1, name="Diamond"),
+        Option(id=3, part_id=2, name="Road wheels"),
+        Option(id=4, part_id=2, name="Mountain wheels"),
+        Option(id=5, part_id=2, name="Fat bike wheels"),
+        Option(id=6, part_id=3, name="Red"),
+        Option(id=7, part_id=3, name="Black"),
+        Option(id=8, part_id=4, name="Single-speed chain"),
+        Option(id=9, part_id=4, name="8-speed chain"),
+    ]
+    grouped_compatibilities = {
+        1: {"compatible": [4], "incompatible": []},
+        2: {"compatible": [3], "incompatible": []},
+        5: {"compatible": [7], "incompatible": []},
+    }
+
+    return parts, options, grouped_compatibilities
+
+
+def wait_until(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+
+        time.sleep(0.01)
+
+    return True
+
+
+@pytest.fixture
+def pool():
+    pool = SolverPool(max_workers=1, timeout=30)
+    yield pool
+    pool.shutdown()
+
+
+def test_create_selection_service_in_process_mode():
+    service = create_selection_service("bitset", execution="process")
+
+    assert isinstance(service, PooledSelectionService)
+    assert service.backend == "bitset"
+
+
+def test_matches_inline_backend(catalog, pool):
+    parts, options, grouped_compatibilities = catalog
+    pooled = PooledSelectionService("z3", pool)
+    inline = create_selection_service("z3")
+
+    for service in (pooled, inline):
+        service.load_compatibilities(parts, options, grouped_compatibilities)
+        service.select_part_options([options[0]])
+
+    assert pooled.is_selection_valid()
+    assert pooled.get_available_options() == inline.get_available_options()
+    # Validity and availability of one selection share a single task
+    assert pool.metrics()["submitted"] == 1
+
+    pooled.push()
+    pooled.select_part_options([options[4]])
+
+    assert not pooled.is_selection_valid()
+
+    pooled.pop()
+
+    assert pooled.is_selection_valid()
+    # Done callbacks may run after result() returns
+    assert wait_until(lambda: pool.queue_depth == 0)
+
+
+def test_warm_start_compiles_models_in_workers(catalog, pool):
+    parts, options, grouped_compatibilities = catalog
+    service = PooledSelectionService("bitset", pool)
+    payload = service.compile_model(parts, options, grouped_compatibilities)
+
+    pool.start("bitset", [payload])
+    service.load_model(payload)
+
+    assert service.get_available_options(parts[:1]) == {1: [1, 2]}
+
+
+def test_timeout_raises(pool):
+    pool.timeout = 0.01
+
+    with pytest.raises(SolverTimeout):
+        pool.result(pool.submit(time.sleep, 1))
+
+    assert pool.metrics()["timeouts"] == 1
+
+
+def test_batch_shares_one_deadline(pool):
+    pool.submit(time.sleep, 0).result()
+    pool.timeout = 0.8
+    futures = [pool.submit(time.sleep, 0.5) for _ in range(3)]
+    start = time.monotonic()
+
+    # One worker needs 1.5s, each task alone would fit in the timeout
+    with pytest.raises(SolverTimeout):
+        pool.gather(futures)
+
+    assert time.monotonic() - start < 1.2
+
+
+def test_stuck_worker_is_recycled(pool):
+    pool.submit(time.sleep, 0).result()
+    pool.timeout = 0.2
+    stuck = pool.submit(time.sleep, 30)
+
+    with pytest.raises(SolverTimeout):
+        pool.result(stuck)
+
+    assert pool.metrics()["restarts"] == 1
+    assert wait_until(lambda: pool.queue_depth == 0)
+
+    # A new worker takes over right away
+    pool.timeout = 30
+    assert pool.result(pool.submit(sum, [1, 2])) == 3
+
+
+def test_rejected_batch_abandons_its_submitted_chunks(catalog, pool, monkeypatch):
+    parts, options, grouped_compatibilities = catalog
+    payload = PooledSelectionService("bitset", pool).compile_model(
+        parts, options, grouped_compatibilities
+    )
+    pool.submit(time.sleep, 0).result()
+    pool.submit(time.sleep, 1.5)
+    pool.max_queue = 3
+    submitted = []
+    submit = pool.submit
+
+    def recording_submit(*args):
+        future = submit(*args)
+        submitted.append(future)
+        return future
+
+    monkeypatch.setattr(pool, "submit", recording_submit)
+
+    # Four chunks, the third one finds the queue full
+    with pytest.raises(SolverPoolBusy):
+        pool.evaluate_selections("bitset", payload, [[1]] * 8)
+
+    assert len(submitted) == 2
+    assert wait_until(lambda: all(future.done() for future in submitted), 0.5)
+
+
+def test_full_queue_rejects_tasks():
+    pool = SolverPool(max_workers=1, max_queue=0)
+
+    with pytest.raises(SolverPoolBusy):
+        pool.submit(time.sleep, 0)
+
+    assert pool.metrics()["rejected"] == 1
@@ -12,7 +12,11 @@ from backend.app.models.product import (
     PriceRuleCondition,
     Product,
 )
-from backend.app.services.price_service import PriceService
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.model_cache import VersionedLRUCache
+from backend.app.services.order_service import CartOrderService
+from backend.app.services.price_service import PriceIndex, PriceService
+from backend.app.services.selection_service import PartSelectionService
 
 
 @pytest.fixture(scope="function")
@@ -119,3 +123,122 @@ def test_price_rule_application(price_service, db_session):
 
     total_price = price_service.calculate_price(order.options, price_rules)
     assert total_price == 230  # 130 + 80 + 20 (no price rule applied)
+
+
+def test_get_price_rules_by_product(db_session):
+    db_session.add(Product(id=2, name="Other Bike"))
+    db_session.add(Part(id=5, name="Frame", product_id=2))
+    db_session.add(Option(id=10, part_id=5, name="Steel", price=90))
+    db_session.add(PriceRule(id=2, option_id=10, price=80))
+    db_session.commit()
+
+    repository = PricingOrderRepository(db_session)
+
+    assert [rule.id for rule in repository.get_price_rules(1)] == [1]
+    assert [rule.id for rule in repository.get_price_rules(2)] == [2]
+
+
+def test_most_specific_rule_wins(price_service, db_session):
+    db_session.add_all(
+        [
+            PriceRule(id=2, option_id=7, price=25),
+            PriceRuleCondition(price_rule_id=2, option_id=1),
+            PriceRule(id=3, option_id=7, price=28),
+            PriceRuleCondition(price_rule_id=3, option_id=4),
+        ]
+    )
+    db_session.commit()
+
+    index = PriceIndex(PricingOrderRepository(db_session).get_price_rules(1))
+    full_suspension, mountain_wheels, black_rim = (
+        db_session.get(Option, option_id) for option_id in (1, 4, 7)
+    )
+
+    # Both single condition rules match, the lowest id breaks the tie
+    assert index.get_price(black_rim, {1, 4, 7}) == 30
+    assert index.get_price(black_rim, {1, 7}) == 25
+    assert index.get_price(black_rim, {4, 7}) == 28
+    assert index.get_price(black_rim, {7}) == 20
+    assert (
+        price_service.calculate_indexed_price(
+            [full_suspension, mountain_wheels, black_rim], index
+        )
+        == 260
+    )
+
+
+def test_indexed_price_matches_rule_list(price_service, db_session):
+    rules = db_session.query(PriceRule).all()
+    index = PriceIndex(rules)
+    options = db_session.query(Option).all()
+
+    for selection in ([1, 4, 7], [1, 3, 7], [2, 4, 6, 9], [7]):
+        selected = [option for option in options if option.id in selection]
+
+        assert price_service.calculate_indexed_price(
+            selected, index
+        ) == price_service.calculate_price(selected, rules)
+
+
+class CountingPriceService(PriceService):
+    def __init__(self):
+        self.calls = 0
+
+    def calculate_indexed_price(self, options, index):
+        self.calls += 1
+        return super().calculate_indexed_price(options, index)
+
+
+@pytest.fixture
+def quote_cache():
+    return VersionedLRUCache(maxsize=8)
+
+
+def configure(db_session, price_service, quote_cache, option_ids):
+    order_service = CartOrderService(
+        PricingOrderRepository(db_session),
+        PartSelectionService(),
+        price_service,
+        model_cache=VersionedLRUCache(maxsize=8),
+        quote_cache=quote_cache,
+    )
+    order_id = order_service.create_order(db_session.get(Product, 1)).id
+    order = db_session.get(Order, order_id)
+    response = None
+
+    for option_id in option_ids:
+        response = order_service.update_order(order, db_session.get(Option, option_id))
+
+    return response
+
+
+def test_quotes_are_shared_between_orders(db_session, quote_cache):
+    price_service = CountingPriceService()
+
+    first = configure(db_session, price_service, quote_cache, [1, 4, 7])
+    calls = price_service.calls
+    second = configure(db_session, price_service, quote_cache, [1, 4, 7])
+
+    assert first.total_price == second.total_price == 260
+    assert price_service.calls == calls
+    assert quote_cache.hits == 3
+
+
+def test_quotes_are_invalidated_by_price_changes(db_session, quote_cache):
+    price_service = CountingPriceService()
+
+    configure(db_session, price_service, quote_cache, [1, 4, 7])
+
+    db_session.get(PriceRule, 1).price = 35
+    db_session.commit()
+
+    assert (
+        configure(db_session, price_service, quote_cache, [1, 4, 7]).total_price == 265
+    )
+
+    db_session.get(Option, 1).price = 140
+    db_session.commit()
+
+    assert (
+        configure(db_session, price_service, quote_cache, [1, 4, 7]).total_price == 275
+    )
@@ -0,0 +1,241 @@
+import threading
+from decimal import Decimal
+from itertools import product as cartesian_product
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from z3 import main_ctx
+
+from backend.app.models import Base
+from backend.app.models.catalog_version import CatalogVersion
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.price_service import PriceIndex, PriceService
+from backend.app.services.price_summary_service import (
+    PriceSummary,
+    PriceSummaryRefresher,
+    PriceSummaryStore,
+    compute_price_summary,
+)
+from backend.app.services.selection_backends import compile_catalog
+from backend.app.services.selection_service import PartSelectionService
+
+
+@pytest.fixture(scope="function")
+def session_factory():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    # Create test data
+    product = Product(id=1, name="Test Bike")
+    session.add(product)
+
+    parts = [
+        Part(id=1, name="Frame", product_id=1),
+        Part(id=2, name="Wheels", product_id=1),
+        Part(id=3, name="Rim color", product_id=1),
+        Part(id=4, name="Chain", product_id=1),
+    ]
+    session.add_all(parts)
+
+    options = [
+        Option(id=1, part_id=1, name="Full-suspension", price=130),
+        Option(id=2, part_id=1, name="Diamond", price=100),
+        Option(id=3, part_id=2, name="Road wheels", price=80),
+        Option(id=4, part_id=2, name="Mountain wheels", price=100),
+        Option(id=5, part_id=2, name="Fat bike wheels", price=120),
+        Option(id=6, part_id=3, name="Red", price=20),
+        Option(id=7, part_id=3, name="Black", price=20),
+        Option(id=8, part_id=4, name="Single-speed chain", price=43),
+        Option(id=9, part_id=4, name="8-speed chain", price=55),
+    ]
+    session.add_all(options)
+
+    rule = PriceRule(id=1, option_id=7, price=30)
+    session.add(rule)
+    conditions = [
+        PriceRuleCondition(price_rule_id=1, option_id=1),
+        PriceRuleCondition(price_rule_id=1, option_id=4),
+    ]
+    session.add_all(conditions)
+
+    # Add compatibility rules
+    compatibilities = [
+        OptionCompatibility(option1_id=1, option2_id=4, compatible=True),
+        OptionCompatibility(option1_id=2, option2_id=3, compatible=True),
+        OptionCompatibility(option1_id=5, option2_id=7, compatible=True),
+    ]
+    session.add_all(compatibilities)
+
+    session.commit()
+    session.close()
+
+    return Session
+
+
+@pytest.fixture
+def db_session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def brute_force_bounds(repository: PricingOrderRepository, product_id: int):
+    parts = repository.get_parts(product_id)
+    options = repository.get_options(product_id)
+    selector = PartSelectionService()
+    selector.load_compatibilities(
+        parts, options, repository.get_compatibilities(product_id)
+    )
+    index = PriceIndex(repository.get_price_rules(product_id))
+    by_id = {option.id: option for option in options}
+    totals = []
+
+    for option_ids in cartesian_product(*selector.part_options.values()):
+        configuration = [by_id[option_id] for option_id in option_ids]
+        selector.push()
+        selector.select_part_options(configuration)
+
+        if selector.is_selection_valid():
+            totals.append(PriceService().calculate_indexed_price(configuration, index))
+
+        selector.pop()
+
+    return min(totals), max(totals)
+
+
+def test_summary_matches_brute_force(db_session):
+    repository = PricingOrderRepository(db_session)
+    store = PriceSummaryStore(version=CatalogVersion())
+
+    assert store.refresh(repository) == [1]
+
+    summary = store.get(1)
+    # Full-suspension + mountain wheels + black rim triggers the rule
+    assert summary == PriceSummary(
+        min_price=Decimal("243.00"), max_price=Decimal("315.00")
+    )
+    assert (summary.min_price, summary.max_price) == brute_force_bounds(repository, 1)
+
+
+def test_unconfigurable_product_has_no_summary(db_session):
+    db_session.add(Product(id=2, name="Empty Bike"))
+    db_session.add(Part(id=5, name="Frame", product_id=2))
+    db_session.commit()
+
+    store = PriceSummaryStore(version=CatalogVersion())
+    store.refresh(PricingOrderRepository(db_session))
+
+    assert store.get(2) is None
+    assert store.get(1) is not None
+
+
+def test_refresh_only_solves_changed_products(db_session):
+    db_session.add(Product(id=2, name="Kids Bike"))
+    db_session.add(Part(id=5, name="Frame", product_id=2))
+    db_session.add(Option(id=10, part_id=5, name="Steel", price=90))
+    db_session.commit()
+
+    repository = PricingOrderRepository(db_session)
+    version = CatalogVersion()
+    store = PriceSummaryStore(version=version)
+
+    version.sync(db_session.connection())
+    assert store.refresh(repository) == [1, 2]
+    assert store.refresh(repository) == []
+
+    db_session.get(Option, 9).in_stock = False
+    db_session.commit()
+
+    version.sync(db_session.connection())
+    assert store.refresh(repository) == [1]
+    assert store.get(1).max_price == Decimal("303.00")
+
+    db_session.get(PriceRule, 1).price = 10
+    db_session.commit()
+
+    version.sync(db_session.connection())
+    assert store.refresh(repository) == [1]
+    assert store.get(1).min_price == Decimal("243.00")
+    assert store.get(2).min_price == Decimal("90.00")
+
+
+def test_summary_solves_in_the_context_of_its_model(db_session):
+    repository = PricingOrderRepository(db_session)
+    catalog = repository.load_catalog(1)
+    model = compile_catalog(PartSelectionService(), catalog)
+
+    # Mixing in a term of the global context would raise a context mismatch
+    assert model.ctx is not main_ctx()
+    summary = compute_price_summary(
+        model, catalog.options, PriceIndex(catalog.price_rules)
+    )
+
+    assert (summary.min_price, summary.max_price) == brute_force_bounds(repository, 1)
+
+
+def test_refresh_runs_alongside_request_solving(db_session):
+    repository = PricingOrderRepository(db_session)
+    model = compile_catalog(PartSelectionService(), repository.load_catalog(1))
+    selector = PartSelectionService()
+    selector.load_model(model)
+    expected = selector.get_available_options()
+    stop = threading.Event()
+    errors = []
+
+    def serve_requests():
+        # What request threads do with a cached model
+        while not stop.is_set():
+            try:
+                selector = PartSelectionService()
+                selector.load_model(model)
+                assert selector.get_available_options() == expected
+            except Exception as e:
+                errors.append(e)
+                return
+
+    thread = threading.Thread(target=serve_requests)
+    thread.start()
+
+    try:
+        version = CatalogVersion()
+        store = PriceSummaryStore(version=version)
+
+        for _ in range(20):
+            version.bump()
+            assert store.refresh(repository) == [1]
+    finally:
+        stop.set()
+        thread.join()
+
+    assert errors == []
+    assert store.get(1) == PriceSummary(
+        min_price=Decimal("243.00"), max_price=Decimal("315.00")
+    )
+
+
+def test_refresher_updates_stale_store(session_factory):
+    version = CatalogVersion()
+    store = PriceSummaryStore(version=version)
+    refresher = PriceSummaryRefresher(store, session_factory, interval=60)
+
+    assert store.is_stale
+
+    refresher.refresh()
+
+    assert not store.is_stale
+    assert store.get(1) is not None
+
+    version.bump()
+
+    assert store.is_stale
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.product import Category, Product
+from backend.app.services.product_service import (
+    ProductService,
+    decode_cursor,
+    encode_cursor,
+    products_statement,
+)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    road = Category(id=1, name="Road")
+    mountain = Category(id=2, name="Mountain")
+    session.add_all([road, mountain])
+    session.add_all(
+        Product(
+            id=product_id,
+            name=f"Bike {product_id}",
+            categories=[road if product_id % 2 else mountain],
+        )
+        for product_id in range(1, 11)
+    )
+    session.commit()
+
+    yield session
+
+    session.close()
+
+
+def crawl(service: ProductService, **filters) -> list[list[int]]:
+    pages = []
+    cursor = None
+
+    while True:
+        products, cursor = service.get_product_page(limit=3, cursor=cursor, **filters)
+        pages.append([product.id for product in products])
+
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages_cover_every_product_once(db_session):
+    pages = crawl(ProductService(db_session))
+
+    assert pages == [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+
+
+def test_last_full_page_has_no_next_cursor(db_session):
+    products, cursor = ProductService(db_session).get_product_page(limit=10)
+
+    assert len(products) == 10
+    assert cursor is None
+
+
+def test_category_filter(db_session):
+    pages = crawl(ProductService(db_session), category_id=1)
+
+    assert pages == [[1, 3, 5], [7, 9]]
+
+
+def test_offset_pagination_still_supported(db_session):
+    products, _ = ProductService(db_session).get_product_page(limit=2, skip=4)
+
+    assert [product.id for product in products] == [5, 6]
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+    for cursor in ("not a cursor", encode_cursor(1)[:-2] + "!!", "e30"):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+
+def test_category_page_seeks_through_index(db_session):
+    statement = products_statement(limit=3, after=4, category_id=1)
+    compiled = statement.compile(db_session.get_bind())
+    plan = " ".join(
+        str(row[-1])
+        for row in db_session.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params.values())
+        )
+    )
+
+    assert "ix_product_categories_category_id_product_id" in plan
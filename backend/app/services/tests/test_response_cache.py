@@ -0,0 +1,42 @@
+import gzip
+
+from backend.app.services.response_cache import GZIP_MIN_SIZE, EncodedResponse
+
+
+def test_small_bodies_are_not_compressed():
+    encoded = EncodedResponse.from_body(b"[]")
+
+    assert encoded.gzip_body is None
+    assert not encoded.accepts_gzip("gzip, deflate")
+
+
+def test_gzip_body_and_etag_are_stable():
+    body = b"x" * GZIP_MIN_SIZE
+    encoded = EncodedResponse.from_body(body)
+
+    assert gzip.decompress(encoded.gzip_body) == body
+    assert encoded == EncodedResponse.from_body(body)
+    assert encoded.etag != EncodedResponse.from_body(body + b"y").etag
+    assert encoded.etag.startswith('"') and encoded.gzip_etag.endswith('-gzip"')
+
+
+def test_accepts_gzip():
+    encoded = EncodedResponse.from_body(b"x" * GZIP_MIN_SIZE)
+
+    assert encoded.accepts_gzip("br, gzip;q=0.8")
+    assert encoded.accepts_gzip("*")
+    assert not encoded.accepts_gzip("gzip;q=0")
+    assert not encoded.accepts_gzip("gzip; q=0.000")
+    assert not encoded.accepts_gzip("identity")
+    assert not encoded.accepts_gzip(None)
+
+
+def test_not_modified_matches_any_encoding_and_weak_tags():
+    encoded = EncodedResponse.from_body(b"x" * GZIP_MIN_SIZE)
+
+    assert encoded.not_modified(encoded.etag)
+    assert encoded.not_modified(f'"other", {encoded.gzip_etag}')
+    assert encoded.not_modified(f"W/{encoded.etag}")
+    assert encoded.not_modified("*")
+    assert not encoded.not_modified('"other"')
+    assert not encoded.not_modified(None)
@@ -1,65 +1,13 @@
+import random
+from collections import defaultdict
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from z3 import sat
-from backend.app.models import Base
-from backend.app.models.product import (
-    Option,
-    OptionCompatibility,
-    Part,
-    Product,
-)
+from backend.app.models.product import Option, Part
 from backend.app.repositories.pricing_repository import PricingOrderRepository
 from backend.app.services.selection_service import PartSelectionService
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-    # Create test data
-    product = Product(id=1, name="Test Bike")
-    session.add(product)
-
-    parts = [
-        Part(id=1, name="Frame", product_id=1),
-        Part(id=2, name="Wheels", product_id=1),
-        Part(id=3, name="Rim color", product_id=1),
-        Part(id=4, name="Chain", product_id=1),
-    ]
-    session.add_all(parts)
-
-    options = [
-        Option(id=1, part_id=1, name="Full-suspension", price=130),
-        Option(id=2, part_id=1, name="Diamond", price=100),
-        Option(id=3, part_id=2, name="Road wheels", price=80),
-        Option(id=4, part_id=2, name="Mountain wheels", price=100),
-        Option(id=5, part_id=2, name="Fat bike wheels", price=120),
-        Option(id=6, part_id=3, name="Red", price=20),
-        Option(id=7, part_id=3, name="Black", price=20),
-        Option(id=8, part_id=4, name="Single-speed chain", price=43),
-        Option(id=9, part_id=4, name="8-speed chain", price=55),
-    ]
-    session.add_all(options)
-
-    # Add compatibility rules
-    compatibilities = [
-        OptionCompatibility(option1_id=1, option2_id=4, compatible=True),
-        OptionCompatibility(option1_id=2, option2_id=3, compatible=True),
-        OptionCompatibility(option1_id=5, option2_id=7, compatible=True),
-    ]
-    session.add_all(compatibilities)
-
-    session.commit()
-
-    yield session
-
-    session.close()
-
-
 @pytest.fixture
 def selection_service():
     return PartSelectionService()
@@ -131,3 +79,70 @@ def test_select_part_option(selection_service, repository, db_session):
     selection_service.select_part_options([full_suspension])
 
     assert selection_service.solver.check() == sat
+
+
+def test_get_available_options_after_selection(
+    selection_service, repository, db_session
+):
+    parts = db_session.query(Part).all()
+    options = db_session.query(Option).all()
+    grouped_compatibilities = repository.get_compatibilities(product_id=1)
+
+    selection_service.load_compatibilities(parts, options, grouped_compatibilities)
+
+    full_suspension = db_session.query(Option).filter_by(name="Full-suspension").first()
+    selection_service.select_part_options([full_suspension])
+
+    assert selection_service.get_available_options(parts) == {
+        1: [1],
+        2: [4],
+        3: [6, 7],
+        4: [8, 9],
+    }
+
+
+def _available_options_one_check_per_option(selection_service):
+    available_options = {}
+
+    for part_id, option_ids in selection_service.part_options.items():
+        available_options[part_id] = []
+
+        for option_id in option_ids:
+            selection_service.solver.push()
+            selection_service.solver.add(
+                selection_service.option_vars[option_id] == option_id
+            )
+
+            if selection_service.solver.check() == sat:
+                available_options[part_id].append(option_id)
+
+            selection_service.solver.pop()
+
+    return available_options
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_get_available_options_matches_one_check_per_option(seed):
+    rng = random.Random(seed)
+    parts = [Part(id=part_id) for part_id in range(1, 5)]
+    options = [
+        Option(id=part.id * 10 + index, part_id=part.id)
+        for part in parts
+        for index in range(rng.randint(1, 4))
+    ]
+    grouped_compatibilities = defaultdict(
+        lambda: {"compatible": [], "incompatible": []}
+    )
+
+    for _ in range(rng.randint(0, 8)):
+        option1, option2 = rng.sample(options, 2)
+        kind = rng.choice(["compatible", "incompatible"])
+        grouped_compatibilities[option1.id][kind].append(option2.id)
+
+    selection_service = PartSelectionService()
+    selection_service.load_compatibilities(parts, options, grouped_compatibilities)
+    selection_service.select_part_options(rng.sample(options, rng.randint(0, 1)))
+
+    assert selection_service.get_available_options() == (
+        _available_options_one_check_per_option(selection_service)
+    )
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from backend.app.models.base import (
+    PoolMetrics,
+    create_database_engine,
+    engine_options,
+    sqlite_pragmas,
+)
+
+
+def test_sqlite_memory_options():
+    options = engine_options("sqlite:///:memory:", {})
+
+    assert options["connect_args"] == {"check_same_thread": False}
+    assert "pool_size" not in options
+    assert "journal_mode" not in sqlite_pragmas("sqlite:///:memory:", {})
+
+
+def test_postgresql_options_from_environment():
+    options = engine_options(
+        "postgresql://shop@localhost/shop",
+        {
+            "DATABASE_POOL_SIZE": "20",
+            "DATABASE_MAX_OVERFLOW": "0",
+            "DATABASE_POOL_RECYCLE": "300",
+            "DATABASE_POOL_PRE_PING": "false",
+            "DATABASE_STATEMENT_TIMEOUT": "2000",
+            "DATABASE_OPTIONS": '{"application_name": "bike-shop"}',
+        },
+    )
+
+    assert options["connect_args"] == {
+        "options": "-c statement_timeout=2000",
+        "application_name": "bike-shop",
+    }
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_recycle"] == 300
+    assert options["pool_pre_ping"] is False
+
+
+def test_sqlite_file_pragmas_and_pool_metrics(tmp_path):
+    metrics = PoolMetrics()
+    engine = create_database_engine(
+        f"sqlite:///{tmp_path / 'shop.db'}",
+        {"SQLITE_BUSY_TIMEOUT": "1234", "DATABASE_POOL_SIZE": "2"},
+        metrics=metrics,
+    )
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+
+        with engine.connect():
+            assert metrics.snapshot()["checked_out"] == 2
+
+    assert isinstance(engine.pool, QueuePool)
+    assert metrics.snapshot() == {
+        "connects": 2,
+        "checkouts": 2,
+        "checkins": 2,
+        "invalidations": 0,
+        "checked_out": 0,
+        "max_checked_out": 2,
+    }
+
+    engine.dispose()
+
+
+def test_invalid_options_json_raises():
+    with pytest.raises(ValueError):
+        engine_options("sqlite:///shop.db", {"DATABASE_OPTIONS": "{oops"})
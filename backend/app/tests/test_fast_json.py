@@ -0,0 +1,48 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from backend.app.api.fast_json import FastJSONResponse, encode_json
+from backend.app.schemas.order import OrderResponse
+from backend.app.schemas.product import ProductListing
+
+
+def standard_body(response_type, content) -> bytes:
+    field = create_model_field(
+        name="response", type_=response_type, mode="serialization"
+    )
+    return JSONResponse(
+        asyncio.run(serialize_response(field=field, response_content=content))
+    ).body
+
+
+def test_order_response_matches_standard_path():
+    response = OrderResponse.trusted(
+        id=3, total_price=Decimal("250.50"), available_options={1: [1, 2], 2: []}
+    )
+
+    assert FastJSONResponse(response).body == standard_body(OrderResponse, response)
+    assert response.total_price == 250.5
+
+
+def test_listing_rows_match_standard_path():
+    row = {
+        "name": "Bike",
+        "description": None,
+        "id": 1,
+        "from_price": Decimal("499.00"),
+        "max_price": None,
+    }
+
+    assert FastJSONResponse([row]).body == standard_body(
+        list[ProductListing], [ProductListing(**row)]
+    )
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(TypeError):
+        encode_json({"value": object()})
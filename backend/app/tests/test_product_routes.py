@@ -0,0 +1,63 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.api import products
+from backend.app.api.products import MAX_PAGE_SIZE
+from backend.app.models import Base
+from backend.app.models.base import get_db
+from backend.app.models.product import Product
+from backend.app.schemas.product import MAX_AVAILABILITY_SELECTIONS
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    with SessionLocal() as db:
+        db.add_all(
+            Product(id=product_id, name=f"Bike {product_id}")
+            for product_id in (1, 2, 3)
+        )
+        db.commit()
+
+    def override_get_db():
+        with SessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(products.router)
+    app.include_router(products.batch_router)
+    app.dependency_overrides[get_db] = override_get_db
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_SIZE + 1])
+def test_out_of_range_limit_is_rejected(client, limit):
+    assert client.get(f"/products/?limit={limit}").status_code == 422
+
+
+def test_cursor_pages(client):
+    first = client.get("/products/?limit=2")
+    second = client.get(f"/products/?limit=2&cursor={first.headers['x-next-cursor']}")
+
+    assert [product["id"] for product in first.json()] == [1, 2]
+    assert [product["id"] for product in second.json()] == [3]
+    assert "x-next-cursor" not in second.headers
+
+
+def test_oversized_availability_batch_is_rejected(client):
+    response = client.post(
+        "/products/1/availability",
+        json={"selections": [[]] * (MAX_AVAILABILITY_SELECTIONS + 1)},
+    )
+
+    assert response.status_code == 422
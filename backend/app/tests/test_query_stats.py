@@ -0,0 +1,77 @@
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.middleware import QueryStatsMiddleware
+from backend.app.models.base import QueryTracker
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tracker = QueryTracker()
+    tracker.attach(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    def get_db():
+        db = SessionLocal()
+
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, tracker=tracker)
+
+    @app.get("/queries/{count}")
+    def run_queries(count: int, db: Session = Depends(get_db)):
+        for _ in range(count):
+            db.execute(text("SELECT 1"))
+
+        return {}
+
+    return TestClient(app)
+
+
+def test_query_count_headers_are_per_request(client):
+    assert client.get("/queries/3").headers["x-query-count"] == "3"
+    assert client.get("/queries/0").headers["x-query-count"] == "0"
+
+    response = client.get("/queries/1")
+    assert float(response.headers["x-query-time-ms"]) >= 0
+
+
+def test_query_stats_are_logged(client, caplog):
+    with caplog.at_level(logging.INFO, logger="backend.app.middleware"):
+        client.get("/queries/2")
+
+    assert "GET /queries/2: 2 queries" in caplog.text
+
+
+def test_nested_scopes_count_the_same_statements():
+    engine = create_engine("sqlite://")
+    tracker = QueryTracker()
+    tracker.attach(engine)
+    tracker.attach(engine)
+
+    with engine.connect() as connection:
+        with tracker.track() as outer:
+            connection.execute(text("SELECT 1"))
+
+            with tracker.track() as inner:
+                connection.execute(text("SELECT 2"))
+
+        connection.execute(text("SELECT 3"))
+
+    assert (outer.count, inner.count) == (2, 1)
+    assert inner.statements == ["SELECT 2"]
@@ -0,0 +1,205 @@
+"""
+Synthetic catalogs to measure how configuration and pricing scale.
+
+    PYTHONPATH=. python backend/benchmarks/catalog_generator.py --parts 10
+"""
+
+import argparse
+import random
+from dataclasses import asdict, dataclass, field
+
+from sqlalchemy.orm import Session
+
+from backend.app.models.product import (
+    Option,
+    OptionCompatibility,
+    Part,
+    PriceRule,
+    PriceRuleCondition,
+    Product,
+)
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    parts: int = 8
+    options_per_part: int = 25
+    # Share of options that carry a compatibility rule
+    compatibility_density: float = 0.3
+    # Options listed by each compatibility rule
+    options_per_rule: int = 2
+    price_rules: int = 50
+    conditions_per_rule: int = 2
+    seed: int = 1
+    product_id: int = 1
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class GeneratedCatalog:
+    spec: CatalogSpec
+    product: Product
+    parts: list[Part] = field(default_factory=list)
+    options: list[Option] = field(default_factory=list)
+    compatibilities: list[OptionCompatibility] = field(default_factory=list)
+    price_rules: list[PriceRule] = field(default_factory=list)
+    conditions: list[PriceRuleCondition] = field(default_factory=list)
+
+    @property
+    def grouped_compatibilities(self) -> dict[int, dict[str, list[int]]]:
+        """Same shape as PricingOrderRepository.get_compatibilities."""
+        grouped: dict[int, dict[str, list[int]]] = {}
+
+        for compatibility in self.compatibilities:
+            rules = grouped.setdefault(
+                compatibility.option1_id, {"compatible": [], "incompatible": []}
+            )
+            kind = "compatible" if compatibility.compatible else "incompatible"
+            rules[kind].append(compatibility.option2_id)
+
+        return grouped
+
+    def random_configuration(self, rng: random.Random) -> list[Option]:
+        """One option per part, it may or may not be a valid configuration."""
+        by_part: dict[int, list[Option]] = {}
+
+        for option in self.options:
+            by_part.setdefault(option.part_id, []).append(option)
+
+        return [rng.choice(options) for options in by_part.values()]
+
+
+def generate_catalog(spec: CatalogSpec) -> GeneratedCatalog:
+    """
+    Build transient ORM objects for one product. Ids are derived from the
+    product id so several catalogs can live in the same database.
+    """
+    rng = random.Random(spec.seed)
+    base_id = spec.product_id * 1_000_000
+    catalog = GeneratedCatalog(
+        spec=spec,
+        product=Product(
+            id=spec.product_id, name=f"Synthetic product {spec.product_id}"
+        ),
+    )
+
+    for part_index in range(spec.parts):
+        part = Part(
+            id=base_id + part_index,
+            name=f"Part {part_index}",
+            product_id=spec.product_id,
+        )
+        catalog.parts.append(part)
+
+        for option_index in range(spec.options_per_part):
+            catalog.options.append(
+                Option(
+                    id=base_id + part_index * 1000 + option_index,
+                    part_id=part.id,
+                    name=f"Option {part_index}.{option_index}",
+                    price=rng.randint(10, 200),
+                    in_stock=True,
+                )
+            )
+
+    if spec.parts < 2:
+        return catalog
+
+    for option in rng.sample(
+        catalog.options, int(len(catalog.options) * spec.compatibility_density)
+    ):
+        # Rules always point to another part, mostly requiring one of a few
+        # options and sometimes excluding one
+        other_part = rng.choice(
+            [part for part in catalog.parts if part.id != option.part_id]
+        )
+        candidates = [
+            candidate
+            for candidate in catalog.options
+            if candidate.part_id == other_part.id
+        ]
+        compatible = rng.random() < 0.7
+
+        for other in rng.sample(
+            candidates, min(spec.options_per_rule, len(candidates))
+        ):
+            catalog.compatibilities.append(
+                OptionCompatibility(
+                    option1_id=option.id, option2_id=other.id, compatible=compatible
+                )
+            )
+
+    for rule_index in range(spec.price_rules):
+        option = rng.choice(catalog.options)
+        rule = PriceRule(
+            id=base_id + rule_index,
+            option_id=option.id,
+            price=rng.randint(10, 200),
+        )
+        catalog.price_rules.append(rule)
+
+        other_options = [
+            candidate
+            for candidate in catalog.options
+            if candidate.part_id != option.part_id
+        ]
+
+        for condition in rng.sample(
+            other_options, min(spec.conditions_per_rule, len(other_options))
+        ):
+            catalog.conditions.append(
+                PriceRuleCondition(price_rule_id=rule.id, option_id=condition.id)
+            )
+
+    return catalog
+
+
+def insert_catalog(session: Session, catalog: GeneratedCatalog):
+    session.add(catalog.product)
+    session.add_all(catalog.parts)
+    session.add_all(catalog.options)
+    session.add_all(catalog.compatibilities)
+    session.add_all(catalog.price_rules)
+    session.add_all(catalog.conditions)
+    session.commit()
+
+
+def main():
+    from backend.app.models.base import get_db
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=CatalogSpec.parts)
+    parser.add_argument(
+        "--options-per-part", type=int, default=CatalogSpec.options_per_part
+    )
+    parser.add_argument(
+        "--compatibility-density", type=float, default=CatalogSpec.compatibility_density
+    )
+    parser.add_argument("--price-rules", type=int, default=CatalogSpec.price_rules)
+    parser.add_argument("--seed", type=int, default=CatalogSpec.seed)
+    parser.add_argument("--product-id", type=int, default=100)
+    args = parser.parse_args()
+
+    catalog = generate_catalog(
+        CatalogSpec(
+            parts=args.parts,
+            options_per_part=args.options_per_part,
+            compatibility_density=args.compatibility_density,
+            price_rules=args.price_rules,
+            seed=args.seed,
+            product_id=args.product_id,
+        )
+    )
+
+    db = next(get_db())
+    try:
+        insert_catalog(db, catalog)
+        print(f"Product {args.product_id} created with {len(catalog.options)} options")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Time every stage of configuring and pricing a synthetic product and write
+the results as JSON, optionally comparing them with a previous run.
+
+    PYTHONPATH=. python backend/benchmarks/run.py --output results.json
+    PYTHONPATH=. python backend/benchmarks/run.py --compare results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.repositories.pricing_repository import PricingOrderRepository
+from backend.app.services.price_service import PriceIndex, PriceService
+from backend.app.services.selection_backends import (
+    SELECTION_BACKENDS,
+    create_selection_service,
+)
+from backend.benchmarks.catalog_generator import (
+    CatalogSpec,
+    generate_catalog,
+    insert_catalog,
+)
+
+STAGES = ("load", "compile", "availability", "validation", "pricing")
+
+
+def measure(function: Callable[[], object], repeat: int) -> dict[str, float]:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "max_ms": max(timings),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(spec: CatalogSpec, backends: list[str], repeat: int) -> dict:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    catalog = generate_catalog(spec)
+    insert_catalog(session, catalog)
+
+    rng = random.Random(spec.seed)
+    repository = PricingOrderRepository(session)
+    product_id = spec.product_id
+    configuration = catalog.random_configuration(rng)
+    partial_selection = configuration[:1]
+
+    def load():
+        session.expire_all()
+        return repository.load_catalog(product_id)
+
+    snapshot = load()
+    parts, options = snapshot.parts, snapshot.options
+    grouped_compatibilities = snapshot.grouped_compatibilities
+    price_service = PriceService()
+    price_index = PriceIndex(snapshot.price_rules)
+
+    results: dict[str, dict] = {}
+
+    for backend in backends:
+        selector = create_selection_service(backend)
+        model = selector.compile_model(parts, options, grouped_compatibilities)
+
+        def availability():
+            selector.load_model(model)
+            selector.select_part_options(partial_selection)
+            return selector.get_available_options()
+
+        def validation():
+            selector.load_model(model)
+            selector.select_part_options(configuration)
+            return selector.is_selection_valid()
+
+        stages = {
+            "load": load,
+            "compile": lambda: selector.compile_model(
+                parts, options, grouped_compatibilities
+            ),
+            "availability": availability,
+            "validation": validation,
+            "pricing": lambda: price_service.calculate_indexed_price(
+                configuration, price_index
+            ),
+        }
+        results[backend] = {stage: measure(stages[stage], repeat) for stage in STAGES}
+
+    session.close()
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "catalog": {
+            **spec.as_dict(),
+            "options": len(catalog.options),
+            "compatibilities": len(catalog.compatibilities),
+            "price_rule_conditions": len(catalog.conditions),
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict, baseline: dict | None = None):
+    print(
+        f"{report['catalog']['options']} options, "
+        f"{report['catalog']['compatibilities']} compatibilities, "
+        f"{report['catalog']['price_rules']} price rules "
+        f"(median ms over {report['repeat']} runs)"
+    )
+    print(f"{'backend':<8}" + "".join(f"{stage:>14}" for stage in STAGES))
+
+    for backend, stages in report["results"].items():
+        cells = []
+
+        for stage in STAGES:
+            median = stages[stage]["median_ms"]
+            cell = f"{median:.3f}"
+            previous = (baseline or {}).get("results", {}).get(backend, {}).get(stage)
+
+            if previous:
+                cell += f" {median / previous['median_ms']:.2f}x"
+
+            cells.append(f"{cell:>14}")
+
+        print(f"{backend:<8}" + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=CatalogSpec.parts)
+    parser.add_argument(
+        "--options-per-part", type=int, default=CatalogSpec.options_per_part
+    )
+    parser.add_argument(
+        "--compatibility-density", type=float, default=CatalogSpec.compatibility_density
+    )
+    parser.add_argument(
+        "--options-per-rule", type=int, default=CatalogSpec.options_per_rule
+    )
+    parser.add_argument("--price-rules", type=int, default=CatalogSpec.price_rules)
+    parser.add_argument(
+        "--conditions-per-rule", type=int, default=CatalogSpec.conditions_per_rule
+    )
+    parser.add_argument("--seed", type=int, default=CatalogSpec.seed)
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=list(SELECTION_BACKENDS),
+        help="Selection backends to time, all of them by default",
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--compare", help="Previous JSON results to compare with")
+    args = parser.parse_args()
+
+    spec = CatalogSpec(
+        parts=args.parts,
+        options_per_part=args.options_per_part,
+        compatibility_density=args.compatibility_density,
+        options_per_rule=args.options_per_rule,
+        price_rules=args.price_rules,
+        conditions_per_rule=args.conditions_per_rule,
+        seed=args.seed,
+    )
+    report = run(spec, args.backend or list(SELECTION_BACKENDS), args.repeat)
+
+    baseline = None
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
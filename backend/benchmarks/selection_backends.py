@@ -0,0 +1,87 @@
+"""
+Compare the selection backends on a synthetic catalog.
+
+    PYTHONPATH=. python backend/benchmarks/selection_backends.py
+"""
+
+import argparse
+import random
+import time
+
+from backend.app.services.selection_backends import SELECTION_BACKENDS
+from backend.benchmarks.catalog_generator import CatalogSpec, generate_catalog
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        function()
+
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=CatalogSpec.parts)
+    parser.add_argument(
+        "--options-per-part", type=int, default=CatalogSpec.options_per_part
+    )
+    parser.add_argument(
+        "--compatibility-density", type=float, default=CatalogSpec.compatibility_density
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=CatalogSpec.seed)
+    args = parser.parse_args()
+
+    catalog = generate_catalog(
+        CatalogSpec(
+            parts=args.parts,
+            options_per_part=args.options_per_part,
+            compatibility_density=args.compatibility_density,
+            seed=args.seed,
+        )
+    )
+    parts, options = catalog.parts, catalog.options
+    grouped_compatibilities = catalog.grouped_compatibilities
+    selection = catalog.random_configuration(random.Random(args.seed))[:2]
+    print(
+        f"{len(parts)} parts, {len(options)} options, "
+        f"{len(grouped_compatibilities)} rules, {args.repeat} runs (ms per run)"
+    )
+    print(
+        f"{'backend':<8}{'compile':>10}{'available':>12}{'selected':>12}{'valid':>10}"
+    )
+
+    for name, service_class in SELECTION_BACKENDS.items():
+        service = service_class()
+        model = service.compile_model(parts, options, grouped_compatibilities)
+
+        def available():
+            service.load_model(model)
+            service.get_available_options()
+
+        def selected():
+            service.load_model(model)
+            service.select_part_options(selection)
+            service.get_available_options()
+
+        def valid():
+            service.load_model(model)
+            service.select_part_options(selection)
+            service.is_selection_valid()
+
+        results = [
+            timed(
+                lambda: service.compile_model(parts, options, grouped_compatibilities),
+                args.repeat,
+            ),
+            timed(available, args.repeat),
+            timed(selected, args.repeat),
+            timed(valid, args.repeat),
+        ]
+        print(f"{name:<8}" + "".join(f"{value:>11.3f} " for value in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Compare the cost of serializing responses through the response_model and
+through FastJSONResponse.
+
+    PYTHONPATH=. python backend/benchmarks/serialization.py
+"""
+
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from backend.app.api.fast_json import FastJSONResponse
+from backend.app.schemas.order import OrderResponse
+from backend.app.schemas.product import ProductListing
+from backend.benchmarks.catalog_generator import CatalogSpec, generate_catalog
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        function()
+
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+def standard(response_type, build):
+    """What FastAPI does with a response_model: validate, encode, json.dumps."""
+    field = create_model_field(
+        name="response", type_=response_type, mode="serialization"
+    )
+    loop = asyncio.new_event_loop()
+
+    def run() -> bytes:
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=build())
+        )
+        return JSONResponse(content).body
+
+    return run
+
+
+def fast(build):
+    def run() -> bytes:
+        return FastJSONResponse(build()).body
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=CatalogSpec.parts)
+    parser.add_argument(
+        "--options-per-part", type=int, default=CatalogSpec.options_per_part
+    )
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    catalog = generate_catalog(
+        CatalogSpec(parts=args.parts, options_per_part=args.options_per_part)
+    )
+    available_options = {
+        part.id: [option.id for option in catalog.options if option.part_id == part.id]
+        for part in catalog.parts
+    }
+    listings = [
+        {
+            "name": f"Bike {product_id}",
+            "description": None,
+            "id": product_id,
+            "from_price": Decimal("499.00"),
+            "max_price": Decimal("1299.00"),
+        }
+        for product_id in range(1, args.products + 1)
+    ]
+
+    cases = {
+        "order": (
+            standard(
+                OrderResponse,
+                lambda: OrderResponse(
+                    id=1,
+                    total_price=Decimal("250.00"),
+                    available_options=available_options,
+                ),
+            ),
+            fast(
+                lambda: OrderResponse.trusted(
+                    id=1,
+                    total_price=Decimal("250.00"),
+                    available_options=available_options,
+                )
+            ),
+        ),
+        "listing": (
+            standard(
+                list[ProductListing],
+                lambda: [ProductListing(**listing) for listing in listings],
+            ),
+            fast(lambda: listings),
+        ),
+    }
+
+    print(f"{args.repeat} runs (us per response)")
+    print(f"{'response':<10}{'bytes':>8}{'standard':>12}{'fast':>10}{'speedup':>10}")
+
+    for name, (standard_run, fast_run) in cases.items():
+        # Both paths must produce the same document
+        assert standard_run() == fast_run(), name
+        standard_us = timed(standard_run, args.repeat)
+        fast_us = timed(fast_run, args.repeat)
+        print(
+            f"{name:<10}{len(fast_run()):>8}{standard_us:>12.1f}{fast_us:>10.1f}"
+            f"{standard_us / fast_us:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import Base
+from backend.app.models.base import QueryStats, query_tracker
+from backend.app.models.product import Option, OptionCompatibility, Part, Product
+
+
+def _catalog_session(parts: int, options: int, compatibilities: int):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    # Create test data
+    session.add(Product(id=1, name="Test Bike"))
+    session.add_all(
+        [
+            Part(id=1, name="Frame", product_id=1),
+            Part(id=2, name="Wheels", product_id=1),
+            Part(id=3, name="Rim color", product_id=1),
+            Part(id=4, name="Chain", product_id=1),
+        ][:parts]
+    )
+    session.add_all(
+        [
+            Option(id=1, part_id=1, name="Full-suspension", price=130),
+            Option(id=2, part_id=1, name="Diamond", price=100),
+            Option(id=3, part_id=2, name="Road wheels", price=80),
+            Option(id=4, part_id=2, name="Mountain wheels", price=100),
+            Option(id=5, part_id=2, name="Fat bike wheels", price=120),
+            Option(id=6, part_id=3, name="Red", price=20),
+            Option(id=7, part_id=3, name="Black", price=20),
+            Option(id=8, part_id=4, name="Single-speed chain", price=43),
+            Option(id=9, part_id=4, name="8-speed chain", price=55),
+        ][:options]
+    )
+
+    # Add compatibility rules
+    session.add_all(
+        [
+            OptionCompatibility(option1_id=1, option2_id=4, compatible=True),
+            OptionCompatibility(option1_id=2, option2_id=3, compatible=True),
+            OptionCompatibility(option1_id=5, option2_id=7, compatible=True),
+        ][:compatibilities]
+    )
+
+    session.commit()
+
+    return session
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Test bike with four parts, modules with another catalog override it."""
+    session = _catalog_session(parts=4, options=9, compatibilities=3)
+
+    yield session
+
+    session.close()
+
+
+@pytest.fixture(scope="function")
+def frame_and_wheels_session():
+    """The test bike cut down to its frame and wheels."""
+    session = _catalog_session(parts=2, options=4, compatibilities=1)
+
+    yield session
+
+    session.close()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fails the test when the block runs more SQL statements than allowed:
+
+        with query_budget(2, db_session.get_bind()):
+            service.update_order(order, option)
+
+    Engines other than the application one are passed to be tracked too.
+    """
+
+    @contextmanager
+    def budget(limit: int, *engines: Engine):
+        for engine in engines:
+            query_tracker.attach(engine)
+
+        with query_tracker.track() as stats:
+            yield stats
+
+        if stats.count > limit:
+            pytest.fail(_over_budget(stats, limit), pytrace=False)
+
+    return budget
+
+
+def _over_budget(stats: QueryStats, limit: int) -> str:
+    statements = "\n".join(
+        f"  {number}. {statement}"
+        for number, statement in enumerate(stats.statements, 1)
+    )
+    return f"{stats.count} queries over a budget of {limit}:\n{statements}"
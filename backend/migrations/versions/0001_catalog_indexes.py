@@ -0,0 +1,39 @@
+"""Index the foreign keys used to load a product catalog
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables are created by Base.metadata.create_all, which already adds these
+# indexes on new databases, hence if_not_exists
+INDEXES = [
+    ("option_compatibilities", "option1_id"),
+    ("option_compatibilities", "option2_id"),
+    ("parts", "product_id"),
+    ("options", "part_id"),
+    ("order_options", "order_id"),
+    ("order_options", "option_id"),
+    ("price_rules", "option_id"),
+    ("price_rule_conditions", "price_rule_id"),
+]
+
+
+def upgrade() -> None:
+    for table, column in INDEXES:
+        op.create_index(f"ix_{table}_{column}", table, [column], if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table, column in INDEXES:
+        op.drop_index(f"ix_{table}_{column}", table_name=table, if_exists=True)
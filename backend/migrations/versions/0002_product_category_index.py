@@ -0,0 +1,31 @@
+"""Index product_categories by category for category listings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_product_categories_category_id_product_id"
+
+
+def upgrade() -> None:
+    op.create_index(
+        INDEX,
+        "product_categories",
+        ["category_id", "product_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="product_categories", if_exists=True)
@@ -0,0 +1,26 @@
+"""Index orders by date for incremental exports
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_orders_order_date", "orders", ["order_date"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_order_date", table_name="orders", if_exists=True)
@@ -0,0 +1,34 @@
+"""Persist catalog versions so every process sees catalog changes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables are created by create_all on startup, skip it when it already ran
+    if sa.inspect(op.get_bind()).has_table("catalog_versions"):
+        return
+
+    op.create_table(
+        "catalog_versions",
+        sa.Column("product_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("product_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_versions")
@@ -0,0 +1,49 @@
+"""Make compatibilities and price rule conditions unique on their natural key
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The importer upserts rows without an id on these columns
+UNIQUE_KEYS = [
+    ("option_compatibilities", ("option1_id", "option2_id")),
+    ("price_rule_conditions", ("price_rule_id", "option_id")),
+]
+
+
+def upgrade() -> None:
+    for table, columns in UNIQUE_KEYS:
+        # Re-imports used to insert these rows again, the latest copy wins
+        op.execute(
+            sa.text(
+                f"DELETE FROM {table} WHERE id NOT IN ("
+                f"SELECT id FROM (SELECT MAX(id) AS id FROM {table} "
+                f"GROUP BY {', '.join(columns)}) AS latest)"
+            )
+        )
+        op.create_index(
+            f"uq_{table}_{'_'.join(columns)}",
+            table,
+            list(columns),
+            unique=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    for table, columns in UNIQUE_KEYS:
+        op.drop_index(
+            f"uq_{table}_{'_'.join(columns)}", table_name=table, if_exists=True
+        )